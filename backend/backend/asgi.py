@@ -5,6 +5,19 @@ It exposes the ASGI callable as a module-level variable named ``application``.
 
 For more information on this file, see
 https://docs.djangoproject.com/en/5.1/howto/deployment/asgi/
+
+ASGI deployment profile (uvicorn):
+
+    pip install uvicorn
+    INTERVIEW_ASYNC_VIEWS=True uvicorn backend.asgi:application --host 0.0.0.0 --port 8000 --workers 4
+
+INTERVIEW_ASYNC_VIEWS swaps interview start/submit/summary for the coroutine views
+in interview.async_views, so slow clients (long voice answers) wait on the event
+loop instead of occupying a worker thread. The remaining DRF views still run in
+threads. Keep INSTRUMENTATION_ENABLED off here: it is sync-only middleware and would
+push the async views back onto threads. With several workers, point CACHE_URL at a
+shared cache (file:// or redis://) so cache invalidations reach every worker.
+Compare with WSGI using `python -m benchmarks.bench_asgi`.
 """
 
 import os
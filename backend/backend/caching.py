@@ -0,0 +1,94 @@
+"""
+Versioned response caching for read-heavy endpoints.
+
+Each cached payload is keyed by a namespace version token. Writers call
+bump_version() for the namespaces they touch, which orphans every entry built
+from the old data; nothing has to be deleted explicitly. Responses carry an
+ETag, and a matching If-None-Match is answered with 304 Not Modified.
+
+Shared namespaces ('questions') keep their version until the next bump.
+Per-object namespaces ('session:42') expire with the entries built on them
+(RESPONSE_CACHE_TIMEOUT), so deleted objects leave no keys behind; an expired
+version simply reads as a new one.
+"""
+import hashlib
+import uuid
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+from rest_framework.renderers import JSONRenderer
+from rest_framework.response import Response
+
+
+def _cache():
+    return caches[getattr(settings, 'RESPONSE_CACHE_ALIAS', 'default')]
+
+
+def _version_key(namespace: str) -> str:
+    return f'version:{namespace}'
+
+
+def _version_timeout(namespace: str) -> Optional[int]:
+    if ':' in namespace:
+        return getattr(settings, 'RESPONSE_CACHE_TIMEOUT', 300)
+    return None
+
+
+def get_version(namespace: str) -> str:
+    version = _cache().get(_version_key(namespace))
+    if version is None:
+        version = uuid.uuid4().hex
+        # add() so concurrent first readers agree on one token
+        _cache().add(_version_key(namespace), version, _version_timeout(namespace))
+        version = _cache().get(_version_key(namespace), version)
+    return version
+
+
+def bump_version(*namespaces: str):
+    """Invalidate the given namespaces now and again once the current transaction commits."""
+    by_timeout: Dict[Optional[int], List[str]] = {}
+    for ns in namespaces:
+        by_timeout.setdefault(_version_timeout(ns), []).append(ns)
+
+    def bump():
+        for timeout, group in by_timeout.items():
+            _cache().set_many({_version_key(ns): uuid.uuid4().hex for ns in group}, timeout)
+    bump()
+    transaction.on_commit(bump)
+
+
+def make_etag(data: Any) -> str:
+    return '"%s"' % hashlib.md5(JSONRenderer().render(data)).hexdigest()
+
+
+def cached_entry(key: str, build: Callable[[], Tuple[Any, Any]]) -> Tuple[str, Any, Any]:
+    """Return (etag, data, meta) for `key`, calling `build` on a miss."""
+    entry = _cache().get(key)
+    if entry is None:
+        data, meta = build()
+        entry = (make_etag(data), data, meta)
+        _cache().set(key, entry, getattr(settings, 'RESPONSE_CACHE_TIMEOUT', 300))
+    return entry
+
+
+def cached_response(request, key: str, build: Callable[[], Tuple[Any, Any]],
+                    check: Optional[Callable[[Any], Optional[Response]]] = None) -> Response:
+    """
+    Serve `key` from the cache, calling `build` on a miss.
+
+    `build` returns (data, meta); `meta` is cached alongside the data and handed to
+    `check`, which can veto the request (for example an ownership test) by returning
+    a Response before anything is served.
+    """
+    etag, data, meta = cached_entry(key, build)
+
+    if check:
+        denied = check(meta)
+        if denied is not None:
+            return denied
+
+    if etag in request.headers.get('If-None-Match', ''):
+        return Response(status=304, headers={'ETag': etag})
+    return Response(data, headers={'ETag': etag})
@@ -0,0 +1,41 @@
+"""
+SQLite backend with a connection-init hook.
+
+Accepts two extra OPTIONS on top of Django's sqlite3 backend:
+
+- `init_pragmas`: {name: value} PRAGMAs run on every new connection
+  (synchronous=NORMAL, busy_timeout, mmap_size, ...). journal_mode is
+  persistent, so it is skipped for test databases, which would otherwise
+  switch (and leave -wal/-shm files beside) whatever file they are created from.
+- `transaction_mode`: DEFERRED (SQLite's default), IMMEDIATE or EXCLUSIVE.
+  IMMEDIATE takes the write lock when a transaction starts, so concurrent
+  writers wait on busy_timeout instead of failing with "database is locked"
+  when a read transaction tries to upgrade.
+"""
+from django.db.backends.sqlite3 import base
+
+
+class DatabaseWrapper(base.DatabaseWrapper):
+    def get_connection_params(self):
+        params = super().get_connection_params()
+        self.init_pragmas = params.pop('init_pragmas', {})
+        self.transaction_mode = params.pop('transaction_mode', None)
+        return params
+
+    def get_new_connection(self, conn_params):
+        conn = super().get_new_connection(conn_params)
+        for name, value in self.init_pragmas.items():
+            if name == 'journal_mode' and self._is_test_database():
+                continue
+            conn.execute(f'PRAGMA {name} = {value}')
+        return conn
+
+    def _is_test_database(self):
+        test_name = self.settings_dict.get('TEST', {}).get('NAME')
+        return self.is_in_memory_db() or bool(test_name and self.settings_dict['NAME'] == test_name)
+
+    def _start_transaction_under_autocommit(self):
+        if self.transaction_mode:
+            self.cursor().execute(f'BEGIN {self.transaction_mode}')
+        else:
+            super()._start_transaction_under_autocommit()
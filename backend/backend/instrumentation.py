@@ -0,0 +1,184 @@
+"""
+Opt-in per-request instrumentation.
+
+With INSTRUMENTATION_ENABLED, RequestInstrumentationMiddleware records wall time,
+SQL query count and SQL time, and response rendering (serialization) time per view.
+Each response gets a Server-Timing header, and totals are exposed in Prometheus text
+format by metrics_view. A sampled fraction of requests can be run under cProfile;
+profiles of requests slower than INSTRUMENTATION_PROFILE_MIN_MS are written to
+INSTRUMENTATION_PROFILE_DIR.
+
+When disabled, the middleware removes itself at startup (MiddlewareNotUsed), so
+requests pay nothing.
+"""
+import cProfile
+import os
+import random
+import threading
+import time
+from typing import Dict, List
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connection
+from django.http import Http404, HttpResponse
+
+# Upper bounds (seconds) of the request duration histogram
+BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class RequestStats:
+    def __init__(self):
+        self.queries = 0
+        self.db_time = 0.0
+        self.render_start = None
+        self.render_time = 0.0
+
+    def record_query(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.queries += 1
+            self.db_time += time.perf_counter() - start
+
+
+class MetricsRegistry:
+    """Per-view totals, shared by all threads of the process."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.views: Dict[tuple, Dict] = {}
+
+    def observe(self, view: str, method: str, status: int, wall: float, stats: RequestStats):
+        with self.lock:
+            entry = self.views.setdefault((view, method), {
+                'requests': 0, 'errors': 0, 'wall': 0.0, 'queries': 0, 'db_time': 0.0,
+                'render_time': 0.0, 'buckets': [0] * len(BUCKETS),
+            })
+            entry['requests'] += 1
+            entry['errors'] += status >= 500
+            entry['wall'] += wall
+            entry['queries'] += stats.queries
+            entry['db_time'] += stats.db_time
+            entry['render_time'] += stats.render_time
+            for i, bound in enumerate(BUCKETS):
+                if wall <= bound:
+                    entry['buckets'][i] += 1
+
+    def render(self) -> str:
+        lines: List[str] = []
+
+        def metric(name, kind, help_text, samples):
+            lines.append(f'# HELP {name} {help_text}')
+            lines.append(f'# TYPE {name} {kind}')
+            lines.extend(samples)
+
+        with self.lock:
+            views = {key: dict(entry, buckets=list(entry['buckets'])) for key, entry in self.views.items()}
+
+        def labels(view, method, **extra):
+            pairs = dict(view=view, method=method, **extra)
+            return '{' + ','.join(f'{k}="{v}"' for k, v in pairs.items()) + '}'
+
+        histogram = []
+        for (view, method), entry in sorted(views.items()):
+            for bound, count in zip(BUCKETS, entry['buckets']):
+                histogram.append(f'botspark_request_duration_seconds_bucket{labels(view, method, le=bound)} {count}')
+            histogram.append(f'botspark_request_duration_seconds_bucket{labels(view, method, le="+Inf")} {entry["requests"]}')
+            histogram.append(f'botspark_request_duration_seconds_sum{labels(view, method)} {entry["wall"]:.6f}')
+            histogram.append(f'botspark_request_duration_seconds_count{labels(view, method)} {entry["requests"]}')
+        metric('botspark_request_duration_seconds', 'histogram', 'Wall time per request.', histogram)
+
+        for name, key, help_text in (
+            ('botspark_request_errors_total', 'errors', 'Requests that returned a 5xx status.'),
+            ('botspark_db_queries_total', 'queries', 'SQL queries executed.'),
+            ('botspark_db_seconds_total', 'db_time', 'Time spent executing SQL.'),
+            ('botspark_render_seconds_total', 'render_time', 'Time spent rendering (serializing) responses.'),
+        ):
+            metric(name, 'counter', help_text, [
+                f'{name}{labels(view, method)} {entry[key]:.6f}' if isinstance(entry[key], float)
+                else f'{name}{labels(view, method)} {entry[key]}'
+                for (view, method), entry in sorted(views.items())
+            ])
+        return '\n'.join(lines) + '\n'
+
+
+registry = MetricsRegistry()
+
+
+class RequestInstrumentationMiddleware:
+    def __init__(self, get_response):
+        if not getattr(settings, 'INSTRUMENTATION_ENABLED', False):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.sample_rate = getattr(settings, 'INSTRUMENTATION_PROFILE_SAMPLE_RATE', 0.0)
+        self.profile_min = getattr(settings, 'INSTRUMENTATION_PROFILE_MIN_MS', 500) / 1000
+        self.profile_dir = getattr(settings, 'INSTRUMENTATION_PROFILE_DIR', None)
+
+    def __call__(self, request):
+        stats = RequestStats()
+        request._instrumentation = stats
+        profiler = None
+        if self.sample_rate and self.profile_dir and random.random() < self.sample_rate:
+            profiler = cProfile.Profile()
+
+        start = time.perf_counter()
+        with connection.execute_wrapper(stats.record_query):
+            if profiler:
+                profiler.enable()
+            try:
+                response = self.get_response(request)
+            finally:
+                if profiler:
+                    profiler.disable()
+        wall = time.perf_counter() - start
+
+        view = self.view_name(request)
+        registry.observe(view, request.method, response.status_code, wall, stats)
+        response['Server-Timing'] = (
+            f'app;dur={wall * 1000:.1f}, '
+            f'db;dur={stats.db_time * 1000:.1f};desc="{stats.queries} queries", '
+            f'render;dur={stats.render_time * 1000:.1f}'
+        )
+        if profiler and wall >= self.profile_min:
+            self.dump_profile(profiler, view, wall)
+        return response
+
+    def process_template_response(self, request, response):
+        # DRF responses are rendered after the view returns; time that step
+        stats = getattr(request, '_instrumentation', None)
+        if stats is not None:
+            stats.render_start = time.perf_counter()
+
+            def rendered(response):
+                stats.render_time += time.perf_counter() - stats.render_start
+
+            response.add_post_render_callback(rendered)
+        return response
+
+    @staticmethod
+    def view_name(request) -> str:
+        match = getattr(request, 'resolver_match', None)
+        if match is None:
+            return 'unresolved'
+        return match.view_name or match._func_path
+
+    def dump_profile(self, profiler, view: str, wall: float):
+        os.makedirs(self.profile_dir, exist_ok=True)
+        name = f"{time.strftime('%Y%m%d-%H%M%S')}-{view.replace(':', '_')}-{wall * 1000:.0f}ms.prof"
+        profiler.dump_stats(os.path.join(self.profile_dir, name))
+
+
+def metrics_view(request):
+    """
+    Prometheus text exposition of the registry; 404 unless instrumentation is
+    enabled, 403 unless the request carries INSTRUMENTATION_METRICS_TOKEN as a
+    bearer token (so with no token configured, nobody can read it).
+    """
+    if not getattr(settings, 'INSTRUMENTATION_ENABLED', False):
+        raise Http404
+    token = getattr(settings, 'INSTRUMENTATION_METRICS_TOKEN', '')
+    if not token or request.headers.get('Authorization') != f'Bearer {token}':
+        return HttpResponse(status=403)
+    return HttpResponse(registry.render(), content_type='text/plain; version=0.0.4; charset=utf-8')
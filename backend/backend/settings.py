@@ -10,8 +10,11 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/5.1/ref/settings/
 """
 
+import os
 from pathlib import Path
 
+from decouple import config
+
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
 
@@ -46,6 +49,7 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'backend.instrumentation.RequestInstrumentationMiddleware',
     'corsheaders.middleware.CorsMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
@@ -80,12 +84,77 @@ WSGI_APPLICATION = 'backend.wsgi.application'
 # Database
 # https://docs.djangoproject.com/en/5.1/ref/settings/#databases
 
-DATABASES = {
-    'default': {
-        'ENGINE': 'django.db.backends.sqlite3',
-        'NAME': BASE_DIR / 'db.sqlite3',
+# DB_PROFILE picks the connection profile:
+#   sqlite   - the bundled SQLite file, tuned for concurrent interviews (busy timeout,
+#              IMMEDIATE transactions). SQLITE_TUNED=False gives stock SQLite.
+#              WAL journaling is a persistent property of the file, so it is opt-in:
+#              SQLITE_WAL=True switches the database to WAL on connect (never for test
+#              databases), or run `sqlite3 db.sqlite3 'PRAGMA journal_mode=WAL'` once.
+#   postgres - PostgreSQL with persistent, health-checked connections (needs psycopg).
+#              Set DB_PGBOUNCER=True when connecting through PgBouncer in transaction
+#              pooling mode.
+
+DB_PROFILE = config('DB_PROFILE', default='sqlite')
+DB_CONN_MAX_AGE = config('DB_CONN_MAX_AGE', default=60, cast=int)
+
+if DB_PROFILE == 'postgres':
+    DATABASES = {
+        'default': {
+            'ENGINE': 'django.db.backends.postgresql',
+            'NAME': config('POSTGRES_DB', default='botspark'),
+            'USER': config('POSTGRES_USER', default='botspark'),
+            'PASSWORD': config('POSTGRES_PASSWORD', default=''),
+            'HOST': config('POSTGRES_HOST', default='localhost'),
+            'PORT': config('POSTGRES_PORT', default='5432'),
+            'CONN_MAX_AGE': DB_CONN_MAX_AGE,
+            'CONN_HEALTH_CHECKS': True,
+            'DISABLE_SERVER_SIDE_CURSORS': config('DB_PGBOUNCER', default=False, cast=bool),
+            'OPTIONS': {
+                'connect_timeout': 5,
+            },
+        }
     }
-}
+else:
+    DATABASES = {
+        'default': {
+            'ENGINE': 'backend.db_backends.sqlite3',
+            'NAME': config('SQLITE_PATH', default=str(BASE_DIR / 'db.sqlite3')),
+            'CONN_MAX_AGE': DB_CONN_MAX_AGE,
+            'CONN_HEALTH_CHECKS': True,
+        }
+    }
+    if config('SQLITE_TUNED', default=True, cast=bool):
+        DATABASES['default']['OPTIONS'] = {
+            'timeout': 20,
+            'transaction_mode': 'IMMEDIATE',
+            'init_pragmas': {
+                'synchronous': 'NORMAL',
+                'busy_timeout': config('SQLITE_BUSY_TIMEOUT', default=20000, cast=int),
+                'mmap_size': config('SQLITE_MMAP_SIZE', default=256 * 1024 * 1024, cast=int),
+                'temp_store': 'MEMORY',
+            },
+        }
+        if config('SQLITE_WAL', default=False, cast=bool):
+            DATABASES['default']['OPTIONS']['init_pragmas'] = {
+                'journal_mode': 'WAL', **DATABASES['default']['OPTIONS']['init_pragmas'],
+            }
+
+
+# Cache
+# CACHE_URL selects the backend: locmem:// (default), file:///path/to/dir, or a
+# redis:// / rediss:// URL for any Redis-compatible server (requires the redis package)
+
+CACHE_URL = config('CACHE_URL', default='locmem://')
+
+if CACHE_URL.startswith(('redis://', 'rediss://')):
+    CACHES = {'default': {'BACKEND': 'django.core.cache.backends.redis.RedisCache', 'LOCATION': CACHE_URL}}
+elif CACHE_URL.startswith('file://'):
+    CACHES = {'default': {'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache', 'LOCATION': CACHE_URL[len('file://'):]}}
+else:
+    CACHES = {'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': 'botspark'}}
+
+# Seconds a cached question list or session summary may live without being invalidated
+RESPONSE_CACHE_TIMEOUT = 300
 
 
 # Password validation
@@ -131,7 +200,7 @@ DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': (
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'users.tokens.ClaimsJWTAuthentication',
     ),
     'DEFAULT_PERMISSION_CLASSES': (
         'rest_framework.permissions.IsAuthenticated',
@@ -140,4 +209,74 @@ REST_FRAMEWORK = {
 
 AUTH_USER_MODEL = 'users.User'
 
+# Access tokens carry the user's role and interview flags, so authenticated
+# requests don't load the User row (see users.tokens)
+SIMPLE_JWT = {
+    'TOKEN_OBTAIN_SERIALIZER': 'users.tokens.ClaimsTokenObtainPairSerializer',
+    'TOKEN_REFRESH_SERIALIZER': 'users.tokens.ClaimsTokenRefreshSerializer',
+}
+# Cache users' token versions (see users.tokens) only when every process shares the
+# cache; with locmem://, a revocation in one worker would go unseen by the others
+JWT_CLAIMS_CACHE_VERSIONS = config('JWT_CLAIMS_CACHE_VERSIONS', default=not CACHE_URL.startswith('locmem://'), cast=bool)
+JWT_CLAIMS_VERSION_TIMEOUT = 300
+
 CORS_ALLOW_ALL_ORIGINS = True
+
+# Serve interview start/submit/summary with the async views in interview.async_views;
+# only worthwhile under an ASGI server (see backend/asgi.py)
+INTERVIEW_ASYNC_VIEWS = config('INTERVIEW_ASYNC_VIEWS', default=False, cast=bool)
+
+# Question selection strategy used when an interview starts
+INTERVIEW_SELECTION_POLICY = 'interview.selection.QuotaBudgetPolicy'
+# How often a process checks its in-memory question pool against the database, to
+# pick up bank changes made by other processes (see questions.pool)
+QUESTION_POOL_CHECK_SECONDS = 10
+
+# Answer scorer used on submit and by `manage.py rescore_sessions` (see interview.scoring)
+INTERVIEW_SCORER = config('INTERVIEW_SCORER', default='interview.scoring.NonEmptyScorer')
+
+# Days of daily timeseries returned by unfiltered admin analytics
+ANALYTICS_DEFAULT_SERIES_DAYS = 30
+
+# Admin change feed (interview/admin/changes/): how far before the cursor each read
+# looks, and how long deletes are remembered (`manage.py prune_tombstones`)
+CHANGE_FEED_OVERLAP_SECONDS = 5
+TOMBSTONE_RETENTION_DAYS = 30
+
+# Ready-made question sets kept by `manage.py run_question_set_worker` for interview
+# starts to claim (see interview.pregeneration); 0 selects questions inline
+INTERVIEW_PREGENERATED_SETS = config('INTERVIEW_PREGENERATED_SETS', default=0, cast=int)
+
+# Rows written per bulk_create/transaction by the CSV question importer
+QUESTION_IMPORT_BATCH_SIZE = 1000
+# Largest ?batch_size= a client may ask for: a batch is held in memory and must
+# commit well within QUESTION_IMPORT_STALE_SECONDS
+QUESTION_IMPORT_MAX_BATCH_SIZE = 5000
+
+# Bulk candidate provisioning (users/bulk_provision/, `manage.py provision_candidates`):
+# accounts per bulk_create/transaction, and password-hashing processes (0 hashes in-process;
+# the endpoint keeps one pool per server process, the command starts its own)
+USER_PROVISION_BATCH_SIZE = 1000
+USER_PROVISION_WORKERS = config('USER_PROVISION_WORKERS', default=os.cpu_count() or 1, cast=int)
+
+# Background imports (?async=1 on questions/bulk_import/): uploads are stored under
+# MEDIA_ROOT and processed by a thread pool in the web process, or by
+# `manage.py run_import_worker` when QUESTION_IMPORT_RUN_IN_PROCESS is False
+MEDIA_ROOT = BASE_DIR / 'media'
+QUESTION_IMPORT_WORKERS = 2
+QUESTION_IMPORT_RUN_IN_PROCESS = True
+# A running job whose worker hasn't reported progress for this long is requeued (and
+# resumed after its last committed batch), up to QUESTION_IMPORT_MAX_ATTEMPTS runs
+QUESTION_IMPORT_STALE_SECONDS = 300
+QUESTION_IMPORT_MAX_ATTEMPTS = 3
+
+# Per-request timing (Server-Timing header, Prometheus text at /metrics/). Off by
+# default; the middleware unloads itself when disabled. With a sample rate and a
+# directory set, that fraction of requests runs under cProfile and those slower than
+# INSTRUMENTATION_PROFILE_MIN_MS are dumped as .prof files. /metrics/ is only served
+# to scrapers sending "Authorization: Bearer <INSTRUMENTATION_METRICS_TOKEN>".
+INSTRUMENTATION_ENABLED = config('INSTRUMENTATION_ENABLED', default=False, cast=bool)
+INSTRUMENTATION_METRICS_TOKEN = config('INSTRUMENTATION_METRICS_TOKEN', default='')
+INSTRUMENTATION_PROFILE_SAMPLE_RATE = config('INSTRUMENTATION_PROFILE_SAMPLE_RATE', default=0.0, cast=float)
+INSTRUMENTATION_PROFILE_MIN_MS = config('INSTRUMENTATION_PROFILE_MIN_MS', default=500, cast=int)
+INSTRUMENTATION_PROFILE_DIR = config('INSTRUMENTATION_PROFILE_DIR', default=str(BASE_DIR / 'profiles'))
@@ -0,0 +1,96 @@
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from unittest import mock
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connection
+from django.test import SimpleTestCase, TestCase, override_settings
+from rest_framework.test import APIClient
+
+from backend.caching import bump_version, cached_entry, get_version, make_etag
+from backend.db_backends.sqlite3.base import DatabaseWrapper
+from interview.services import create_interview_session
+from questions.models import Question
+from users.models import User
+
+
+class SQLiteBackendTests(SimpleTestCase):
+    def journal_mode(self, name, test_name=None):
+        settings_dict = {**connection.settings_dict, 'NAME': name, 'TEST': {'NAME': test_name},
+                         'OPTIONS': {'init_pragmas': {'journal_mode': 'WAL', 'synchronous': 'NORMAL'}}}
+        wrapper = DatabaseWrapper(settings_dict)
+        try:
+            with wrapper.cursor() as cursor:
+                return cursor.execute('PRAGMA journal_mode').fetchone()[0]
+        finally:
+            wrapper.close()
+
+    def test_journal_mode_is_not_set_on_test_databases(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'db.sqlite3')
+            self.assertEqual(self.journal_mode(path, test_name=path), 'delete')
+            self.assertFalse(os.path.exists(path + '-wal'))
+            self.assertEqual(self.journal_mode(path), 'wal')
+
+
+class ResponseCacheTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.question = Question.objects.create(text='Q', topic='Personal', difficulty='easy', time_required=60)
+        self.user = User.objects.create_user('candidate', 'candidate@example.com', 'pw')
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def test_etag_and_not_modified(self):
+        response = self.client.get('/api/questions/')
+        etag = response['ETag']
+        self.assertEqual(etag, make_etag(response.data))
+        self.assertEqual(self.client.get('/api/questions/', HTTP_IF_NONE_MATCH=etag).status_code, 304)
+
+        self.question.text = 'Edited'
+        self.question.save()
+        response = self.client.get('/api/questions/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+        self.assertEqual(response.data[0]['text'], 'Edited')
+
+    def test_object_versions_expire(self):
+        bump_version('questions', 'session:1')
+        shared, per_session = get_version('questions'), get_version('session:1')
+        later = time.time() + settings.RESPONSE_CACHE_TIMEOUT + 1
+        with mock.patch('time.time', return_value=later):
+            self.assertEqual(get_version('questions'), shared)
+            self.assertNotEqual(get_version('session:1'), per_session)
+
+    def test_submit_invalidates_session_summary(self):
+        session = create_interview_session(self.user, [self.question])
+        url = f'/api/interview/summary/{session.pk}/'
+        etag = self.client.get(url)['ETag']
+        self.client.post('/api/interview/submit/', {
+            'session_id': session.pk, 'answers': [{'question_id': self.question.pk, 'response': 'answer'}],
+        }, format='json')
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['score'], 100)
+
+
+class SharedCacheTests(SimpleTestCase):
+    def test_bump_in_another_process_invalidates_entries(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            caches = {'default': {'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache', 'LOCATION': tmp}}
+            with override_settings(CACHES=caches):
+                key = lambda: f"questions:{get_version('questions')}:/api/questions/"  # noqa: E731
+                first = cached_entry(key(), lambda: (['v1'], None))
+                self.assertEqual(cached_entry(key(), lambda: (['v2'], None)), first)
+
+                subprocess.run(
+                    [sys.executable, '-c', 'import django; django.setup(); '
+                     'from backend.caching import bump_version; bump_version("questions")'],
+                    cwd=settings.BASE_DIR, check=True,
+                    env={**os.environ, 'DJANGO_SETTINGS_MODULE': 'backend.settings', 'CACHE_URL': f'file://{tmp}'},
+                )
+                self.assertEqual(cached_entry(key(), lambda: (['v2'], None))[1], ['v2'])
@@ -21,6 +21,8 @@ from rest_framework_simplejwt.views import (
     TokenRefreshView,
 )
 
+from .instrumentation import metrics_view
+
 urlpatterns = [
     path('admin/', admin.site.urls),
     path('api/token/', TokenObtainPairView.as_view(), name='token_obtain_pair'),
@@ -28,4 +30,5 @@ urlpatterns = [
     path('api/users/', include('users.urls')),
     path('api/questions/', include('questions.urls')),
     path('api/interview/', include('interview.urls')),
+    path('metrics/', metrics_view, name='metrics'),
 ]
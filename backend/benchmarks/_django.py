@@ -0,0 +1,21 @@
+import os
+import sys
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+
+
+def setup():
+    """Configure Django so a benchmark can be run as `python -m benchmarks.<name>` from backend/."""
+    if str(BACKEND_DIR) not in sys.path:
+        sys.path.insert(0, str(BACKEND_DIR))
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'backend.settings')
+    import django
+    django.setup()
+
+
+def use_test_database():
+    """Run against a throwaway test database instead of db.sqlite3."""
+    from django.test.utils import setup_databases, setup_test_environment
+    setup_test_environment(debug=False)
+    setup_databases(verbosity=0, interactive=False)
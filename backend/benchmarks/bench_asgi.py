@@ -0,0 +1,231 @@
+"""
+Concurrent-connection capacity: WSGI worker threads versus ASGI async views.
+
+Voice interviews hold connections open while answers upload slowly. This
+benchmark opens --slow-clients connections that trickle their interview/submit/
+body over --slow-seconds. While those are in flight, --fast-clients threads keep
+fetching interview/summary/<id>/. It reports how the fast requests fare under:
+
+    wsgi  the sync views on a WSGI server with a fixed pool of --threads worker
+          threads, like gunicorn's gthread worker
+    asgi  INTERVIEW_ASYNC_VIEWS under uvicorn, one process
+
+Both servers run in subprocesses against the same seeded temporary SQLite database.
+
+    python -m benchmarks.bench_asgi [--slow-clients 32] [--slow-seconds 5] [--threads 8]
+
+Requires uvicorn (pip install uvicorn) for the asgi mode.
+"""
+import argparse
+import json
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+from benchmarks import _django
+
+
+def serve(mode, port, threads):
+    os.environ['INTERVIEW_ASYNC_VIEWS'] = str(mode == 'asgi')
+    _django.setup()
+
+    from django.conf import settings
+    settings.DEBUG = False
+    settings.ALLOWED_HOSTS = ['127.0.0.1']
+
+    if mode == 'asgi':
+        import uvicorn
+        from django.core.asgi import get_asgi_application
+        uvicorn.run(get_asgi_application(), host='127.0.0.1', port=port, log_level='warning', backlog=2048)
+        return
+
+    from django.core.servers.basehttp import WSGIRequestHandler, WSGIServer
+    from django.core.wsgi import get_wsgi_application
+
+    class PooledWSGIServer(WSGIServer):
+        request_queue_size = 2048
+
+        def __init__(self, *args, **kwargs):
+            super().__init__(*args, **kwargs)
+            self.pool = ThreadPoolExecutor(max_workers=threads)
+
+        def process_request(self, request, client_address):
+            self.pool.submit(self.process_request_thread, request, client_address)
+
+        def process_request_thread(self, request, client_address):
+            try:
+                self.finish_request(request, client_address)
+            except Exception:
+                self.handle_error(request, client_address)
+            finally:
+                self.shutdown_request(request)
+
+    class QuietHandler(WSGIRequestHandler):
+        def log_message(self, *args):
+            pass
+
+    server = PooledWSGIServer(('127.0.0.1', port), QuietHandler)
+    server.set_app(get_wsgi_application())
+    server.serve_forever()
+
+
+def seed(slow, fast):
+    """Candidates with an open session each; returns [(access token, session id, question ids)]."""
+    from django.core.management import call_command
+
+    from interview.services import create_interview_session
+    from questions.importer import import_questions
+    from questions.models import Question
+    from users.models import User
+    from users.tokens import ClaimsTokenObtainPairSerializer
+
+    call_command('migrate', verbosity=0)
+    with open(_django.BACKEND_DIR.parent / 'sample_questions.csv', 'rb') as f:
+        import_questions(f)
+    questions = list(Question.objects.all()[:10])
+    users = User.objects.bulk_create([
+        User(username=f'bench{i}', email=f'bench{i}@example.com') for i in range(slow + fast)
+    ])
+    sessions = []
+    for user in users:
+        session = create_interview_session(user, questions)
+        token = ClaimsTokenObtainPairSerializer.get_token(user).access_token
+        sessions.append((str(token), session.pk, [q.pk for q in questions]))
+    return sessions
+
+
+def slow_submit(port, token, session_id, question_ids, seconds):
+    """POST a submission whose body arrives in pieces over `seconds`; returns the status code."""
+    answers = [{'question_id': qid, 'response': 'A spoken answer ' * 20, 'response_time': 60} for qid in question_ids]
+    body = json.dumps({'session_id': session_id, 'answers': answers}).encode()
+    chunks = 10
+    step = len(body) // chunks + 1
+    with socket.create_connection(('127.0.0.1', port), timeout=seconds + 60) as sock:
+        sock.sendall((
+            f'POST /api/interview/submit/ HTTP/1.1\r\nHost: 127.0.0.1\r\nAuthorization: Bearer {token}\r\n'
+            f'Content-Type: application/json\r\nContent-Length: {len(body)}\r\nConnection: close\r\n\r\n'
+        ).encode())
+        for i in range(0, len(body), step):
+            time.sleep(seconds / chunks)
+            sock.sendall(body[i:i + step])
+        response = b''
+        while chunk := sock.recv(65536):
+            response += chunk
+    return int(response.split(b' ', 2)[1]) if response else 0
+
+
+def fast_summary(port, token, session_id):
+    req = urllib.request.Request(f'http://127.0.0.1:{port}/api/interview/summary/{session_id}/',
+                                 headers={'Authorization': f'Bearer {token}'})
+    start = time.perf_counter()
+    with urllib.request.urlopen(req, timeout=120) as response:
+        response.read()
+    return time.perf_counter() - start
+
+
+def wait_for_port(port, proc, timeout=30):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if proc.poll() is not None:
+            raise RuntimeError(proc.stderr.read().decode().strip().splitlines()[-1])
+        try:
+            socket.create_connection(('127.0.0.1', port), timeout=1).close()
+            return
+        except OSError:
+            time.sleep(0.1)
+    raise RuntimeError(f'server did not start on port {port}')
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def run_mode(mode, args, sessions):
+    port = free_port()
+    proc = subprocess.Popen(
+        [sys.executable, '-m', 'benchmarks.bench_asgi', '--serve', mode, '--port', str(port), '--threads', str(args.threads)],
+        env=os.environ.copy(), stderr=subprocess.PIPE,
+    )
+    try:
+        wait_for_port(port, proc)
+        slow, fast = sessions[:args.slow_clients], sessions[args.slow_clients:]
+        # Warm the summary cache so the fast path measures waiting, not building
+        for token, session_id, _ in fast:
+            fast_summary(port, token, session_id)
+
+        latencies, statuses = [], []
+        deadline = time.perf_counter() + args.slow_seconds
+
+        def fast_loop(token, session_id):
+            while time.perf_counter() < deadline:
+                latencies.append(fast_summary(port, token, session_id))
+
+        wall = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=len(slow) + len(fast)) as pool:
+            slow_futures = [pool.submit(slow_submit, port, token, sid, qids, args.slow_seconds) for token, sid, qids in slow]
+            time.sleep(0.2)  # let the slow uploads take their connections first
+            for future in [pool.submit(fast_loop, token, sid) for token, sid, _ in fast]:
+                future.result()
+            statuses = [future.result() for future in slow_futures]
+        wall = time.perf_counter() - wall
+    finally:
+        proc.terminate()
+        proc.wait()
+
+    latencies.sort()
+    return {
+        'fast_requests': len(latencies),
+        'fast_per_second': len(latencies) / wall,
+        'p50_ms': statistics.median(latencies) * 1000 if latencies else None,
+        'p95_ms': latencies[int(len(latencies) * 0.95) - 1] * 1000 if latencies else None,
+        'slow_ok': statuses.count(200),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--slow-clients', type=int, default=32)
+    parser.add_argument('--slow-seconds', type=float, default=5.0)
+    parser.add_argument('--fast-clients', type=int, default=4)
+    parser.add_argument('--threads', type=int, default=8, help='WSGI worker threads')
+    parser.add_argument('--modes', default='wsgi,asgi')
+    parser.add_argument('--serve', choices=('wsgi', 'asgi'), help=argparse.SUPPRESS)
+    parser.add_argument('--port', type=int, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.serve:
+        serve(args.serve, args.port, args.threads)
+        return
+
+    with tempfile.TemporaryDirectory() as tmp:
+        os.environ['SQLITE_PATH'] = os.path.join(tmp, 'bench.sqlite3')
+        os.environ.setdefault('SQLITE_WAL', 'True')
+        _django.setup()
+        sessions = seed(args.slow_clients, args.fast_clients)
+        from django.db import connection
+        connection.close()
+
+        print(f'{args.slow_clients} slow uploads over {args.slow_seconds}s, {args.fast_clients} fast clients')
+        print(f"{'server':<22} {'fast req/s':>10} {'p50 ms':>9} {'p95 ms':>9} {'slow ok':>8}")
+        for mode in args.modes.split(','):
+            label = f'wsgi ({args.threads} threads)' if mode == 'wsgi' else 'asgi (uvicorn)'
+            try:
+                r = run_mode(mode, args, sessions)
+            except RuntimeError as e:
+                print(f'{label:<22} failed: {e}')
+                continue
+            fmt = lambda v: f'{v:.0f}' if v is not None else '-'  # noqa: E731
+            print(f"{label:<22} {r['fast_per_second']:>10.1f} {fmt(r['p50_ms']):>9} {fmt(r['p95_ms']):>9} "
+                  f"{r['slow_ok']:>4}/{args.slow_clients}")
+
+
+if __name__ == '__main__':
+    main()
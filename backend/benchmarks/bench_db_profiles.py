@@ -0,0 +1,128 @@
+"""
+Concurrency benchmark for the database profiles in settings.DATABASES.
+
+Each profile runs in its own subprocess against a fresh database: candidates are
+seeded, then --concurrency threads each drive interview/start/ followed by
+interview/submit/ through the Django test client. Reports throughput, latency and
+"database is locked" (or other) failures per profile.
+
+    python -m benchmarks.bench_db_profiles [--interviews 400] [--concurrency 16]
+
+The postgres profile runs when POSTGRES_DB (and friends) point at a scratch database.
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+PROFILES = {
+    'sqlite-stock': {'DB_PROFILE': 'sqlite', 'SQLITE_TUNED': 'False', 'DB_CONN_MAX_AGE': '0'},
+    'sqlite-tuned': {'DB_PROFILE': 'sqlite', 'SQLITE_TUNED': 'True', 'SQLITE_WAL': 'True'},
+    'postgres': {'DB_PROFILE': 'postgres'},
+}
+
+
+def run_worker(args):
+    from benchmarks import _django
+    _django.setup()
+
+    from django.contrib.auth.hashers import make_password
+    from django.core.management import call_command
+    from django.db import connection, connections
+    from django.test.utils import setup_test_environment
+    from rest_framework.test import APIClient
+
+    from questions.importer import import_questions
+    from users.models import User
+
+    # Test-client friendly (ALLOWED_HOSTS) and DEBUG off, but against the profile's real database
+    setup_test_environment(debug=False)
+    call_command('migrate', verbosity=0)
+    with open(_django.BACKEND_DIR.parent / 'sample_questions.csv', 'rb') as f:
+        import_questions(f)
+    password = make_password('password')
+    User.objects.bulk_create([
+        User(username=f'bench{i}', email=f'bench{i}@example.com', password=password)
+        for i in range(args.interviews)
+    ])
+    users = list(User.objects.filter(username__startswith='bench'))
+    connection.close()
+
+    def interview(user):
+        client = APIClient()
+        client.force_authenticate(user)
+        timings = {}
+        try:
+            start = time.perf_counter()
+            response = client.post('/api/interview/start/')
+            timings['start'] = time.perf_counter() - start
+            if response.status_code != 200:
+                return timings, f'start {response.status_code}'
+            answers = [{'question_id': q['id'], 'response': 'answer', 'response_time': 10}
+                       for q in response.data['questions']]
+            start = time.perf_counter()
+            response = client.post('/api/interview/submit/', {'session_id': response.data['session_id'], 'answers': answers}, format='json')
+            timings['submit'] = time.perf_counter() - start
+            return timings, None if response.status_code == 200 else f'submit {response.status_code}'
+        except Exception as e:
+            return timings, type(e).__name__ + ': ' + str(e)
+        finally:
+            connections.close_all()
+
+    wall = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.concurrency) as pool:
+        results = list(pool.map(interview, users))
+    wall = time.perf_counter() - wall
+
+    errors = [error for _, error in results if error]
+    report = {'wall': wall, 'completed': len(results) - len(errors), 'errors': len(errors),
+              'error_sample': errors[:3]}
+    for step in ('start', 'submit'):
+        samples = sorted(t[step] for t, _ in results if step in t)
+        if samples:
+            report[step] = {'p50_ms': statistics.median(samples) * 1000,
+                            'p95_ms': samples[int(len(samples) * 0.95) - 1] * 1000}
+    print(json.dumps(report))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--interviews', type=int, default=400)
+    parser.add_argument('--concurrency', type=int, default=16)
+    parser.add_argument('--profiles', default=None, help='comma-separated subset of: ' + ', '.join(PROFILES))
+    parser.add_argument('--worker', action='store_true', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        run_worker(args)
+        return
+
+    names = args.profiles.split(',') if args.profiles else [
+        name for name in PROFILES if name != 'postgres' or os.environ.get('POSTGRES_DB')
+    ]
+    print(f"{'profile':<14} {'interviews/s':>12} {'start p50/p95 ms':>18} {'submit p50/p95 ms':>18} {'errors':>7}")
+    for name in names:
+        with tempfile.TemporaryDirectory() as tmp:
+            env = dict(os.environ, SQLITE_PATH=os.path.join(tmp, 'bench.sqlite3'), **PROFILES[name])
+            proc = subprocess.run(
+                [sys.executable, '-m', 'benchmarks.bench_db_profiles', '--worker',
+                 '--interviews', str(args.interviews), '--concurrency', str(args.concurrency)],
+                env=env, capture_output=True, text=True,
+            )
+        if proc.returncode != 0:
+            print(f'{name:<14} failed: {proc.stderr.strip().splitlines()[-1] if proc.stderr else proc.returncode}')
+            continue
+        r = json.loads(proc.stdout.strip().splitlines()[-1])
+        latency = {step: f"{r[step]['p50_ms']:.0f}/{r[step]['p95_ms']:.0f}" if step in r else '-' for step in ('start', 'submit')}
+        print(f"{name:<14} {r['completed'] / r['wall']:>12.1f} {latency['start']:>18} {latency['submit']:>18} {r['errors']:>7}")
+        for error in r['error_sample']:
+            print(f'{"":<14} e.g. {error}')
+
+
+if __name__ == '__main__':
+    main()
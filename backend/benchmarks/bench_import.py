@@ -0,0 +1,60 @@
+"""
+Benchmark for the streaming CSV question importer.
+
+Generates a CSV of --rows rows by cycling sample_questions.csv, imports it into a
+throwaway test database and reports throughput and peak Python memory.
+
+    python -m benchmarks.bench_import [--rows 1000000] [--batch-size 1000]
+"""
+import argparse
+import csv
+import tempfile
+import time
+import tracemalloc
+
+from benchmarks import _django
+
+_django.setup()
+_django.use_test_database()
+
+from questions.importer import import_questions  # noqa: E402
+
+SAMPLE_CSV = _django.BACKEND_DIR.parent / 'sample_questions.csv'
+
+
+def write_csv(path, rows):
+    with open(SAMPLE_CSV, newline='', encoding='utf-8') as f:
+        seed = list(csv.DictReader(f))
+    with open(path, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.DictWriter(f, fieldnames=['text', 'topic', 'difficulty', 'time_required'])
+        writer.writeheader()
+        for i in range(rows):
+            row = dict(seed[i % len(seed)])
+            row['text'] = f"{row['text']} ({i})"
+            writer.writerow(row)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--rows', type=int, default=100_000)
+    parser.add_argument('--batch-size', type=int, default=None)
+    args = parser.parse_args()
+
+    with tempfile.NamedTemporaryFile(suffix='.csv') as tmp:
+        write_csv(tmp.name, args.rows)
+        with open(tmp.name, 'rb') as f:
+            tracemalloc.start()
+            start = time.perf_counter()
+            result = import_questions(f, batch_size=args.batch_size)
+            elapsed = time.perf_counter() - start
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+
+    print(f'rows:        {result.total_rows}')
+    print(f'created:     {result.created} ({result.error_count} errors)')
+    print(f'elapsed:     {elapsed:.2f}s ({result.total_rows / elapsed:,.0f} rows/s)')
+    print(f'peak memory: {peak / 1024 / 1024:.1f} MiB (Python allocations)')
+
+
+if __name__ == '__main__':
+    main()
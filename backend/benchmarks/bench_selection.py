@@ -0,0 +1,89 @@
+"""
+Micro-benchmark for interview question selection.
+
+Builds in-memory banks of 1k, 10k and 100k questions and times the pool index
+build plus the per-start selection, against the original inline algorithm.
+
+    python -m benchmarks.bench_selection [--starts 200]
+"""
+import argparse
+import random
+import time
+
+from benchmarks import _django
+
+_django.setup()
+
+from interview.selection import DEFAULT_BLUEPRINT, get_selection_policy  # noqa: E402
+from questions.models import Question  # noqa: E402
+from questions.pool import QuestionPool  # noqa: E402
+
+TOPICS = [
+    ('Personal', 'easy'), ('Technical', 'easy'), ('Technical', 'medium'),
+    ('Problem Solving', 'medium'), ('Teamwork', 'medium'), ('Learning', 'medium'),
+    ('Architecture', 'hard'), ('Web Development', 'medium'), ('Databases', 'hard'),
+]
+
+
+def make_bank(size):
+    rng = random.Random(size)
+    bank = []
+    for i in range(1, size + 1):
+        topic, difficulty = TOPICS[i % len(TOPICS)]
+        bank.append(Question(id=i, text=f'Question {i}', topic=topic, difficulty=difficulty,
+                             time_required=rng.choice([60, 90, 120])))
+    return bank
+
+
+def legacy_select(all_questions, max_time=900):
+    """The selection loop StartInterviewView used before the selection engine."""
+    questions_by_topic_diff = {}
+    for q in all_questions:
+        questions_by_topic_diff.setdefault((q.topic, q.difficulty), []).append(q)
+    selected_questions = []
+    total_time = 0
+    for (topic, difficulty), count in DEFAULT_BLUEPRINT.target_distribution.items():
+        available = questions_by_topic_diff.get((topic, difficulty), [])
+        if available:
+            for q in random.sample(available, min(count, len(available))):
+                if total_time + q.time_required <= max_time:
+                    selected_questions.append(q)
+                    total_time += q.time_required
+        if len(selected_questions) < 10:
+            remaining_questions = [q for q in all_questions if q not in selected_questions]
+            random.shuffle(remaining_questions)
+            for q in remaining_questions:
+                if len(selected_questions) >= 10:
+                    break
+                if total_time + q.time_required <= max_time:
+                    selected_questions.append(q)
+                    total_time += q.time_required
+    return selected_questions
+
+
+def timed(fn, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - start) / repeat * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--starts', type=int, default=200, help='interview starts timed per bank size')
+    args = parser.parse_args()
+
+    policy = get_selection_policy()
+    print(f"{'bank':>8} {'index build ms':>15} {'select ms':>10} {'legacy ms':>10}")
+    for size in (1_000, 10_000, 100_000):
+        bank = make_bank(size)
+        build_ms = timed(lambda: QuestionPool(bank), 3)
+        pool = QuestionPool(bank)
+        select_ms = timed(lambda: policy.select(pool, DEFAULT_BLUEPRINT), args.starts)
+        # The legacy loop is far slower; keep its run count bounded
+        legacy_ms = timed(lambda: legacy_select(bank), max(1, min(args.starts, 200_000 // size)))
+        print(f'{size:>8} {build_ms:>15.2f} {select_ms:>10.4f} {legacy_ms:>10.2f}')
+
+
+if __name__ == '__main__':
+    main()
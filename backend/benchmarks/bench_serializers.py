@@ -0,0 +1,77 @@
+"""
+Throughput of the session summary payload: InterviewSessionSerializer versus the
+values()-based fast path in interview.fast_serializers, JSON rendering included.
+
+    python -m benchmarks.bench_serializers [--sessions 200] [--questions 10]
+"""
+import argparse
+import time
+
+from benchmarks import _django
+
+_django.setup()
+_django.use_test_database()
+
+from rest_framework.renderers import JSONRenderer  # noqa: E402
+
+from interview.fast_serializers import session_payloads  # noqa: E402
+from interview.models import InterviewSession, SessionQuestion  # noqa: E402
+from interview.serializers import InterviewSessionSerializer  # noqa: E402
+from questions.models import Question  # noqa: E402
+from users.models import User  # noqa: E402
+
+
+def seed(sessions, per_session):
+    user = User.objects.create(username='bench', email='bench@example.com')
+    questions = Question.objects.bulk_create([
+        Question(text=f'Question {i}', topic='Technical', difficulty='medium', time_required=90)
+        for i in range(per_session * 5)
+    ])
+    session_ids = []
+    for s in range(sessions):
+        session = InterviewSession.objects.create(user=user, score=50.0)
+        SessionQuestion.objects.bulk_create([
+            SessionQuestion(session=session, question=questions[(s + i) % len(questions)],
+                            response='An answer of moderate length. ' * 4, response_time=30, is_correct=True)
+            for i in range(per_session)
+        ])
+        session_ids.append(session.pk)
+    return session_ids
+
+
+def drf(session_ids):
+    renderer = JSONRenderer()
+    return [renderer.render(InterviewSessionSerializer(InterviewSession.objects.get(pk=pk)).data) for pk in session_ids]
+
+
+def drf_prefetched(session_ids):
+    renderer = JSONRenderer()
+    sessions = (InterviewSession.objects.filter(pk__in=session_ids).select_related('user')
+                .prefetch_related('sessionquestion_set__question'))
+    return [renderer.render(InterviewSessionSerializer(s).data) for s in sessions]
+
+
+def fast(session_ids):
+    renderer = JSONRenderer()
+    return [renderer.render(payload) for payload in session_payloads(session_ids)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--sessions', type=int, default=200)
+    parser.add_argument('--questions', type=int, default=10, help='questions per session')
+    args = parser.parse_args()
+
+    session_ids = seed(args.sessions, args.questions)
+    assert fast(session_ids) == drf(session_ids), 'fast path output differs from the serializers'
+
+    print(f"{'path':<28} {'sessions/s':>12}")
+    for name, fn in (('InterviewSessionSerializer', drf), ('  + prefetch_related', drf_prefetched), ('fast_serializers', fast)):
+        start = time.perf_counter()
+        fn(session_ids)
+        elapsed = time.perf_counter() - start
+        print(f'{name:<28} {len(session_ids) / elapsed:>12,.0f}')
+
+
+if __name__ == '__main__':
+    main()
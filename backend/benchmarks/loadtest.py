@@ -0,0 +1,259 @@
+"""
+Load test that simulates a cohort of candidates taking interviews.
+
+Each simulated candidate runs the real HTTP flow:
+
+    api/token/ -> api/interview/start/ -> api/interview/submit/ -> api/interview/summary/<id>/
+
+By default the harness is self-contained: it migrates a temporary SQLite database,
+seeds --candidates accounts plus the question bank from sample_questions.csv, and
+serves the project on a local threaded WSGI server in this process, counting SQL
+queries per endpoint. With --server it drives an already running deployment instead;
+seed that one first with --seed-only using the same settings as the server.
+
+    python -m benchmarks.loadtest [--candidates 50] [--concurrency 10]
+    python -m benchmarks.loadtest --save-baseline benchmarks/loadtest_baseline.json
+    python -m benchmarks.loadtest --baseline benchmarks/loadtest_baseline.json
+"""
+import argparse
+import json
+import os
+import re
+import statistics
+import tempfile
+import threading
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+from benchmarks import _django
+
+PASSWORD = 'loadtest-password'
+ENDPOINTS = ('token', 'start', 'submit', 'summary')
+
+
+def seed(candidates):
+    from django.contrib.auth.hashers import make_password
+
+    from questions.importer import import_questions
+    from questions.models import Question
+    from users.models import User
+
+    if not Question.objects.exists():
+        with open(_django.BACKEND_DIR.parent / 'sample_questions.csv', 'rb') as f:
+            import_questions(f)
+    User.objects.filter(username__startswith='loadtest-').delete()
+    # One hash for everyone: seeding shouldn't take longer than the test
+    password = make_password(PASSWORD)
+    User.objects.bulk_create([
+        User(username=f'loadtest-{i}', email=f'loadtest-{i}@example.com', password=password)
+        for i in range(candidates)
+    ])
+    return [f'loadtest-{i}' for i in range(candidates)]
+
+
+class QueryCounter:
+    """WSGI wrapper recording the number of SQL queries per endpoint label."""
+
+    def __init__(self, app):
+        self.app = app
+        self.counts = {}
+        self.lock = threading.Lock()
+
+    def __call__(self, environ, start_response):
+        from django.db import connection
+
+        queries = [0]
+
+        def count(execute, sql, params, many, context):
+            queries[0] += 1
+            return execute(sql, params, many, context)
+
+        with connection.execute_wrapper(count):
+            result = self.app(environ, start_response)
+            try:
+                body = b''.join(result)
+            finally:
+                # Sends request_finished, which releases the thread's DB connection
+                result.close()
+        label = endpoint_label(environ['PATH_INFO'])
+        with self.lock:
+            self.counts.setdefault(label, []).append(queries[0])
+        return [body]
+
+
+def endpoint_label(path):
+    for name, pattern in (('token', r'/api/token/$'), ('start', r'/interview/start/$'),
+                          ('submit', r'/interview/submit/$'), ('summary', r'/interview/summary/\d+/$')):
+        if re.search(pattern, path):
+            return name
+    return path
+
+
+def serve(app):
+    from django.core.servers.basehttp import ThreadedWSGIServer, WSGIRequestHandler
+
+    class QuietHandler(WSGIRequestHandler):
+        def log_message(self, *args):
+            pass
+
+    server = ThreadedWSGIServer(('127.0.0.1', 0), QuietHandler, allow_reuse_address=True)
+    server.request_queue_size = 1024
+    server.set_app(app)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f'http://127.0.0.1:{server.server_address[1]}'
+
+
+def request(base_url, method, path, payload=None, token=None):
+    headers = {'Content-Type': 'application/json'}
+    if token:
+        headers['Authorization'] = f'Bearer {token}'
+    data = json.dumps(payload).encode() if payload is not None else None
+    req = urllib.request.Request(base_url + path, data=data, headers=headers, method=method)
+    start = time.perf_counter()
+    try:
+        with urllib.request.urlopen(req, timeout=120) as response:
+            body = json.loads(response.read() or b'null')
+            status = response.status
+    except urllib.error.HTTPError as e:
+        body, status = None, e.code
+    return status, body, time.perf_counter() - start
+
+
+def run_candidate(base_url, username):
+    """Run one interview; returns {endpoint: seconds} and an error string or None."""
+    timings = {}
+    status, body, timings['token'] = request(base_url, 'POST', '/api/token/', {'username': username, 'password': PASSWORD})
+    if status != 200:
+        return timings, f'token {status}'
+    token = body['access']
+
+    status, body, timings['start'] = request(base_url, 'POST', '/api/interview/start/', {}, token)
+    if status != 200:
+        return timings, f'start {status}'
+    session_id = body['session_id']
+    answers = [{'question_id': q['id'], 'response': 'An answer', 'response_time': 30} for q in body['questions']]
+
+    status, _, timings['submit'] = request(base_url, 'POST', '/api/interview/submit/',
+                                           {'session_id': session_id, 'answers': answers}, token)
+    if status != 200:
+        return timings, f'submit {status}'
+
+    status, _, timings['summary'] = request(base_url, 'GET', f'/api/interview/summary/{session_id}/', token=token)
+    return timings, None if status == 200 else f'summary {status}'
+
+
+def percentile(sorted_samples, pct):
+    index = max(0, min(len(sorted_samples) - 1, round(pct / 100 * len(sorted_samples)) - 1))
+    return sorted_samples[index]
+
+
+def build_report(results, wall, query_counts, concurrency):
+    report = {
+        'candidates': len(results),
+        'concurrency': concurrency,
+        'wall_seconds': round(wall, 3),
+        'interviews_per_second': round(sum(1 for _, error in results if not error) / wall, 2),
+        'errors': [error for _, error in results if error],
+        'endpoints': {},
+    }
+    for name in ENDPOINTS:
+        samples = sorted(timings[name] * 1000 for timings, _ in results if name in timings)
+        if not samples:
+            continue
+        stats = {
+            'requests': len(samples),
+            'requests_per_second': round(len(samples) / wall, 2),
+            'p50_ms': round(statistics.median(samples), 1),
+            'p95_ms': round(percentile(samples, 95), 1),
+            'p99_ms': round(percentile(samples, 99), 1),
+        }
+        if name in query_counts:
+            stats['queries_per_request'] = round(statistics.mean(query_counts[name]), 1)
+        report['endpoints'][name] = stats
+    return report
+
+
+def print_report(report, baseline=None):
+    print(f"{report['candidates']} candidates, concurrency {report['concurrency']}: "
+          f"{report['interviews_per_second']} interviews/s over {report['wall_seconds']}s, "
+          f"{len(report['errors'])} errors")
+    header = f"{'endpoint':<10} {'req/s':>8} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'queries':>8}"
+    if baseline:
+        header += f"  {'p95 vs baseline':>16}"
+    print(header)
+    for name, stats in report['endpoints'].items():
+        line = (f"{name:<10} {stats['requests_per_second']:>8} {stats['p50_ms']:>9} {stats['p95_ms']:>9} "
+                f"{stats['p99_ms']:>9} {stats.get('queries_per_request', '-'):>8}")
+        previous = (baseline or {}).get('endpoints', {}).get(name)
+        if previous:
+            change = (stats['p95_ms'] - previous['p95_ms']) / previous['p95_ms'] * 100 if previous['p95_ms'] else 0
+            line += f"  {change:>+15.0f}%"
+        print(line)
+    for error in report['errors'][:5]:
+        print(f'  error: {error}')
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--candidates', type=int, default=50)
+    parser.add_argument('--concurrency', type=int, default=10)
+    parser.add_argument('--server', help='base URL of a running server, e.g. http://127.0.0.1:8000')
+    parser.add_argument('--seed-only', action='store_true', help='seed the configured database and exit')
+    parser.add_argument('--baseline', help='compare against a saved report')
+    parser.add_argument('--save-baseline', help='write this run\'s report as JSON')
+    args = parser.parse_args()
+
+    tmp = None
+    if not (args.server or args.seed_only):
+        tmp = tempfile.TemporaryDirectory()
+        os.environ['SQLITE_PATH'] = os.path.join(tmp.name, 'loadtest.sqlite3')
+        os.environ.setdefault('SQLITE_WAL', 'True')
+    _django.setup()
+
+    from django.conf import settings
+    from django.core.management import call_command
+    from django.core.wsgi import get_wsgi_application
+
+    counter = None
+    if args.server:
+        base_url = args.server.rstrip('/')
+        usernames = [f'loadtest-{i}' for i in range(args.candidates)]
+    else:
+        if tmp:
+            call_command('migrate', verbosity=0)
+        usernames = seed(args.candidates)
+        if args.seed_only:
+            print(f'Seeded {len(usernames)} candidates.')
+            return
+        # Measure with production-like settings, not DEBUG's query log
+        settings.DEBUG = False
+        settings.ALLOWED_HOSTS = ['127.0.0.1']
+        counter = QueryCounter(get_wsgi_application())
+        server, base_url = serve(counter)
+
+    wall = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.concurrency) as pool:
+        results = list(pool.map(lambda username: run_candidate(base_url, username), usernames))
+    wall = time.perf_counter() - wall
+
+    report = build_report(results, wall, counter.counts if counter else {}, args.concurrency)
+    baseline = None
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+    print_report(report, baseline)
+    if args.save_baseline:
+        with open(args.save_baseline, 'w') as f:
+            json.dump(report, f, indent=2)
+            f.write('\n')
+
+    if counter:
+        server.shutdown()
+    if tmp:
+        tmp.cleanup()
+
+
+if __name__ == '__main__':
+    main()
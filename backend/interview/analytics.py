@@ -0,0 +1,154 @@
+"""
+Database-side analytics for a date window and/or topic and difficulty.
+
+All-time, unfiltered analytics are served from the rollups in interview.rollups;
+anything filtered is computed here with values().annotate() GROUP BY queries, which
+use the InterviewSession.start_time and SessionQuestion(question, is_correct) indexes.
+Both carry a `timeseries`; unfiltered responses chart the last
+ANALYTICS_DEFAULT_SERIES_DAYS days, so they never scan all sessions.
+"""
+from datetime import datetime, time, timedelta
+from typing import Any, Dict, Optional
+
+from django.db.models import Avg, Count, Q
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+
+from .models import InterviewSession, SessionQuestion
+
+MISSED = ~Q(is_correct=True)
+
+
+class AnalyticsFilters:
+    def __init__(self, start: Optional[datetime] = None, end: Optional[datetime] = None,
+                 topic: Optional[str] = None, difficulty: Optional[str] = None):
+        self.start = start
+        self.end = end
+        self.topic = topic
+        self.difficulty = difficulty
+
+    @classmethod
+    def from_query_params(cls, params) -> 'AnalyticsFilters':
+        """
+        Parse ?days=, ?start=, ?end=, ?topic= and ?difficulty=; raises ValueError on bad
+        input. ?days= (the last N days) and ?start= are mutually exclusive.
+        """
+        start = _parse_bound(params.get('start'), 'start')
+        end = _parse_bound(params.get('end'), 'end', end_of_day=True)
+        days = params.get('days')
+        if days and start:
+            raise ValueError('Use either days or start, not both')
+        if days:
+            try:
+                days = int(days)
+            except ValueError:
+                raise ValueError('days must be a number')
+            if days <= 0:
+                raise ValueError('days must be positive')
+            start = timezone.now() - timedelta(days=days)
+        return cls(start, end, params.get('topic') or None, params.get('difficulty') or None)
+
+    @classmethod
+    def last_days(cls, days: int) -> 'AnalyticsFilters':
+        return cls(start=timezone.now() - timedelta(days=days))
+
+    @property
+    def is_empty(self) -> bool:
+        return not (self.start or self.end or self.topic or self.difficulty)
+
+    def sessions(self):
+        sessions = InterviewSession.objects.all()  # type: ignore[attr-defined]
+        if self.start:
+            sessions = sessions.filter(start_time__gte=self.start)
+        if self.end:
+            sessions = sessions.filter(start_time__lt=self.end)
+        return sessions
+
+    def session_questions(self):
+        session_questions = SessionQuestion.objects.all()  # type: ignore[attr-defined]
+        if self.start:
+            session_questions = session_questions.filter(session__start_time__gte=self.start)
+        if self.end:
+            session_questions = session_questions.filter(session__start_time__lt=self.end)
+        if self.topic:
+            session_questions = session_questions.filter(question__topic=self.topic)
+        if self.difficulty:
+            session_questions = session_questions.filter(question__difficulty=self.difficulty)
+        return session_questions
+
+
+def _parse_bound(value: Optional[str], name: str, end_of_day: bool = False) -> Optional[datetime]:
+    if not value:
+        return None
+    try:
+        # Dates first: parse_datetime also accepts a bare date, as midnight
+        day = parse_date(value)
+        parsed = parse_datetime(value) if day is None else None
+    except ValueError:
+        day = parsed = None
+    if day is not None:
+        # A bare end date includes that whole day
+        parsed = datetime.combine(day + timedelta(days=1) if end_of_day else day, time.min)
+    elif parsed is None:
+        raise ValueError(f'{name} must be an ISO date or datetime')
+    if timezone.is_naive(parsed):
+        parsed = timezone.make_aware(parsed)
+    return parsed
+
+
+def windowed_analytics(filters: AnalyticsFilters) -> Dict[str, Any]:
+    sessions = filters.sessions()
+    session_questions = filters.session_questions()
+
+    summary = sessions.aggregate(total_sessions=Count('pk'), avg_score=Avg('score'))
+    topic_rows = (
+        session_questions.values('question__topic')
+        .annotate(total=Count('pk'), missed=Count('pk', filter=MISSED))
+        .order_by('question__topic')
+    )
+    most_missed = (
+        session_questions.filter(MISSED)
+        .values('question_id')
+        .annotate(missed=Count('pk'))
+        .order_by('-missed', 'question_id')[:5]
+    )
+
+    return {
+        'total_sessions': summary['total_sessions'],
+        'avg_score': summary['avg_score'] or 0,
+        'topic_stats': {row['question__topic']: {'total': row['total'], 'missed': row['missed']} for row in topic_rows},
+        'most_missed_questions': [(row['question_id'], row['missed']) for row in most_missed],
+        'timeseries': daily_series(filters),
+    }
+
+
+def daily_series(filters: AnalyticsFilters):
+    """
+    Per-day buckets keyed by session start date. `sessions` and `avg_score` follow the
+    date window only; `answers` and `missed` also honour the topic and difficulty filters.
+    """
+    days: Dict[Any, Dict[str, Any]] = {}
+
+    def bucket(day):
+        return days.setdefault(day, {'date': day, 'sessions': 0, 'avg_score': 0, 'answers': 0, 'missed': 0})
+
+    session_rows = (
+        filters.sessions().annotate(day=TruncDate('start_time'))
+        .values('day').annotate(sessions=Count('pk'), avg_score=Avg('score')).order_by()
+    )
+    for row in session_rows:
+        entry = bucket(row['day'])
+        entry['sessions'] = row['sessions']
+        entry['avg_score'] = row['avg_score'] or 0
+
+    answer_rows = (
+        filters.session_questions().annotate(day=TruncDate('session__start_time'))
+        .values('day').annotate(answers=Count('pk'), missed=Count('pk', filter=MISSED)).order_by()
+    )
+    for row in answer_rows:
+        entry = bucket(row['day'])
+        entry['answers'] = row['answers']
+        entry['missed'] = row['missed']
+
+    return [days[day] for day in sorted(days)]
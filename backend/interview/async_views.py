@@ -0,0 +1,119 @@
+"""
+Async (ASGI) versions of the candidate-facing interview endpoints.
+
+Mounted instead of StartInterviewView, SubmitAnswersView and SessionSummaryView
+when INTERVIEW_ASYNC_VIEWS is set (see interview.urls); URLs, payloads and status
+codes are the same. DRF 3.14 has no async APIView, so these are plain Django
+coroutine views: authentication uses ClaimsJWTAuthentication.aauthenticate and
+responses are rendered with DRF's JSONRenderer.
+
+Reads use the async ORM. Work that needs a transaction (creating a session,
+submitting answers) or builds a cached payload runs in sync_to_async. Under ASGI,
+a request that is waiting on a slow client or on the database therefore doesn't
+hold a worker thread.
+"""
+import functools
+import json
+
+from asgiref.sync import sync_to_async
+from django.http import HttpResponse, HttpResponseNotAllowed
+from rest_framework.renderers import JSONRenderer
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+
+from backend.caching import cached_entry, get_version
+from users.tokens import ClaimsJWTAuthentication
+from .fast_serializers import question_instance_data, session_payload
+from .models import InterviewSession
+from .services import InterviewNotAllowed, NoQuestionsAvailable, start_interview_session, submit_answers
+
+
+def json_response(data, status=200, headers=None):
+    return HttpResponse(JSONRenderer().render(data), status=status, headers=headers,
+                        content_type='application/json')
+
+
+def endpoint(method):
+    """
+    Allow only `method`, authenticate and call view(request, user, ...).
+
+    Stands in for @api_view/@csrf_exempt/@require_POST, whose Django 4.2 and DRF 3.14
+    versions only wrap sync views.
+    """
+    def decorator(view):
+        @functools.wraps(view)
+        async def wrapper(request, *args, **kwargs):
+            if request.method != method:
+                return HttpResponseNotAllowed([method])
+            unauthorized = {'WWW-Authenticate': 'Bearer realm="api"'}
+            try:
+                result = await ClaimsJWTAuthentication().aauthenticate(request)
+            except (AuthenticationFailed, InvalidToken) as e:
+                return json_response(e.detail, status=401, headers=unauthorized)
+            if result is None:
+                return json_response({'detail': 'Authentication credentials were not provided.'}, status=401,
+                                     headers=unauthorized)
+            return await view(request, result[0], *args, **kwargs)
+
+        wrapper.csrf_exempt = True  # type: ignore[attr-defined]
+        return wrapper
+    return decorator
+
+
+def parse_json(request):
+    try:
+        return json.loads(request.body or b'{}'), None
+    except ValueError as e:
+        return None, json_response({'detail': f'JSON parse error - {e}'}, status=400)
+
+
+@endpoint('POST')
+async def start_interview(request, user):
+    if user.role == 'candidate' and (user.has_completed_interview or user.is_blocked_from_interview):
+        return json_response({'error': 'You are not allowed to take another interview at this time.'}, status=403)
+
+    try:
+        session, selected_questions = await sync_to_async(start_interview_session)(user)
+    except NoQuestionsAvailable:
+        return json_response({'error': 'No questions available.'}, status=400)
+    except InterviewNotAllowed:
+        return json_response({'error': 'You are not allowed to take another interview at this time.'}, status=403)
+
+    return json_response({
+        'session_id': session.id,
+        'questions': [question_instance_data(q) for q in selected_questions],
+    })
+
+
+@endpoint('POST')
+async def submit_interview(request, user):
+    data, invalid = parse_json(request)
+    if invalid:
+        return invalid
+    session_id = data.get('session_id')
+    answers = data.get('answers', [])
+    try:
+        session = await InterviewSession.objects.aget(id=session_id, user_id=user.id)  # type: ignore[attr-defined]
+    except (InterviewSession.DoesNotExist, ValueError, TypeError):  # type: ignore[attr-defined]
+        return json_response({'error': 'Session not found.'}, status=404)
+
+    await sync_to_async(submit_answers)(session, user, answers)
+    return json_response({'success': True, 'score': session.score})
+
+
+@endpoint('GET')
+async def session_summary(request, user, session_id):
+    def load():
+        key = f"summary:{session_id}:{get_version(f'session:{session_id}')}"
+        return cached_entry(key, lambda: session_payload(session_id))
+
+    try:
+        etag, data, owner_id = await sync_to_async(load)()
+    except InterviewSession.DoesNotExist:  # type: ignore[attr-defined]
+        return json_response({'error': 'Session not found.'}, status=404)
+    # Only allow owner or admin
+    if owner_id != user.id and user.role != 'admin':
+        return json_response({'error': 'Not authorized.'}, status=403)
+
+    if etag in request.headers.get('If-None-Match', ''):
+        return HttpResponse(status=304, headers={'ETag': etag})
+    return json_response(data, headers={'ETag': etag})
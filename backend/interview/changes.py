@@ -0,0 +1,67 @@
+"""
+Change feed behind the admin dashboard's incremental refresh.
+
+A cursor is the server time of the previous read. Changes are found through
+updated_at columns (Question, User), session start/end times (which move a
+candidate's session aggregates) and Tombstone rows for deletes, all indexed, so a
+read costs in proportion to what changed rather than to the size of the tables.
+
+Reads look CHANGE_FEED_OVERLAP_SECONDS further back than the cursor so that writes
+committed late by a slow transaction are not missed; clients apply the feed as
+upserts, so the repeats are harmless. Tombstones older than
+TOMBSTONE_RETENTION_DAYS are pruned, and a cursor older than that asks the client
+to reload in full.
+"""
+from datetime import datetime, timedelta, timezone as dt_timezone
+from typing import List, Set
+
+from django.conf import settings
+from django.utils import timezone
+
+from questions.models import Question
+from users.models import User
+from .models import InterviewSession, Tombstone
+
+
+def encode_cursor(moment: datetime) -> str:
+    return str(int(moment.timestamp() * 1_000_000))
+
+
+def decode_cursor(cursor: str) -> datetime:
+    """Raises ValueError for anything encode_cursor() did not produce."""
+    return datetime.fromtimestamp(int(cursor) / 1_000_000, tz=dt_timezone.utc)
+
+
+def retention() -> timedelta:
+    return timedelta(days=getattr(settings, 'TOMBSTONE_RETENTION_DAYS', 30))
+
+
+def read_from(cursor_time: datetime) -> datetime:
+    return cursor_time - timedelta(seconds=getattr(settings, 'CHANGE_FEED_OVERLAP_SECONDS', 5))
+
+
+def is_expired(cursor_time: datetime) -> bool:
+    return cursor_time < timezone.now() - retention()
+
+
+def changed_questions(since: datetime):
+    return Question.objects.filter(updated_at__gt=since).order_by('updated_at')  # type: ignore[attr-defined]
+
+
+def changed_candidate_ids(since: datetime) -> Set[int]:
+    ids = set(User.objects.filter(role='candidate', updated_at__gt=since).values_list('pk', flat=True))  # type: ignore[attr-defined]
+    for field in ('start_time', 'end_time'):
+        ids.update(InterviewSession.objects.filter(**{f'{field}__gt': since}).values_list('user_id', flat=True))  # type: ignore[attr-defined]
+    return ids
+
+
+def deleted_ids(kind: str, since: datetime) -> List[int]:
+    return list(
+        Tombstone.objects.filter(kind=kind, deleted_at__gt=since)  # type: ignore[attr-defined]
+        .order_by('object_id').values_list('object_id', flat=True).distinct()
+    )
+
+
+def prune_tombstones() -> int:
+    deleted, _ = Tombstone.objects.filter(deleted_at__lt=timezone.now() - retention()).delete()  # type: ignore[attr-defined]
+    return deleted
@@ -0,0 +1,90 @@
+"""
+Read-only fast path for interview payloads.
+
+Builds the same data as InterviewSessionSerializer (and the nested
+SessionQuestionSerializer/QuestionSerializer) from values() projections, skipping
+DRF's per-field machinery. Output renders to byte-identical JSON; keep the field
+lists below in step with the ModelSerializers.
+"""
+from typing import Any, Dict, Iterable, List, Tuple
+
+from rest_framework import serializers
+
+from questions.models import Question
+from .models import InterviewSession, SessionQuestion
+
+QUESTION_FIELDS = ('id', 'text', 'topic', 'difficulty', 'time_required')
+SESSION_QUESTION_FIELDS = ('id', 'question_id', 'response', 'response_time', 'is_correct')
+SESSION_FIELDS = ('id', 'user_id', 'user__username', 'start_time', 'end_time', 'score')
+
+# DRF's own field, so datetimes honour DATETIME_FORMAT and the current timezone
+_datetime = serializers.DateTimeField()
+
+
+def _dt(value):
+    return None if value is None else _datetime.to_representation(value)
+
+
+def question_data(row: Dict[str, Any]) -> Dict[str, Any]:
+    return {field: row[field] for field in QUESTION_FIELDS}
+
+
+def question_instance_data(question: Question) -> Dict[str, Any]:
+    return {field: getattr(question, field) for field in QUESTION_FIELDS}
+
+
+def session_payloads(session_ids: Iterable[int]) -> List[Dict[str, Any]]:
+    """Serialize sessions in the given order with three queries, whatever their size."""
+    return [payload for payload, _ in _payloads_with_owner(session_ids)]
+
+
+def session_payload(session_id: int) -> Tuple[Dict[str, Any], int]:
+    """
+    Serialize one session, returning (payload, owner user id).
+
+    Raises InterviewSession.DoesNotExist if it is missing.
+    """
+    payloads = _payloads_with_owner([session_id])
+    if not payloads:
+        raise InterviewSession.DoesNotExist  # type: ignore[attr-defined]
+    return payloads[0]
+
+
+def _payloads_with_owner(session_ids: Iterable[int]) -> List[Tuple[Dict[str, Any], int]]:
+    session_ids = list(session_ids)
+    sessions = {
+        row['id']: row
+        for row in InterviewSession.objects.filter(pk__in=session_ids).values(*SESSION_FIELDS)  # type: ignore[attr-defined]
+    }
+    session_questions = list(
+        SessionQuestion.objects.filter(session_id__in=session_ids).values('session_id', *SESSION_QUESTION_FIELDS)  # type: ignore[attr-defined]
+    )
+    questions = {
+        row['id']: question_data(row)
+        for row in Question.objects.filter(pk__in={sq['question_id'] for sq in session_questions}).values(*QUESTION_FIELDS)  # type: ignore[attr-defined]
+    }
+
+    by_session: Dict[int, List[Dict[str, Any]]] = {}
+    for sq in session_questions:
+        by_session.setdefault(sq['session_id'], []).append({
+            'id': sq['id'],
+            'question': questions[sq['question_id']],
+            'response': sq['response'],
+            'response_time': sq['response_time'],
+            'is_correct': sq['is_correct'],
+        })
+
+    payloads = []
+    for session_id in session_ids:
+        row = sessions.get(session_id)
+        if row is None:
+            continue
+        payloads.append(({
+            'id': row['id'],
+            'user': row['user__username'],
+            'start_time': _dt(row['start_time']),
+            'end_time': _dt(row['end_time']),
+            'score': row['score'],
+            'sessionquestion_set': by_session.get(session_id, []),
+        }, row['user_id']))
+    return payloads
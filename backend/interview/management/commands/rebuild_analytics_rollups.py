@@ -0,0 +1,13 @@
+from django.core.management.base import BaseCommand
+
+from interview import rollups
+from interview.models import QuestionRollup
+
+
+class Command(BaseCommand):
+    help = 'Recompute the analytics rollups from all SessionQuestion rows.'
+
+    def handle(self, *args, **options):
+        rollups.rebuild()
+        count = QuestionRollup.objects.count()  # type: ignore[attr-defined]
+        self.stdout.write(self.style.SUCCESS(f'Rebuilt analytics rollups for {count} questions.'))
@@ -0,0 +1,24 @@
+from django.core.management.base import BaseCommand
+
+from interview.rescoring import rescore_sessions
+
+
+class Command(BaseCommand):
+    help = 'Rescore all submitted sessions with INTERVIEW_SCORER (or --scorer).'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--scorer', help='Dotted path of the scorer to use instead of INTERVIEW_SCORER.')
+        parser.add_argument('--chunk-size', type=int, default=500, help='Sessions per chunk.')
+        parser.add_argument('--workers', type=int, default=None,
+                            help='Scoring processes (default: CPU count; 0 scores in this process).')
+
+    def handle(self, *args, **options):
+        def progress(result):
+            if options['verbosity'] > 1:
+                self.stdout.write(f'{result.sessions} sessions, {result.answers} answers scored...')
+
+        result = rescore_sessions(options['chunk_size'], options['workers'], options['scorer'], progress)
+        self.stdout.write(self.style.SUCCESS(
+            f'Rescored {result.sessions} sessions ({result.answers} answers): '
+            f'{result.changed_answers} answers and {result.changed_sessions} session scores changed.'
+        ))
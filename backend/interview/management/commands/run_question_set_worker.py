@@ -0,0 +1,22 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from interview import pregeneration
+
+
+class Command(BaseCommand):
+    help = 'Keep INTERVIEW_PREGENERATED_SETS interview question sets ready for interview starts.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--once', action='store_true', help='Fill the buffer once and exit.')
+        parser.add_argument('--interval', type=float, default=1.0, help='Seconds between checks of a full buffer.')
+
+    def handle(self, *args, **options):
+        while True:
+            written = pregeneration.refill()
+            if written:
+                self.stdout.write(f'Generated {written} question set(s).')
+            if options['once']:
+                break
+            time.sleep(options['interval'])
@@ -0,0 +1,36 @@
+# Generated by Django 4.2.7 on 2026-10-18 15:44
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+def backfill_rollups(apps, schema_editor):
+    SessionQuestion = apps.get_model('interview', 'SessionQuestion')
+    QuestionRollup = apps.get_model('interview', 'QuestionRollup')
+    rows = SessionQuestion.objects.values('question_id').annotate(
+        total=models.Count('pk'), missed=models.Count('pk', filter=~models.Q(is_correct=True)),
+    )
+    QuestionRollup.objects.bulk_create(
+        [QuestionRollup(question_id=row['question_id'], total=row['total'], missed=row['missed']) for row in rows],
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('questions', '0001_initial'),
+        ('interview', '0002_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='QuestionRollup',
+            fields=[
+                ('question', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='rollup', serialize=False, to='questions.question')),
+                ('total', models.IntegerField(default=0)),
+                ('missed', models.IntegerField(default=0)),
+            ],
+        ),
+        migrations.RunPython(backfill_rollups, migrations.RunPython.noop),
+    ]
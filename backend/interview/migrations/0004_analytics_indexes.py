@@ -0,0 +1,21 @@
+# Generated by Django 4.2.7 on 2026-10-18 15:45
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('interview', '0003_questionrollup'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='interviewsession',
+            index=models.Index(fields=['start_time'], name='session_start_time_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='sessionquestion',
+            index=models.Index(fields=['question', 'is_correct'], name='sessionq_question_correct_idx'),
+        ),
+    ]
@@ -0,0 +1,46 @@
+# Generated by Django 4.2.7 on 2026-10-18 15:53
+
+from django.db import migrations, models
+
+
+def merge_duplicate_session_questions(apps, schema_editor):
+    """
+    Keep one SessionQuestion per (session, question) before the unique constraint:
+    the answered row if any, else the oldest. The rollups lose the dropped rows.
+    """
+    SessionQuestion = apps.get_model('interview', 'SessionQuestion')
+    QuestionRollup = apps.get_model('interview', 'QuestionRollup')
+    duplicates = (
+        SessionQuestion.objects.values('session_id', 'question_id')
+        .annotate(n=models.Count('pk')).filter(n__gt=1)
+    )
+    for dup in duplicates:
+        rows = sorted(
+            SessionQuestion.objects.filter(session_id=dup['session_id'], question_id=dup['question_id']),
+            key=lambda sq: (not sq.response, sq.pk),
+        )
+        dropped = rows[1:]
+        SessionQuestion.objects.filter(pk__in=[sq.pk for sq in dropped]).delete()
+        QuestionRollup.objects.filter(question_id=dup['question_id']).update(
+            total=models.F('total') - len(dropped),
+            missed=models.F('missed') - sum(1 for sq in dropped if sq.is_correct is not True),
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('interview', '0004_analytics_indexes'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='interviewsession',
+            index=models.Index(fields=['user', 'start_time'], name='session_user_start_idx'),
+        ),
+        migrations.RunPython(merge_duplicate_session_questions, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='sessionquestion',
+            constraint=models.UniqueConstraint(fields=('session', 'question'), name='unique_session_question'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 4.2.7 on 2026-10-18 16:06
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('interview', '0005_query_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='sessionquestion',
+            name='answer_revision',
+            field=models.BigIntegerField(default=0),
+        ),
+    ]
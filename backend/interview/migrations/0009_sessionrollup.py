@@ -0,0 +1,34 @@
+# Generated by Django 4.2.7 on 2026-10-18 16:30
+
+from django.db import migrations, models
+
+
+def backfill_session_rollup(apps, schema_editor):
+    InterviewSession = apps.get_model('interview', 'InterviewSession')
+    SessionRollup = apps.get_model('interview', 'SessionRollup')
+    totals = InterviewSession.objects.aggregate(
+        sessions=models.Count('pk'), scored=models.Count('score'), score_sum=models.Sum('score'),
+    )
+    SessionRollup.objects.create(
+        pk=1, sessions=totals['sessions'], scored=totals['scored'], score_sum=totals['score_sum'] or 0.0,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('interview', '0008_pregeneratedquestionset'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SessionRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('sessions', models.IntegerField(default=0)),
+                ('scored', models.IntegerField(default=0)),
+                ('score_sum', models.FloatField(default=0)),
+            ],
+        ),
+        migrations.RunPython(backfill_session_rollup, migrations.RunPython.noop),
+    ]
@@ -10,6 +10,13 @@ class InterviewSession(models.Model):
     end_time = models.DateTimeField(null=True, blank=True)
     score = models.FloatField(null=True, blank=True)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['start_time'], name='session_start_time_idx'),
+            models.Index(fields=['user', 'start_time'], name='session_user_start_idx'),
+            models.Index(fields=['end_time'], name='session_end_time_idx'),
+        ]
+
     def __str__(self):
         return f"Session {self.pk} - {self.user}"
 
@@ -19,6 +26,65 @@ class SessionQuestion(models.Model):
     response = models.TextField(null=True, blank=True)
     response_time = models.IntegerField(null=True, blank=True)  # seconds
     is_correct = models.BooleanField(null=True, blank=True)
+    # Client-chosen, increasing per answer; makes autosaves idempotent (see services.save_answer)
+    answer_revision = models.BigIntegerField(default=0)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['question', 'is_correct'], name='sessionq_question_correct_idx'),
+        ]
+        constraints = [
+            models.UniqueConstraint(fields=['session', 'question'], name='unique_session_question'),
+        ]
 
     def __str__(self):
         return f"{self.session} - {self.question}"
+
+class QuestionRollup(models.Model):
+    """Running per-question answer totals backing the admin analytics (see interview.rollups)."""
+    question = models.OneToOneField(Question, on_delete=models.CASCADE, primary_key=True, related_name='rollup')
+    total = models.IntegerField(default=0)
+    missed = models.IntegerField(default=0)
+
+    def __str__(self):
+        return f"{self.question_id}: {self.missed}/{self.total} missed"
+
+
+class SessionRollup(models.Model):
+    """Single row of running session totals backing the admin analytics (see interview.rollups)."""
+    sessions = models.IntegerField(default=0)
+    # Sessions with a score, and the sum of those scores: avg_score = score_sum / scored
+    scored = models.IntegerField(default=0)
+    score_sum = models.FloatField(default=0)
+
+    def __str__(self):
+        return f"{self.sessions} sessions, {self.scored} scored"
+
+
+class Tombstone(models.Model):
+    """Records a deleted question or candidate so the admin change feed can report it."""
+    KIND_CHOICES = (
+        ('question', 'Question'),
+        ('candidate', 'Candidate'),
+    )
+    kind = models.CharField(max_length=20, choices=KIND_CHOICES)
+    object_id = models.BigIntegerField()
+    deleted_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['kind', 'deleted_at'], name='tombstone_kind_deleted_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.kind} {self.object_id} deleted {self.deleted_at}"
+
+
+class PregeneratedQuestionSet(models.Model):
+    """A ready-made interview question list, consumed by one interview start (see interview.pregeneration)."""
+    # [[question id, question updated_at], ...] so a claim can tell whether the bank moved on
+    questions = models.JSONField()
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return f"Question set {self.pk} ({len(self.questions)} questions)"
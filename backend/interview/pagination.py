@@ -0,0 +1,26 @@
+from rest_framework.pagination import CursorPagination
+
+
+class CandidateCursorPagination(CursorPagination):
+    """Keyset pagination for the admin candidate list, with a whitelisted ?ordering= parameter."""
+    page_size = 50
+    page_size_query_param = 'page_size'
+    max_page_size = 500
+    ordering = '-date_joined'
+    # Only plain columns: the cursor filters on the ordering field, and per-candidate
+    # aggregates such as total_sessions tie too often to page through reliably
+    ordering_fields = ('date_joined', 'username')
+
+    def get_ordering(self, request, queryset, view):
+        requested = request.query_params.get('ordering', self.ordering)
+        if requested.lstrip('-') not in self.ordering_fields:
+            requested = self.ordering
+        # The primary key breaks ties so every candidate has a stable position
+        return (requested, '-pk' if requested.startswith('-') else 'pk')
+
+
+class SessionCursorPagination(CursorPagination):
+    page_size = 20
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+    ordering = ('-start_time', '-pk')
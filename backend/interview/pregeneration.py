@@ -0,0 +1,96 @@
+"""
+Pre-generated question sets, so an interview start doesn't run selection inline.
+
+`manage.py run_question_set_worker` keeps INTERVIEW_PREGENERATED_SETS sets of
+DEFAULT_BLUEPRINT questions in PregeneratedQuestionSet. StartInterviewView claims
+one by deleting it: with SELECT ... FOR UPDATE SKIP LOCKED where the database
+supports it (PostgreSQL), otherwise with a conditional DELETE that only one
+concurrent claimer can win (SQLite).
+
+Bank changes discard every set once they commit. Each set also records the
+updated_at of its questions, and a claimed set whose questions have since changed
+or disappeared is dropped. That covers sets a worker wrote from a stale snapshot
+while the bank was changing. Whenever no valid set is available, the caller falls
+back to inline selection.
+"""
+from typing import List, Optional
+
+from django.conf import settings
+from django.db import connection, transaction
+
+from questions.models import Question
+from questions.pool import QuestionPool
+from .models import PregeneratedQuestionSet
+from .selection import DEFAULT_BLUEPRINT, get_selection_policy
+
+CLAIM_ATTEMPTS = 3
+
+
+def target_size() -> int:
+    return getattr(settings, 'INTERVIEW_PREGENERATED_SETS', 0)
+
+
+def generate_sets(count: int, pool: QuestionPool, batch_size: int = 100) -> int:
+    """Select `count` question sets from `pool` and store them; returns how many were written."""
+    policy = get_selection_policy()
+    written = 0
+    while written < count:
+        batch = []
+        for _ in range(min(batch_size, count - written)):
+            questions = policy.select(pool, DEFAULT_BLUEPRINT)
+            if not questions:
+                return written
+            batch.append(PregeneratedQuestionSet(questions=[[q.pk, q.updated_at.isoformat()] for q in questions]))
+        PregeneratedQuestionSet.objects.bulk_create(batch)  # type: ignore[attr-defined]
+        written += len(batch)
+    return written
+
+
+def refill() -> int:
+    """Top the buffer up to INTERVIEW_PREGENERATED_SETS from a fresh snapshot of the bank."""
+    missing = target_size() - PregeneratedQuestionSet.objects.count()  # type: ignore[attr-defined]
+    if missing <= 0:
+        return 0
+    # Not the process-local pool, which can lag changes made by other processes by up to
+    # QUESTION_POOL_CHECK_SECONDS
+    pool = QuestionPool(Question.objects.all())  # type: ignore[attr-defined]
+    if not len(pool):
+        return 0
+    return generate_sets(missing, pool)
+
+
+def _claim_row() -> Optional[PregeneratedQuestionSet]:
+    if connection.features.has_select_for_update_skip_locked:
+        with transaction.atomic():
+            row = PregeneratedQuestionSet.objects.select_for_update(skip_locked=True).order_by('pk').first()  # type: ignore[attr-defined]
+            if row is not None:
+                PregeneratedQuestionSet.objects.filter(pk=row.pk).delete()  # type: ignore[attr-defined]
+            return row
+    for _ in range(CLAIM_ATTEMPTS):
+        row = PregeneratedQuestionSet.objects.order_by('pk').first()  # type: ignore[attr-defined]
+        if row is None:
+            return None
+        deleted, _ = PregeneratedQuestionSet.objects.filter(pk=row.pk).delete()  # type: ignore[attr-defined]
+        if deleted:
+            return row
+        # Another start claimed it first
+    return None
+
+
+def claim_question_set() -> Optional[List[Question]]:
+    """Take one pre-generated set, or return None if none is available and valid."""
+    if target_size() <= 0:
+        return None
+    for _ in range(CLAIM_ATTEMPTS):
+        row = _claim_row()
+        if row is None:
+            return None
+        ids = [qid for qid, _ in row.questions]
+        questions = Question.objects.in_bulk(ids)  # type: ignore[attr-defined]
+        if all(qid in questions and questions[qid].updated_at.isoformat() == stamp for qid, stamp in row.questions):
+            return [questions[qid] for qid in ids]
+    return None
+
+
+def discard_all():
+    PregeneratedQuestionSet.objects.all().delete()  # type: ignore[attr-defined]
@@ -0,0 +1,129 @@
+"""
+Rescore submitted sessions with the current scorer (`manage.py rescore_sessions`).
+
+Sessions are read in primary-key chunks with two queries per chunk. Each chunk's
+answers are scored in a process pool while the main process reads the next
+chunks and writes back finished ones. Only changed rows are written, with
+bulk_update, in one transaction per chunk. Those writes update the session
+scores, the analytics rollups (answers and session totals) and the session cache
+versions. The owners' updated_at is touched so the admin change feed picks up the
+new scores.
+"""
+import os
+from collections import defaultdict, deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, List, Optional, Tuple
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from backend.caching import bump_version
+from users.models import User
+from . import rollups
+from .models import InterviewSession, SessionQuestion
+from .scoring import DEFAULT_SCORER, Answer, score_with, session_score
+
+
+class RescoreResult:
+    def __init__(self):
+        self.sessions = 0
+        self.answers = 0
+        self.changed_answers = 0
+        self.changed_sessions = 0
+
+
+def _chunks(chunk_size: int):
+    """Yield (sessions, rows) for submitted sessions in primary-key order."""
+    last = 0
+    while True:
+        sessions = list(
+            InterviewSession.objects.filter(end_time__isnull=False, pk__gt=last)  # type: ignore[attr-defined]
+            .order_by('pk').values_list('pk', 'user_id', 'score')[:chunk_size]
+        )
+        if not sessions:
+            return
+        last = sessions[-1][0]
+        rows = list(
+            SessionQuestion.objects.filter(session_id__in=[s[0] for s in sessions])  # type: ignore[attr-defined]
+            .order_by('pk').values_list('pk', 'session_id', 'question_id', 'response', 'is_correct', 'question__keywords')
+        )
+        yield sessions, rows
+
+
+def _write(sessions: List[Tuple], rows: List[Tuple], results: List[bool], result: RescoreResult):
+    by_session = defaultdict(list)
+    changed = []
+    for (pk, session_id, question_id, _, was_correct, _), correct in zip(rows, results):
+        by_session[session_id].append(correct)
+        if was_correct != correct:
+            changed.append((pk, question_id, bool(was_correct), correct))
+
+    scores = []
+    for session_id, user_id, score in sessions:
+        new_score = session_score(by_session.get(session_id, []))
+        if score is None or abs(score - new_score) > 1e-9:
+            scores.append((session_id, user_id, new_score))
+
+    with transaction.atomic():
+        if changed:
+            SessionQuestion.objects.bulk_update(  # type: ignore[attr-defined]
+                [SessionQuestion(pk=pk, is_correct=correct) for pk, _, _, correct in changed], ['is_correct'], batch_size=500,
+            )
+            rollups.record_answer_changes((qid, was, now) for _, qid, was, now in changed)
+        if scores:
+            InterviewSession.objects.bulk_update(  # type: ignore[attr-defined]
+                [InterviewSession(pk=pk, score=score) for pk, _, score in scores], ['score'], batch_size=500,
+            )
+            User.objects.filter(pk__in={user_id for _, user_id, _ in scores}).update(updated_at=timezone.now())  # type: ignore[attr-defined]
+            old_scores = {pk: score for pk, _, score in sessions}
+            rollups.record_sessions(
+                scored=sum(old_scores[pk] is None for pk, _, _ in scores),
+                score_sum=sum(score - (old_scores[pk] or 0.0) for pk, _, score in scores),
+            )
+    touched = {session_id for _, session_id, _, _ in changed} | {pk for pk, _, _ in scores}
+    if touched:
+        bump_version(*(f'session:{pk}' for pk in touched))
+
+    result.sessions += len(sessions)
+    result.answers += len(rows)
+    result.changed_answers += len(changed)
+    result.changed_sessions += len(scores)
+
+
+def rescore_sessions(chunk_size: int = 500, workers: Optional[int] = None, scorer: Optional[str] = None,
+                     progress: Optional[Callable[[RescoreResult], None]] = None) -> RescoreResult:
+    """
+    Rescore every submitted session. `workers` defaults to the CPU count; 0 scores
+    in this process. `scorer` is a dotted path, defaulting to INTERVIEW_SCORER.
+    """
+    path = scorer or getattr(settings, 'INTERVIEW_SCORER', DEFAULT_SCORER)
+    if workers is None:
+        workers = os.cpu_count() or 1
+    result = RescoreResult()
+
+    def answers(rows):
+        return [Answer(response, keywords or []) for _, _, _, response, _, keywords in rows]
+
+    def done(sessions, rows, results):
+        _write(sessions, rows, results, result)
+        if progress:
+            progress(result)
+
+    if workers == 0:
+        for sessions, rows in _chunks(chunk_size):
+            done(sessions, rows, score_with(path, answers(rows)))
+        return result
+
+    pending: deque = deque()
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for sessions, rows in _chunks(chunk_size):
+            pending.append((sessions, rows, pool.submit(score_with, path, answers(rows))))
+            # Bound memory: at most two chunks in flight per worker
+            if len(pending) >= 2 * workers:
+                sessions, rows, future = pending.popleft()
+                done(sessions, rows, future.result())
+        while pending:
+            sessions, rows, future = pending.popleft()
+            done(sessions, rows, future.result())
+    return result
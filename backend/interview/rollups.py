@@ -0,0 +1,136 @@
+"""
+Incrementally maintained analytics rollups.
+
+Every SessionQuestion counts towards its question's `total`, and towards `missed`
+until it is answered correctly, which is exactly what AdminAnalyticsView used to
+compute by scanning the whole table. Topic totals are summed from the per-question
+rows, so editing or deleting a question keeps them consistent. The session count
+and score average come from a single SessionRollup row.
+
+Deletes that bypass these helpers (cascades from the Django admin, for example)
+leave the rollups stale; `manage.py rebuild_analytics_rollups` recomputes them.
+"""
+from collections import Counter, defaultdict
+from typing import Dict, Iterable, Optional, Tuple
+
+from django.db import transaction
+from django.db.models import Count, F, Q, Sum
+
+from .models import InterviewSession, QuestionRollup, SessionQuestion, SessionRollup
+
+SESSION_ROLLUP_ID = 1
+
+
+def apply_deltas(deltas: Dict[int, Tuple[int, int]]):
+    """Add (total, missed) deltas to the rollup rows of the given question ids."""
+    by_delta = defaultdict(list)
+    for question_id, delta in deltas.items():
+        if delta != (0, 0):
+            by_delta[delta].append(question_id)
+
+    for (total, missed), question_ids in by_delta.items():
+        updated = QuestionRollup.objects.filter(question_id__in=question_ids).update(  # type: ignore[attr-defined]
+            total=F('total') + total, missed=F('missed') + missed,
+        )
+        if updated < len(question_ids):
+            existing = set(QuestionRollup.objects.filter(question_id__in=question_ids).values_list('question_id', flat=True))  # type: ignore[attr-defined]
+            missing = [qid for qid in question_ids if qid not in existing]
+            QuestionRollup.objects.bulk_create(  # type: ignore[attr-defined]
+                [QuestionRollup(question_id=qid) for qid in missing], ignore_conflicts=True,
+            )
+            QuestionRollup.objects.filter(question_id__in=missing).update(  # type: ignore[attr-defined]
+                total=F('total') + total, missed=F('missed') + missed,
+            )
+
+
+def record_session_questions(question_ids: Iterable[int]):
+    """New, unanswered session questions count as asked and missed."""
+    counts = Counter(question_ids)
+    apply_deltas({qid: (n, n) for qid, n in counts.items()})
+
+
+def record_answer_changes(changes: Iterable[Tuple[int, bool, bool]]):
+    """Apply (question_id, was_correct, is_correct) transitions from a submission."""
+    missed: Counter = Counter()
+    for question_id, was_correct, is_correct in changes:
+        if was_correct != is_correct:
+            missed[question_id] += -1 if is_correct else 1
+    apply_deltas({qid: (0, n) for qid, n in missed.items()})
+
+
+def forget_session_questions(session_questions):
+    """Subtract a SessionQuestion queryset from the rollups; call before deleting it."""
+    rows = session_questions.values('question_id').annotate(
+        total=Count('pk'), missed=Count('pk', filter=~Q(is_correct=True)),
+    )
+    apply_deltas({row['question_id']: (-row['total'], -row['missed']) for row in rows})
+
+
+def record_sessions(sessions: int = 0, scored: int = 0, score_sum: float = 0.0):
+    """Add deltas to the session totals."""
+    if not (sessions or scored or score_sum):
+        return
+    updated = SessionRollup.objects.filter(pk=SESSION_ROLLUP_ID).update(  # type: ignore[attr-defined]
+        sessions=F('sessions') + sessions, scored=F('scored') + scored, score_sum=F('score_sum') + score_sum,
+    )
+    if not updated:
+        SessionRollup.objects.get_or_create(pk=SESSION_ROLLUP_ID)  # type: ignore[attr-defined]
+        record_sessions(sessions, scored, score_sum)
+
+
+def record_score_change(old: Optional[float], new: Optional[float]):
+    """A session's score went from `old` to `new` (either may be None)."""
+    record_sessions(
+        scored=(new is not None) - (old is not None),
+        score_sum=(new or 0.0) - (old or 0.0),
+    )
+
+
+def forget_sessions(sessions):
+    """Subtract an InterviewSession queryset from the session totals; call before deleting it."""
+    totals = sessions.aggregate(sessions=Count('pk'), scored=Count('score'), score_sum=Sum('score'))
+    record_sessions(-totals['sessions'], -totals['scored'], -(totals['score_sum'] or 0.0))
+
+
+def rebuild():
+    """Recompute every rollup row from SessionQuestion and InterviewSession."""
+    rows = SessionQuestion.objects.values('question_id').annotate(  # type: ignore[attr-defined]
+        total=Count('pk'), missed=Count('pk', filter=~Q(is_correct=True)),
+    )
+    totals = InterviewSession.objects.aggregate(  # type: ignore[attr-defined]
+        sessions=Count('pk'), scored=Count('score'), score_sum=Sum('score'),
+    )
+    with transaction.atomic():
+        QuestionRollup.objects.all().delete()  # type: ignore[attr-defined]
+        QuestionRollup.objects.bulk_create(  # type: ignore[attr-defined]
+            [QuestionRollup(question_id=row['question_id'], total=row['total'], missed=row['missed']) for row in rows],
+            batch_size=1000,
+        )
+        SessionRollup.objects.update_or_create(pk=SESSION_ROLLUP_ID, defaults={  # type: ignore[attr-defined]
+            'sessions': totals['sessions'], 'scored': totals['scored'], 'score_sum': totals['score_sum'] or 0.0,
+        })
+
+
+def session_stats() -> Dict[str, float]:
+    row = SessionRollup.objects.filter(pk=SESSION_ROLLUP_ID).first()  # type: ignore[attr-defined]
+    if row is None:
+        return {'total_sessions': 0, 'avg_score': 0}
+    return {'total_sessions': row.sessions, 'avg_score': row.score_sum / row.scored if row.scored else 0}
+
+
+def topic_stats() -> Dict[str, Dict[str, int]]:
+    rows = (
+        QuestionRollup.objects.filter(total__gt=0)  # type: ignore[attr-defined]
+        .values('question__topic')
+        .annotate(total=Sum('total'), missed=Sum('missed'))
+        .order_by('question__topic')
+    )
+    return {row['question__topic']: {'total': row['total'], 'missed': row['missed']} for row in rows}
+
+
+def most_missed(limit: int = 5):
+    return list(
+        QuestionRollup.objects.filter(missed__gt=0)  # type: ignore[attr-defined]
+        .order_by('-missed', 'question_id')
+        .values_list('question_id', 'missed')[:limit]
+    )
@@ -0,0 +1,73 @@
+"""
+Answer scoring.
+
+A Scorer marks a batch of answers correct or not. Answers are plain Answer
+tuples rather than model instances, so the same scorer runs inside
+submit_answers and in the worker processes of `manage.py rescore_sessions`
+(which must be able to import and build it without touching the database).
+The scorer is chosen with INTERVIEW_SCORER, like INTERVIEW_SELECTION_POLICY.
+"""
+import re
+from typing import List, NamedTuple, Optional, Sequence
+
+from django.conf import settings
+from django.utils.module_loading import import_string
+
+DEFAULT_SCORER = 'interview.scoring.NonEmptyScorer'
+
+_word = re.compile(r'\w+')
+
+
+class Answer(NamedTuple):
+    response: Optional[str]
+    keywords: Sequence[str]
+
+
+class Scorer:
+    """Base class for answer scorers."""
+
+    def score(self, answers: Sequence[Answer]) -> List[bool]:
+        raise NotImplementedError
+
+
+class NonEmptyScorer(Scorer):
+    """Any non-empty response is correct."""
+
+    def score(self, answers):
+        return [bool(a.response) for a in answers]
+
+
+class KeywordScorer(Scorer):
+    """
+    A response is correct when it mentions at least `min_ratio` of the question's
+    keywords (case-insensitive, whole words or phrases). Questions without
+    keywords fall back to NonEmptyScorer.
+    """
+    min_ratio = 0.5
+
+    def score(self, answers):
+        results = []
+        for a in answers:
+            if not a.keywords or not a.response:
+                results.append(bool(a.response))
+                continue
+            text = ' '.join(_word.findall(a.response.lower()))
+            padded = f' {text} '
+            hits = sum(1 for k in a.keywords if f" {' '.join(_word.findall(k.lower()))} " in padded)
+            results.append(hits >= self.min_ratio * len(a.keywords))
+        return results
+
+
+def session_score(results: Sequence[bool]) -> float:
+    """Percentage of correct answers over all of a session's questions."""
+    return sum(results) / max(len(results), 1) * 100
+
+
+def get_scorer(path: Optional[str] = None) -> Scorer:
+    path = path or getattr(settings, 'INTERVIEW_SCORER', DEFAULT_SCORER)
+    return import_string(path)()
+
+
+def score_with(path: str, answers: Sequence[Answer]) -> List[bool]:
+    """Entry point for rescoring worker processes: build the scorer at `path` and score."""
+    return get_scorer(path).score(answers)
@@ -0,0 +1,110 @@
+import random
+from typing import Dict, List, Optional, Sequence, Set, Tuple
+
+from django.conf import settings
+from django.utils.module_loading import import_string
+
+from questions.models import Question
+from questions.pool import QuestionPool
+
+# Random probes before falling back to a linear scan of the candidates
+MAX_PROBES = 32
+
+_rng = random.Random()
+
+
+class Blueprint:
+    """Describes what an interview should look like: per-bucket quotas, length and time budget."""
+
+    def __init__(self, target_distribution: Dict[Tuple[str, str], int], question_count: int = 10, max_time: int = 900):
+        self.target_distribution = target_distribution
+        self.question_count = question_count
+        self.max_time = max_time
+
+
+# Target distribution for 10 questions in 15 minutes
+DEFAULT_BLUEPRINT = Blueprint(
+    target_distribution={
+        ('Personal', 'easy'): 2,
+        ('Technical', 'easy'): 2,
+        ('Technical', 'medium'): 2,
+        ('Problem Solving', 'medium'): 1,
+        ('Teamwork', 'medium'): 1,
+        ('Learning', 'medium'): 1,
+        ('Architecture', 'hard'): 1,
+    },
+    question_count=10,
+    max_time=900,
+)
+
+
+class SelectionPolicy:
+    """Base class for question selection strategies used by StartInterviewView."""
+
+    def select(self, pool: QuestionPool, blueprint: Blueprint, rng: Optional[random.Random] = None) -> List[Question]:
+        raise NotImplementedError
+
+
+class QuotaBudgetPolicy(SelectionPolicy):
+    """
+    Fill each (topic, difficulty) quota first, then top up to question_count from the
+    whole bank, never exceeding the blueprint's time budget.
+
+    Picks are random probes checked against a set of chosen ids, so a start costs
+    O(question_count) on average and at most one linear pass per pick, whatever the bank size.
+    """
+
+    def select(self, pool, blueprint, rng=None):
+        rng = rng or _rng
+        selected: List[Question] = []
+        chosen: Set[int] = set()
+        remaining_time = blueprint.max_time
+
+        for (topic, difficulty), count in blueprint.target_distribution.items():
+            available = pool.bucket(topic, difficulty)
+            shortest = pool.bucket_min_time.get((topic, difficulty), 0)
+            for _ in range(min(count, len(available))):
+                if len(selected) >= blueprint.question_count or shortest > remaining_time:
+                    break
+                q = _draw(available, chosen, remaining_time, rng)
+                if q is None:
+                    break
+                selected.append(q)
+                chosen.add(q.id)
+                remaining_time -= q.time_required  # type: ignore[operator]
+
+        while len(selected) < blueprint.question_count and pool.min_time <= remaining_time:
+            q = _draw(pool.questions, chosen, remaining_time, rng)
+            if q is None:
+                break
+            selected.append(q)
+            chosen.add(q.id)
+            remaining_time -= q.time_required  # type: ignore[operator]
+
+        # Nothing fits the budget: just take what we have
+        if not selected and pool.questions:
+            selected = rng.sample(pool.questions, min(blueprint.question_count, len(pool.questions)))
+        return selected
+
+
+def _draw(candidates: Sequence[Question], chosen: Set[int], remaining_time: int, rng: random.Random) -> Optional[Question]:
+    """Pick a random candidate that is not chosen yet and fits in remaining_time."""
+    n = len(candidates)
+    if not n:
+        return None
+    for _ in range(min(MAX_PROBES, n)):
+        q = candidates[rng.randrange(n)]
+        if q.id not in chosen and q.time_required <= remaining_time:  # type: ignore[operator]
+            return q
+    # Probing keeps missing (small bucket or tight budget): scan once from a random offset
+    start = rng.randrange(n)
+    for i in range(n):
+        q = candidates[(start + i) % n]
+        if q.id not in chosen and q.time_required <= remaining_time:  # type: ignore[operator]
+            return q
+    return None
+
+
+def get_selection_policy() -> SelectionPolicy:
+    path = getattr(settings, 'INTERVIEW_SELECTION_POLICY', 'interview.selection.QuotaBudgetPolicy')
+    return import_string(path)()
@@ -15,4 +15,12 @@ class InterviewSessionSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = InterviewSession
-        fields = ['id', 'user', 'start_time', 'end_time', 'score', 'sessionquestion_set'] 
\ No newline at end of file
+        fields = ['id', 'user', 'start_time', 'end_time', 'score', 'sessionquestion_set']
+
+    def __init__(self, *args, **kwargs):
+        # Optional `fields` restricts the output to a subset (sparse fieldsets)
+        fields = kwargs.pop('fields', None)
+        super().__init__(*args, **kwargs)
+        if fields is not None:
+            for name in set(self.fields) - set(fields):
+                self.fields.pop(name)
@@ -0,0 +1,174 @@
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from django.db import IntegrityError, transaction
+from django.db.models import F, Q, QuerySet
+from django.utils import timezone
+
+from backend.caching import bump_version
+from questions.pool import get_question_pool, invalidate_question_pool
+from users.models import User
+from users.tokens import update_claims
+from . import rollups
+from .scoring import Answer, get_scorer, session_score
+from .models import InterviewSession, SessionQuestion
+from .pregeneration import claim_question_set
+from .selection import DEFAULT_BLUEPRINT, get_selection_policy
+
+
+class InterviewNotAllowed(Exception):
+    """The user has completed an interview or is blocked from taking one."""
+
+
+class NoQuestionsAvailable(Exception):
+    """The question bank is empty."""
+
+
+def create_interview_session(user, questions: Iterable) -> InterviewSession:
+    """
+    Create a session and its SessionQuestion rows in one transaction.
+
+    The questions are written with a single bulk INSERT, so this is also the
+    helper to use from admin tooling and seeding scripts that create sessions at volume.
+
+    Raises InterviewNotAllowed for a candidate who has completed an interview or is
+    blocked, checked against the user row rather than `user`, whose attributes may
+    come from stale token claims.
+    """
+    with transaction.atomic():
+        allowed = User.objects.select_for_update().filter(  # type: ignore[attr-defined]
+            ~Q(role='candidate') | Q(has_completed_interview=False, is_blocked_from_interview=False), pk=user.id,
+        ).exists()
+        if not allowed:
+            raise InterviewNotAllowed
+        session = InterviewSession.objects.create(user_id=user.id)  # type: ignore[attr-defined]
+        session_questions = SessionQuestion.objects.bulk_create(  # type: ignore[attr-defined]
+            [SessionQuestion(session=session, question=q) for q in questions]
+        )
+        rollups.record_session_questions(sq.question_id for sq in session_questions)
+        rollups.record_sessions(sessions=1)
+    return session
+
+
+def start_interview_session(user) -> Tuple[InterviewSession, List]:
+    """
+    Pick questions (a pregenerated set, else the selection policy over the question
+    pool) and create the session; returns (session, questions).
+
+    If the insert fails because a picked question has been deleted since the pool
+    was loaded (by another process), the pool is reloaded and the pick retried once.
+    Raises NoQuestionsAvailable or InterviewNotAllowed.
+    """
+    questions = claim_question_set()
+    if questions is None:
+        questions = _select_questions()
+    try:
+        return create_interview_session(user, questions), questions
+    except IntegrityError:
+        invalidate_question_pool()
+    questions = _select_questions()
+    return create_interview_session(user, questions), questions
+
+
+def _select_questions() -> List:
+    pool = get_question_pool()
+    if not len(pool):
+        raise NoQuestionsAvailable
+    return get_selection_policy().select(pool, DEFAULT_BLUEPRINT)
+
+
+def save_answer(session_id: int, user_id: int, question_id: int, response: Optional[str],
+                response_time: Optional[int], revision: int) -> bool:
+    """
+    Store one answer while the interview is in progress, without scoring it.
+
+    This is a single conditional UPDATE that doesn't read the session first. It matches only the
+    caller's open session, and only if `revision` is newer than the stored one, so
+    retried or reordered requests are no-ops. Returns whether a row was written.
+    """
+    updated = SessionQuestion.objects.filter(  # type: ignore[attr-defined]
+        session_id=session_id, session__user_id=user_id, session__end_time__isnull=True,
+        question_id=question_id, answer_revision__lt=revision,
+    ).update(response=response, response_time=response_time, answer_revision=revision)
+    if updated:
+        bump_version(f'session:{session_id}')
+    return bool(updated)
+
+
+def submit_answers(session: InterviewSession, user, answers: List[Dict[str, Any]]) -> InterviewSession:
+    """
+    Close a session and score it from its stored answers with the configured scorer.
+
+    `answers` may be empty when everything was autosaved (see save_answer); any
+    answers given are applied first. All SessionQuestion rows are loaded with one
+    query and only the rows that change are written back with bulk_update. The
+    session score and the user's completion flag are committed in the same
+    transaction. `user` may be a model instance or a token-claims user.
+    """
+    with transaction.atomic():
+        rows = list(SessionQuestion.objects.filter(session=session).annotate(  # type: ignore[attr-defined]
+            keywords=F('question__keywords'),
+        ).order_by('pk'))
+        by_question = {sq.question_id: sq for sq in rows}
+        before = {sq.pk: (sq.response, sq.response_time, sq.is_correct) for sq in rows}
+        for ans in answers:
+            try:
+                qid = int(ans.get('question_id'))
+            except (TypeError, ValueError):
+                continue
+            sq = by_question.get(qid)
+            if sq:
+                sq.response = ans.get('response')
+                sq.response_time = ans.get('response_time', 0)
+        results = get_scorer().score([Answer(sq.response, sq.keywords) for sq in rows])
+        for sq, correct in zip(rows, results):
+            sq.is_correct = correct
+
+        changed = [sq for sq in rows if (sq.response, sq.response_time, sq.is_correct) != before[sq.pk]]
+        if changed:
+            SessionQuestion.objects.bulk_update(changed, ['response', 'response_time', 'is_correct'])  # type: ignore[attr-defined]
+            rollups.record_answer_changes(
+                (sq.question_id, bool(before[sq.pk][2]), sq.is_correct) for sq in changed
+            )
+
+        old_score = session.score
+        session.end_time = timezone.now()
+        session.score = session_score(results)
+        session.save(update_fields=['end_time', 'score'])
+        rollups.record_score_change(old_score, session.score)
+        bump_version(f'session:{session.pk}')
+        # Mark candidate as completed
+        if user.role == 'candidate':
+            update_claims([user.id], has_completed_interview=True)
+    return session
+
+
+CANDIDATE_ACTIONS = ('unblock', 'block', 'remove')
+
+
+def apply_candidate_action(action: str, candidates: QuerySet) -> Dict[str, int]:
+    """
+    Unblock, block or remove (delete the interview records of, then block) a set of candidates.
+
+    `candidates` is a User queryset, used as a subquery: everything runs as
+    set-based UPDATE/DELETE statements in one transaction, whatever the size of the selection.
+    """
+    if action not in CANDIDATE_ACTIONS:
+        raise ValueError(f'Unknown action {action!r}')
+    removed = 0
+    with transaction.atomic():
+        if action == 'remove':
+            sessions = InterviewSession.objects.filter(user__in=candidates)  # type: ignore[attr-defined]
+            session_questions = SessionQuestion.objects.filter(session__in=sessions)  # type: ignore[attr-defined]
+            bump_version(*(f'session:{pk}' for pk in sessions.values_list('pk', flat=True)))
+            rollups.forget_session_questions(session_questions)
+            rollups.forget_sessions(sessions)
+            session_questions.delete()
+            # Their SessionQuestions are gone and nothing listens for session deletes, so skip
+            # the collector, which would load every session and delete them in batches
+            # (AdminCandidatesViewTests.test_raw_session_delete_is_safe checks both)
+            removed = sessions._raw_delete(sessions.db)
+        changes = {'is_blocked_from_interview': action != 'unblock'}
+        if action != 'block':
+            changes['has_completed_interview'] = False
+        updated = update_claims(candidates, **changes)
+    return {'candidates': updated, 'sessions_removed': removed}
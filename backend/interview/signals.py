@@ -0,0 +1,25 @@
+from django.db import transaction
+from django.db.models.signals import post_delete
+from django.dispatch import receiver
+
+from questions.models import Question
+from questions.signals import question_bank_changed
+from users.models import User
+from . import pregeneration
+from .models import Tombstone
+
+
+@receiver(post_delete, sender=Question)
+def question_deleted(sender, instance, **kwargs):
+    Tombstone.objects.create(kind='question', object_id=instance.pk)  # type: ignore[attr-defined]
+
+
+@receiver(post_delete, sender=User)
+def user_deleted(sender, instance, **kwargs):
+    if instance.role == 'candidate':
+        Tombstone.objects.create(kind='candidate', object_id=instance.pk)  # type: ignore[attr-defined]
+
+
+@receiver(question_bank_changed)
+def bank_changed(sender, **kwargs):
+    transaction.on_commit(pregeneration.discard_all)
@@ -1,3 +1,752 @@
-from django.test import TestCase
+import json
+import random
+import re
+from collections import Counter
+from io import StringIO
+from datetime import timedelta
+from unittest import mock, skipUnless
 
-# Create your tests here.
+from asgiref.sync import sync_to_async
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection
+from django.db.models import Count
+from django.db.models.signals import post_delete, pre_delete
+from django.db.migrations.executor import MigrationExecutor
+from django.test import AsyncRequestFactory, TestCase, TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIClient
+
+from questions.models import Question
+from questions.pool import QuestionPool, get_question_pool, invalidate_question_pool
+from users.models import User
+from users.tokens import ClaimsTokenObtainPairSerializer
+from . import async_views, changes, pregeneration, rollups
+from .analytics import AnalyticsFilters, daily_series
+from .fast_serializers import session_payload, session_payloads
+from .models import InterviewSession, PregeneratedQuestionSet, QuestionRollup, SessionQuestion, SessionRollup, Tombstone
+from .scoring import Answer, KeywordScorer
+from .selection import DEFAULT_BLUEPRINT, Blueprint, QuotaBudgetPolicy, SelectionPolicy, get_selection_policy
+from .serializers import InterviewSessionSerializer
+from .services import apply_candidate_action, create_interview_session, submit_answers
+from .views import annotated_candidates
+
+
+class AdminCandidatesViewTests(TestCase):
+    def setUp(self):
+        self.admin = User.objects.create_user('admin', 'admin@example.com', 'pw', role='admin')
+        self.client = APIClient()
+        self.client.force_authenticate(self.admin)
+        self.question = Question.objects.create(text='Q', topic='Personal', difficulty='easy', time_required=60)
+
+    def add_candidates(self, count):
+        for _ in range(count):
+            n = User.objects.count()
+            user = User.objects.create_user(f'candidate{n}', f'candidate{n}@example.com', 'pw')
+            for score in (40.0, 80.0):
+                session = InterviewSession.objects.create(user=user, score=score)
+                SessionQuestion.objects.create(session=session, question=self.question, is_correct=True)
+
+    def count_queries(self):
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get('/api/interview/admin/candidates/')
+        self.assertEqual(response.status_code, 200)
+        return len(ctx.captured_queries), response.data
+
+    def test_query_count_is_constant(self):
+        self.add_candidates(2)
+        few, _ = self.count_queries()
+        self.add_candidates(20)
+        many, data = self.count_queries()
+        self.assertEqual(few, many)
+        self.assertEqual(len(data['results']), 22)
+
+    def test_aggregates(self):
+        self.add_candidates(1)
+        _, data = self.count_queries()
+        candidate = data['results'][0]
+        self.assertEqual(candidate['total_sessions'], 2)
+        self.assertEqual(candidate['average_score'], 60.0)
+        latest = InterviewSession.objects.filter(user_id=candidate['id']).latest('start_time')
+        self.assertEqual(candidate['latest_session']['id'], latest.id)
+
+    def test_detail_query_count_is_constant(self):
+        user = User.objects.create_user('detail', 'detail@example.com', 'pw')
+        questions = [self.question] + [
+            Question.objects.create(text=f'Q{i}', topic='Technical', difficulty='medium', time_required=60)
+            for i in range(4)
+        ]
+
+        def add_sessions(count):
+            for _ in range(count):
+                session = InterviewSession.objects.create(user=user, score=50.0)
+                for question in questions:
+                    SessionQuestion.objects.create(session=session, question=question, response='A', response_time=30)
+
+        def detail_queries(query=''):
+            with CaptureQueriesContext(connection) as ctx:
+                response = self.client.get(f'/api/interview/admin/candidates/{user.pk}/{query}')
+            self.assertEqual(response.status_code, 200)
+            return len(ctx.captured_queries), response.data
+
+        add_sessions(1)
+        one, _ = detail_queries()
+        one_timeline, _ = detail_queries('?mode=timeline')
+        add_sessions(9)
+        many, data = detail_queries()
+        many_timeline, _ = detail_queries('?mode=timeline')
+        self.assertEqual(one, many)
+        self.assertEqual(one_timeline, many_timeline)
+        self.assertEqual(data['total_sessions'], 10)
+        self.assertEqual(sum(len(s['questions']) for s in data['sessions']), 50)
+
+    def page_through(self, query):
+        response = self.client.get(f'/api/interview/admin/candidates/?{query}')
+        seen = []
+        while True:
+            seen += [c['username'] for c in response.data['results']]
+            if not response.data['next']:
+                return seen
+            response = self.client.get(response.data['next'])
+
+    def test_keyset_pagination(self):
+        self.add_candidates(5)
+        seen = self.page_through('page_size=2&ordering=username')
+        self.assertEqual(seen, sorted(seen))
+        self.assertEqual(len(set(seen)), 5)
+
+    def test_pagination_with_tied_aggregates(self):
+        # Every candidate has 2 sessions; aggregate orderings fall back to -date_joined
+        self.add_candidates(12)
+        for ordering in ('total_sessions', '-total_sessions', 'average_score'):
+            seen = self.page_through(f'page_size=5&ordering={ordering}')
+            self.assertEqual(len(seen), 12)
+            self.assertEqual(len(set(seen)), 12)
+
+
+    def bulk(self, payload):
+        return self.client.post('/api/interview/admin/candidates/bulk/', payload, format='json')
+
+    def test_bulk_actions_are_set_based(self):
+        self.add_candidates(3)
+        rollups.rebuild()
+        few = list(User.objects.filter(role='candidate').values_list('pk', flat=True))
+        with CaptureQueriesContext(connection) as removed_few:
+            response = self.bulk({'action': 'remove', 'ids': few[:2]})
+        self.assertEqual(response.data, {'success': True, 'action': 'remove', 'candidates': 2, 'sessions_removed': 4})
+        self.assertEqual(QuestionRollup.objects.get(question=self.question).total, 2)
+
+        self.add_candidates(20)
+        rollups.rebuild()
+        many = list(User.objects.filter(role='candidate').exclude(pk__in=few).values_list('pk', flat=True))
+        with CaptureQueriesContext(connection) as removed_many:
+            response = self.bulk({'action': 'remove', 'ids': many})
+        self.assertEqual(response.data, {'success': True, 'action': 'remove', 'candidates': 20, 'sessions_removed': 40})
+        self.assertEqual(len(removed_few.captured_queries), len(removed_many.captured_queries))
+        self.assertEqual(InterviewSession.objects.count(), 2)
+        self.assertEqual(QuestionRollup.objects.get(question=self.question).total, 2)
+
+        self.add_candidates(20)
+        with CaptureQueriesContext(connection) as blocked:
+            self.bulk({'action': 'block', 'filter': {'is_blocked_from_interview': False}})
+        with CaptureQueriesContext(connection) as unblocked:
+            self.bulk({'action': 'unblock', 'filter': {'search': 'candidate'}})
+        self.assertEqual(len(blocked.captured_queries), len(unblocked.captured_queries))
+        self.assertFalse(User.objects.filter(role='candidate', is_blocked_from_interview=True).exists())
+
+    def test_raw_session_delete_is_safe(self):
+        # apply_candidate_action deletes sessions without the collector; that stays correct
+        # only while SessionQuestion is the one relation to them and nothing listens for deletes
+        relations = [rel.related_model for rel in InterviewSession._meta.related_objects]
+        self.assertEqual(relations, [SessionQuestion])
+        for signal in (pre_delete, post_delete):
+            self.assertFalse(signal.has_listeners(InterviewSession))
+
+    def test_bulk_validation(self):
+        self.assertEqual(self.bulk({'action': 'delete', 'ids': [1]}).status_code, 400)
+        self.assertEqual(self.bulk({'action': 'block'}).status_code, 400)
+        self.assertEqual(self.bulk({'action': 'block', 'ids': ['1']}).status_code, 400)
+        self.assertEqual(self.bulk({'action': 'block', 'ids': [self.admin.pk]}).data['candidates'], 0)
+
+
+class RollupTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.questions = [
+            Question.objects.create(text=f'Q{i}', topic=topic, difficulty='easy', time_required=60)
+            for i, topic in enumerate(['Personal', 'Personal', 'Technical'])
+        ]
+        self.admin = User.objects.create_user('admin', 'admin@example.com', 'pw', role='admin')
+
+    def snapshot(self):
+        questions = sorted(QuestionRollup.objects.values_list('question_id', 'total', 'missed'))
+        sessions, scored, score_sum = SessionRollup.objects.values_list('sessions', 'scored', 'score_sum').get()
+        return [row for row in questions if row[1:] != (0, 0)], (sessions, scored, round(score_sum, 6))
+
+    def test_apply_deltas_creates_missing_rows(self):
+        rollups.apply_deltas({self.questions[0].pk: (2, 1), self.questions[1].pk: (2, 1)})
+        rollups.apply_deltas({self.questions[0].pk: (1, 0), self.questions[2].pk: (0, 0)})
+        self.assertEqual(sorted(QuestionRollup.objects.exclude(total=0).values_list('question_id', 'total', 'missed')), [(self.questions[0].pk, 3, 1), (self.questions[1].pk, 2, 1)])
+
+    def test_incremental_rollups_match_rebuild(self):
+        users = [User.objects.create_user(f'candidate{i}', f'candidate{i}@example.com', 'pw') for i in range(4)]
+        sessions = [create_interview_session(user, self.questions) for user in users[:3]]
+        for i, (user, session) in enumerate(zip(users, sessions)):
+            answers = [{'question_id': q.pk, 'response': 'answer'} for q in self.questions[:i + 1]]
+            submit_answers(session, user, answers)
+        create_interview_session(users[3], self.questions[:2])
+        apply_candidate_action('remove', User.objects.filter(pk=users[1].pk))
+        client = APIClient()
+        client.force_authenticate(self.admin)
+        client.delete(f'/api/interview/admin/candidates/{users[2].pk}/remove/')
+
+        incremental = self.snapshot()
+        rollups.rebuild()
+        self.assertEqual(self.snapshot(), incremental)
+        self.assertEqual(incremental[1][:2], (2, 1))
+
+        with CaptureQueriesContext(connection) as ctx:
+            data = client.get('/api/interview/admin/analytics/').data
+        self.assertEqual((data['total_sessions'], round(data['avg_score'], 2)), (2, 33.33))
+        self.assertEqual(len(data['timeseries']), 1)
+        # Only the timeseries reads sessions, and only through the start_time window
+        session_queries = [q['sql'] for q in ctx.captured_queries if 'FROM "interview_interviewsession"' in q['sql']]
+        self.assertTrue(session_queries)
+        self.assertTrue(all('"start_time" >=' in sql for sql in session_queries))
+
+
+class AnalyticsTests(TestCase):
+    def test_filter_parsing(self):
+        filters = AnalyticsFilters.from_query_params({'start': '2026-01-01', 'end': '2026-01-31', 'topic': 'Personal'})
+        self.assertEqual((filters.start.day, filters.end.month, filters.end.day), (1, 2, 1))  # bare end date is inclusive
+        self.assertTrue(AnalyticsFilters.from_query_params({}).is_empty)
+        for params, message in [
+            ({'days': 'week'}, 'days must be a number'),
+            ({'days': '0'}, 'days must be positive'),
+            ({'start': 'yesterday'}, 'start must be an ISO date or datetime'),
+            ({'days': '7', 'start': '2026-01-01'}, 'Use either days or start, not both'),
+        ]:
+            with self.assertRaisesMessage(ValueError, message):
+                AnalyticsFilters.from_query_params(params)
+
+        admin = User.objects.create_user('admin', 'admin@example.com', 'pw', role='admin')
+        client = APIClient()
+        client.force_authenticate(admin)
+        self.assertEqual(client.get('/api/interview/admin/analytics/?days=7&start=2026-01-01').status_code, 400)
+
+    def test_daily_series_buckets(self):
+        user = User.objects.create_user('candidate', 'candidate@example.com', 'pw')
+        personal = Question.objects.create(text='P', topic='Personal', difficulty='easy', time_required=60)
+        technical = Question.objects.create(text='T', topic='Technical', difficulty='easy', time_required=60)
+        now = timezone.now()
+        for days_ago, score, correct in [(0, 100, True), (0, 50, False), (2, 20, False)]:
+            session = InterviewSession.objects.create(user=user, score=score)
+            InterviewSession.objects.filter(pk=session.pk).update(start_time=now - timedelta(days=days_ago))
+            SessionQuestion.objects.create(session=session, question=personal, is_correct=correct)
+            SessionQuestion.objects.create(session=session, question=technical, is_correct=True)
+
+        series = daily_series(AnalyticsFilters(start=now - timedelta(days=7), topic='Personal'))
+        self.assertEqual([(d['sessions'], d['avg_score'], d['answers'], d['missed']) for d in series],
+                         [(1, 20, 1, 1), (2, 75, 2, 1)])
+        self.assertEqual(series[1]['date'], now.date())
+
+
+class FastSerializerTests(TestCase):
+    def test_matches_model_serializer_byte_for_byte(self):
+        user = User.objects.create_user('candidate', 'candidate@example.com', 'pw')
+        questions = [
+            Question.objects.create(text=f'Q{i} "quoted" é', topic='Technical', difficulty='medium', time_required=90)
+            for i in range(3)
+        ]
+        submitted = InterviewSession.objects.create(user=user, score=66.6)
+        InterviewSession.objects.filter(pk=submitted.pk).update(end_time=submitted.start_time)
+        for i, q in enumerate(questions):
+            SessionQuestion.objects.create(session=submitted, question=q, response='answer' if i else None,
+                                           response_time=i or None, is_correct=bool(i))
+        empty = InterviewSession.objects.create(user=user)
+
+        renderer = JSONRenderer()
+        ids = [submitted.pk, empty.pk]
+        expected = [renderer.render(InterviewSessionSerializer(InterviewSession.objects.get(pk=pk)).data) for pk in ids]
+        actual = [renderer.render(payload) for payload in session_payloads(ids)]
+        self.assertEqual(actual, expected)
+        self.assertEqual(renderer.render(session_payload(submitted.pk)[0]), expected[0])
+
+
+class InterviewSessionListViewTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user('candidate', 'candidate@example.com', 'pw')
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        self.questions = [
+            Question.objects.create(text=f'Q{i}', topic='Technical', difficulty='easy', time_required=60)
+            for i in range(3)
+        ]
+
+    def add_sessions(self, count):
+        for _ in range(count):
+            session = InterviewSession.objects.create(user=self.user)
+            for q in self.questions:
+                SessionQuestion.objects.create(session=session, question=q)
+
+    def count_queries(self, url):
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        return len(ctx.captured_queries), response.data
+
+    def test_query_count_is_constant(self):
+        url = '/api/interview/sessions/?expand=questions'
+        self.add_sessions(2)
+        few, _ = self.count_queries(url)
+        self.add_sessions(10)
+        many, data = self.count_queries(url)
+        self.assertEqual(few, many)
+        self.assertEqual(len(data['results']), 12)
+        self.assertEqual(len(data['results'][0]['sessionquestion_set']), 3)
+
+    def test_list_is_compact_by_default(self):
+        self.add_sessions(1)
+        _, data = self.count_queries('/api/interview/sessions/')
+        self.assertNotIn('sessionquestion_set', data['results'][0])
+        _, data = self.count_queries('/api/interview/sessions/?fields=id,score')
+        self.assertEqual(set(data['results'][0]), {'id', 'score'})
+
+    def test_cursor_pagination_newest_first(self):
+        self.add_sessions(5)
+        _, data = self.count_queries('/api/interview/sessions/?page_size=2')
+        ids = [s['id'] for s in data['results']]
+        while data['next']:
+            _, data = self.count_queries(data['next'])
+            ids += [s['id'] for s in data['results']]
+        self.assertEqual(ids, sorted(ids, reverse=True))
+        self.assertEqual(len(ids), 5)
+
+
+class SaveAnswerViewTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user('candidate', 'candidate@example.com', 'pw')
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        self.questions = [
+            Question.objects.create(text=f'Q{i}', topic='Technical', difficulty='easy', time_required=60) for i in range(2)
+        ]
+        self.session = InterviewSession.objects.create(user=self.user)
+        for q in self.questions:
+            SessionQuestion.objects.create(session=self.session, question=q)
+
+    def save(self, response, revision, question=None):
+        return self.client.post('/api/interview/answer/', {
+            'session_id': self.session.pk, 'question_id': (question or self.questions[0]).pk,
+            'response': response, 'response_time': 12, 'revision': revision,
+        }, format='json')
+
+    def test_single_conditional_update(self):
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.save('first', 10)
+        self.assertEqual(response.data, {'saved': True, 'revision': 10})
+        self.assertEqual([q['sql'].split()[0] for q in ctx.captured_queries], ['UPDATE'])
+
+    def test_replayed_and_stale_saves_are_ignored(self):
+        self.save('second', 20)
+        self.assertEqual(self.save('second', 20).data, {'saved': False, 'revision': 20})
+        self.assertEqual(self.save('first', 10).data, {'saved': False, 'revision': 20})
+        self.assertEqual(SessionQuestion.objects.get(session=self.session, question=self.questions[0]).response, 'second')
+
+    def test_submit_scores_stored_answers(self):
+        self.save('an answer', 1)
+        response = self.client.post('/api/interview/submit/', {'session_id': self.session.pk, 'answers': []}, format='json')
+        self.assertEqual(response.data['score'], 50.0)
+        self.assertEqual(self.save('too late', 2).status_code, 409)
+        self.assertEqual(self.save('other', 1, question=Question.objects.create(text='X', topic='T', difficulty='easy')).status_code, 404)
+
+
+class AdminChangesViewTests(TestCase):
+    def setUp(self):
+        self.admin = User.objects.create_user('admin', 'admin@example.com', 'pw', role='admin')
+        self.client = APIClient()
+        self.client.force_authenticate(self.admin)
+        self.questions = [
+            Question.objects.create(text=f'Q{i}', topic='Technical', difficulty='easy', time_required=60) for i in range(5)
+        ]
+        self.candidates = [User.objects.create_user(f'candidate{i}', f'c{i}@example.com', 'pw') for i in range(5)]
+
+    def changes(self, cursor):
+        response = self.client.get('/api/interview/admin/changes/', {'since': cursor})
+        self.assertEqual(response.status_code, 200)
+        return response.data
+
+    def test_reports_only_what_changed(self):
+        cursor = self.client.get('/api/interview/admin/changes/').data['cursor']
+        past = changes.encode_cursor(timezone.now() - timedelta(minutes=1))
+        Question.objects.filter(pk__in=[q.pk for q in self.questions]).update(updated_at=timezone.now() - timedelta(minutes=2))
+        User.objects.filter(role='candidate').update(updated_at=timezone.now() - timedelta(minutes=2))
+
+        edited, deleted_id = self.questions[0], self.questions[1].pk
+        edited.text = 'Edited'
+        edited.save()
+        self.questions[1].delete()
+        InterviewSession.objects.create(user=self.candidates[0])
+        self.candidates[1].is_blocked_from_interview = True
+        self.candidates[1].save()
+        removed_id = self.candidates[2].pk
+        self.candidates[2].delete()
+
+        with self.settings(CHANGE_FEED_OVERLAP_SECONDS=0):
+            data = self.changes(past)
+        self.assertFalse(data['reset'])
+        self.assertEqual([q['text'] for q in data['questions']['updated']], ['Edited'])
+        self.assertEqual(data['questions']['deleted'], [deleted_id])
+        self.assertEqual({c['id'] for c in data['candidates']['updated']}, {self.candidates[0].pk, self.candidates[1].pk})
+        self.assertEqual(data['candidates']['updated'][0]['total_sessions'], 1)
+        self.assertEqual(data['candidates']['deleted'], [removed_id])
+        self.assertGreater(int(data['cursor']), int(cursor))
+
+    def test_expired_or_missing_cursor_asks_for_reload(self):
+        self.assertTrue(self.client.get('/api/interview/admin/changes/').data['reset'])
+        old = changes.encode_cursor(timezone.now() - timedelta(days=365))
+        self.assertTrue(self.changes(old)['reset'])
+        self.assertEqual(self.client.get('/api/interview/admin/changes/', {'since': 'nope'}).status_code, 400)
+
+
+class SubmitAnswersTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user('candidate', 'candidate@example.com', 'pw')
+        self.questions = [Question.objects.create(text=f'Q{i}', topic='Personal', difficulty='easy', time_required=60)
+                          for i in range(10)]
+
+    def submit(self, count):
+        session = create_interview_session(self.user, self.questions[:count])
+        answers = [{'question_id': q.pk, 'response': 'answer', 'response_time': 30} for q in self.questions[:count]]
+        with CaptureQueriesContext(connection) as ctx:
+            submit_answers(session, self.user, answers)
+        return ctx.captured_queries
+
+    def test_create_session_inserts_questions_at_once(self):
+        with CaptureQueriesContext(connection) as ctx:
+            session = create_interview_session(self.user, self.questions)
+        inserts = [q['sql'] for q in ctx.captured_queries if q['sql'].startswith('INSERT INTO "interview_sessionquestion"')]
+        self.assertEqual(len(inserts), 1)
+        self.assertEqual(session.sessionquestion_set.count(), 10)
+
+    def test_query_count_does_not_grow_with_answers(self):
+        few = self.submit(2)
+        User.objects.filter(pk=self.user.pk).update(has_completed_interview=False)
+        many = self.submit(10)
+        self.assertEqual(len(few), len(many))
+        updates = [q['sql'] for q in many if q['sql'].startswith('UPDATE "interview_sessionquestion"')]
+        self.assertEqual(len(updates), 1)
+        self.assertEqual(SessionQuestion.objects.filter(is_correct=True).count(), 12)
+
+    def test_failed_submit_rolls_back_together(self):
+        rollups.rebuild()
+        session = create_interview_session(self.user, self.questions[:3])
+        before = list(QuestionRollup.objects.order_by('pk').values_list('pk', 'total', 'missed'))
+        answers = [{'question_id': q.pk, 'response': 'answer'} for q in self.questions[:3]]
+        with mock.patch('interview.services.update_claims', side_effect=RuntimeError('write failed')):
+            with self.assertRaises(RuntimeError):
+                submit_answers(session, self.user, answers)
+        session.refresh_from_db()
+        self.assertEqual((session.score, session.end_time), (None, None))
+        self.assertFalse(SessionQuestion.objects.filter(session=session).exclude(response=None).exists())
+        self.assertFalse(User.objects.get(pk=self.user.pk).has_completed_interview)
+        self.assertEqual(list(QuestionRollup.objects.order_by('pk').values_list('pk', 'total', 'missed')), before)
+        self.assertEqual(SessionRollup.objects.get().scored, 0)
+
+
+class ShortestFirstPolicy(SelectionPolicy):
+    """Selection policy for SelectionTests: the blueprint's count of shortest questions."""
+
+    def select(self, pool, blueprint, rng=None):
+        return sorted(pool.questions, key=lambda q: (q.time_required, q.id))[:blueprint.question_count]
+
+
+class SelectionTests(TestCase):
+    def bank(self, per_bucket=3, skip=(), time_required=60):
+        questions = []
+        for topic, difficulty in DEFAULT_BLUEPRINT.target_distribution:
+            if (topic, difficulty) in skip:
+                continue
+            for i in range(per_bucket):
+                questions.append(Question(id=len(questions) + 1, text=f'{topic} {i}', topic=topic,
+                                          difficulty=difficulty, time_required=time_required))
+        return QuestionPool(questions)
+
+    def select(self, pool, blueprint=DEFAULT_BLUEPRINT, seed=0):
+        return QuotaBudgetPolicy().select(pool, blueprint, random.Random(seed))
+
+    def test_quotas_met_without_repeats(self):
+        pool = self.bank()
+        for seed in range(50):
+            selected = self.select(pool, seed=seed)
+            self.assertEqual(len(selected), 10)
+            self.assertEqual(len({q.id for q in selected}), 10)
+            counts = Counter((q.topic, q.difficulty) for q in selected)
+            self.assertEqual(counts, Counter(DEFAULT_BLUEPRINT.target_distribution))
+
+    def test_short_bucket_is_topped_up_from_the_bank(self):
+        pool = self.bank(skip={('Architecture', 'hard')})
+        for seed in range(50):
+            selected = self.select(pool, seed=seed)
+            self.assertEqual(len(selected), 10)
+            self.assertEqual(len({q.id for q in selected}), 10)
+            counts = Counter((q.topic, q.difficulty) for q in selected)
+            for bucket, count in DEFAULT_BLUEPRINT.target_distribution.items():
+                self.assertGreaterEqual(counts[bucket], 0 if bucket == ('Architecture', 'hard') else count)
+
+    def test_time_budget_and_small_bank(self):
+        selected = self.select(self.bank(time_required=120))
+        self.assertEqual(len(selected), 7)  # 7 x 120s fit in 900s
+        small = self.bank(per_bucket=1)
+        selected = self.select(small, Blueprint(DEFAULT_BLUEPRINT.target_distribution, question_count=20))
+        self.assertEqual(sorted(q.id for q in selected), sorted(q.id for q in small.questions))
+
+    @override_settings(INTERVIEW_SELECTION_POLICY='interview.tests.ShortestFirstPolicy')
+    def test_custom_policy_is_used_to_start_interviews(self):
+        self.assertIsInstance(get_selection_policy(), ShortestFirstPolicy)
+        cache.clear()
+        for i, seconds in enumerate((30, 90, 45, 60)):
+            Question.objects.create(text=f'Q{i}', topic='Personal', difficulty='easy', time_required=seconds)
+        client = APIClient()
+        client.force_authenticate(User.objects.create_user('candidate', 'candidate@example.com', 'pw'))
+        response = client.post('/api/interview/start/')
+        self.assertEqual([q['time_required'] for q in response.data['questions']], [30, 45, 60, 90])
+
+
+@override_settings(INTERVIEW_PREGENERATED_SETS=3)
+class PregeneratedQuestionSetTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        for (topic, difficulty), count in DEFAULT_BLUEPRINT.target_distribution.items():
+            for i in range(count + 1):
+                Question.objects.create(text=f'{topic} {i}', topic=topic, difficulty=difficulty, time_required=60)
+        self.client = APIClient()
+        self.client.force_authenticate(User.objects.create_user('candidate', 'candidate@example.com', 'pw'))
+
+    def test_start_claims_a_set(self):
+        self.assertEqual(pregeneration.refill(), 3)
+        expected = PregeneratedQuestionSet.objects.order_by('pk').first().questions
+        response = self.client.post('/api/interview/start/')
+        self.assertEqual([q['id'] for q in response.data['questions']], [qid for qid, _ in expected])
+        self.assertEqual(sum(q['time_required'] for q in response.data['questions']), 600)
+        self.assertEqual(PregeneratedQuestionSet.objects.count(), 2)
+
+    def test_stale_sets_are_skipped_and_bank_changes_discard_sets(self):
+        pregeneration.refill()
+        # A set generated before its first question was last edited
+        first = PregeneratedQuestionSet.objects.order_by('pk').first()
+        first.questions[0][1] = (timezone.now() - timedelta(days=1)).isoformat()
+        first.save()
+        claimed = pregeneration.claim_question_set()
+        self.assertEqual(len(claimed), 10)
+        self.assertEqual(PregeneratedQuestionSet.objects.count(), 1)  # the stale set was dropped
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Question.objects.create(text='New', topic='Personal', difficulty='easy', time_required=60)
+        self.assertFalse(PregeneratedQuestionSet.objects.exists())
+        self.assertIsNone(pregeneration.claim_question_set())
+
+
+class ScoringTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user('candidate', 'candidate@example.com', 'pw')
+        self.question = Question.objects.create(text='Q', topic='Technical', difficulty='medium', time_required=60,
+                                                keywords=['index', 'query plan'])
+        self.session = create_interview_session(self.user, [self.question, Question.objects.create(
+            text='Q2', topic='Personal', difficulty='easy', time_required=60)])
+
+    def test_only_admins_see_keywords(self):
+        client = APIClient()
+        client.force_authenticate(self.user)
+        self.assertNotIn('keywords', client.get(f'/api/questions/{self.question.pk}/').data)
+        client.force_authenticate(User.objects.create_user('admin', 'admin@example.com', 'pw', role='admin'))
+        self.assertEqual(client.get(f'/api/questions/{self.question.pk}/').data['keywords'], ['index', 'query plan'])
+
+    def test_keyword_scorer(self):
+        answers = [Answer('Check the Query plan.', ['index', 'query plan']), Answer('Add an index', ['query plan']),
+                   Answer('anything', []), Answer(None, ['index'])]
+        self.assertEqual(KeywordScorer().score(answers), [True, False, True, False])
+
+    @override_settings(INTERVIEW_SCORER='interview.scoring.KeywordScorer')
+    def test_submit_uses_configured_scorer(self):
+        answers = [{'question_id': self.question.pk, 'response': 'no idea'}]
+        submit_answers(self.session, self.user, answers)
+        self.session.refresh_from_db()
+        self.assertEqual(self.session.score, 0)
+
+    def test_rescore_command(self):
+        answers = [{'question_id': self.question.pk, 'response': 'no idea'}]
+        submit_answers(self.session, self.user, answers)
+        self.assertEqual(InterviewSession.objects.get(pk=self.session.pk).score, 50)
+
+        out = StringIO()
+        call_command('rescore_sessions', scorer='interview.scoring.KeywordScorer', workers=2, stdout=out)
+        self.assertIn('1 answers and 1 session scores changed', out.getvalue())
+        self.assertEqual(InterviewSession.objects.get(pk=self.session.pk).score, 0)
+        self.assertFalse(SessionQuestion.objects.get(session=self.session, question=self.question).is_correct)
+
+
+class InstrumentationTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user('candidate', 'candidate@example.com', 'pw')
+
+    def client_for(self):
+        client = APIClient()
+        client.force_authenticate(self.user)
+        return client
+
+    def test_disabled_by_default(self):
+        response = self.client_for().get('/api/interview/sessions/')
+        self.assertFalse(response.has_header('Server-Timing'))
+        self.assertEqual(self.client_for().get('/metrics/').status_code, 404)
+
+    @override_settings(INSTRUMENTATION_ENABLED=True, INSTRUMENTATION_METRICS_TOKEN='scrape')
+    def test_server_timing_and_metrics(self):
+        client = self.client_for()
+        with CaptureQueriesContext(connection) as ctx:
+            response = client.get('/api/interview/sessions/')
+        self.assertIn(f'desc="{len(ctx.captured_queries)} queries"', response['Server-Timing'])
+        self.assertRegex(response['Server-Timing'], r'^app;dur=[\d.]+, db;dur=[\d.]+;desc="\d+ queries", render;dur=[\d.]+$')
+
+        self.assertEqual(client.get('/metrics/').status_code, 403)
+        self.assertEqual(client.get('/metrics/', HTTP_AUTHORIZATION='Bearer wrong').status_code, 403)
+        metrics = client.get('/metrics/', HTTP_AUTHORIZATION='Bearer scrape').content.decode()
+        self.assertIn('botspark_request_duration_seconds_count{view="interview-session-list-create",method="GET"}', metrics)
+        self.assertIn('botspark_db_queries_total{view="interview-session-list-create",method="GET"}', metrics)
+
+    @override_settings(INSTRUMENTATION_ENABLED=True, INSTRUMENTATION_METRICS_TOKEN='')
+    def test_metrics_refused_without_a_configured_token(self):
+        self.assertEqual(self.client_for().get('/metrics/').status_code, 403)
+        self.assertEqual(APIClient().get('/metrics/', HTTP_AUTHORIZATION='Bearer ').status_code, 403)
+
+
+class AsyncViewTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user('candidate', 'candidate@example.com', 'pw')
+        for topic in ('Personal', 'Technical'):
+            Question.objects.create(text=topic, topic=topic, difficulty='easy', time_required=60)
+        token = ClaimsTokenObtainPairSerializer.get_token(self.user)
+        self.auth = {'headers': {'Authorization': f'Bearer {token.access_token}'}}
+        self.factory = AsyncRequestFactory()
+
+    async def test_matches_sync_views(self):
+        response = await async_views.start_interview(self.factory.post('/', **self.auth))
+        self.assertEqual(response.status_code, 200, response.content)
+        started = json.loads(response.content)
+        answers = [{'question_id': q['id'], 'response': 'answer', 'response_time': 5} for q in started['questions']]
+
+        request = self.factory.post('/', {'session_id': started['session_id'], 'answers': answers},
+                                    content_type='application/json', **self.auth)
+        response = await async_views.submit_interview(request)
+        self.assertEqual(json.loads(response.content), {'success': True, 'score': 100.0})
+
+        response = await async_views.session_summary(self.factory.get('/', **self.auth), started['session_id'])
+        payload, _ = await sync_to_async(session_payload)(started['session_id'])
+        self.assertEqual(response.content, JSONRenderer().render(payload))
+
+        # The completion flag revoked the token's claims
+        response = await async_views.start_interview(self.factory.post('/', **self.auth))
+        self.assertEqual(response.status_code, 403)
+
+    async def test_requires_authentication(self):
+        response = await async_views.start_interview(self.factory.post('/'))
+        self.assertEqual(response.status_code, 401)
+        response = await async_views.session_summary(self.factory.get('/', headers={'Authorization': 'Bearer nope'}), 1)
+        self.assertEqual(response.status_code, 401)
+
+
+class StartAfterRemoteDeleteTests(TransactionTestCase):
+    @override_settings(QUESTION_POOL_CHECK_SECONDS=3600)
+    def test_start_reloads_the_pool_when_a_question_is_gone(self):
+        cache.clear()
+        invalidate_question_pool()
+        self.addCleanup(invalidate_question_pool)
+        gone, kept = [Question.objects.create(text=f'Q{i}', topic='Personal', difficulty='easy', time_required=60)
+                      for i in range(2)]
+        self.assertEqual(len(get_question_pool()), 2)
+        # Deleted by another process: no signal reaches this process' pool
+        with connection.cursor() as cursor:
+            cursor.execute('DELETE FROM questions_question WHERE id = %s', [gone.pk])
+
+        client = APIClient()
+        client.force_authenticate(User.objects.create_user('candidate', 'candidate@example.com', 'pw'))
+        response = client.post('/api/interview/start/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([q['id'] for q in response.data['questions']], [kept.pk])
+
+
+class DuplicateSessionQuestionMigrationTests(TransactionTestCase):
+    def setUp(self):
+        self.executor = MigrationExecutor(connection)
+        others = [node for node in self.executor.loader.graph.leaf_nodes() if node[0] != 'interview']
+        self.before = others + [('interview', '0004_analytics_indexes')]
+        self.after = others + [('interview', '0005_query_indexes')]
+        self.executor.migrate(self.before)
+
+    def tearDown(self):
+        executor = MigrationExecutor(connection)
+        executor.migrate(executor.loader.graph.leaf_nodes())
+
+    def test_merges_duplicates_before_adding_the_constraint(self):
+        apps = self.executor.loader.project_state(self.before).apps
+        user = apps.get_model('users', 'User').objects.create(username='candidate')
+        question = apps.get_model('questions', 'Question').objects.create(text='Q', topic='Personal', difficulty='easy')
+        session = apps.get_model('interview', 'InterviewSession').objects.create(user=user)
+        SQ = apps.get_model('interview', 'SessionQuestion')
+        SQ.objects.create(session=session, question=question)
+        answered = SQ.objects.create(session=session, question=question, response='answer', is_correct=True)
+        apps.get_model('interview', 'QuestionRollup').objects.create(question=question, total=2, missed=1)
+
+        executor = MigrationExecutor(connection)
+        executor.migrate(self.after)
+
+        apps = executor.loader.project_state(self.after).apps
+        self.assertEqual(list(apps.get_model('interview', 'SessionQuestion').objects.values_list('pk', flat=True)), [answered.pk])
+        rollup = apps.get_model('interview', 'QuestionRollup').objects.get(question_id=question.pk)
+        self.assertEqual((rollup.total, rollup.missed), (1, 0))
+
+
+@skipUnless(connection.vendor == 'sqlite', 'EXPLAIN QUERY PLAN output is SQLite specific')
+class QueryPlanTests(TestCase):
+    """Fail if a hot query stops using an index and falls back to a full table scan."""
+
+    def assertNoFullScan(self, queryset):
+        plan = queryset.explain()
+        scans = re.findall(r'\bSCAN (?:TABLE )?(\w+)', plan)
+        self.assertEqual(scans, [], f'Full scan in query plan:\n{plan}\nfor:\n{queryset.query}')
+
+    def test_sessions_by_user_and_start_time(self):
+        self.assertNoFullScan(InterviewSession.objects.filter(user_id=1).order_by('-start_time'))
+
+    def test_sessions_in_date_window(self):
+        since = timezone.now() - timedelta(days=7)
+        self.assertNoFullScan(AnalyticsFilters(start=since).sessions())
+        self.assertNoFullScan(AnalyticsFilters(start=since).session_questions().values('question__topic').annotate(n=Count('pk')))
+
+    def test_session_question_lookup(self):
+        self.assertNoFullScan(SessionQuestion.objects.filter(session_id=1, question_id=2))
+
+    def test_misses_by_question(self):
+        self.assertNoFullScan(SessionQuestion.objects.filter(question_id=1, is_correct=False))
+
+    def test_questions_by_topic_and_difficulty(self):
+        self.assertNoFullScan(Question.objects.filter(topic='Technical', difficulty='easy'))
+
+    def test_candidates_by_role(self):
+        self.assertNoFullScan(User.objects.filter(role='candidate').order_by('-date_joined'))
+
+    def test_admin_candidates_annotated_query(self):
+        self.assertNoFullScan(annotated_candidates().order_by('-date_joined', '-pk'))
+
+    def test_change_feed_queries(self):
+        since = timezone.now() - timedelta(minutes=5)
+        self.assertNoFullScan(changes.changed_questions(since))
+        self.assertNoFullScan(User.objects.filter(role='candidate', updated_at__gt=since).values_list('pk'))
+        self.assertNoFullScan(InterviewSession.objects.filter(end_time__gt=since).values_list('user_id'))
+        self.assertNoFullScan(Tombstone.objects.filter(kind='question', deleted_at__gt=since).values_list('object_id'))
@@ -1,15 +1,27 @@
+from django.conf import settings
 from django.urls import path
-from .views import InterviewSessionListCreateView, InterviewSessionDetailView, StartInterviewView, SubmitAnswersView, SessionSummaryView, AdminAnalyticsView, AdminCandidatesView, AdminCandidateDetailView, AdminUnblockCandidateView, AdminRemoveCandidateView
+from .views import InterviewSessionListCreateView, InterviewSessionDetailView, StartInterviewView, SubmitAnswersView, SaveAnswerView, SessionSummaryView, AdminAnalyticsView, AdminCandidatesView, AdminChangesView, AdminCandidateDetailView, AdminUnblockCandidateView, AdminRemoveCandidateView, AdminBulkCandidatesView
+
+if settings.INTERVIEW_ASYNC_VIEWS:
+    # Same routes and payloads, served by coroutine views (deploy under ASGI, see backend/asgi.py)
+    from .async_views import start_interview, submit_interview, session_summary
+else:
+    start_interview = StartInterviewView.as_view()
+    submit_interview = SubmitAnswersView.as_view()
+    session_summary = SessionSummaryView.as_view()
 
 urlpatterns = [
     path('sessions/', InterviewSessionListCreateView.as_view(), name='interview-session-list-create'),
     path('sessions/<int:pk>/', InterviewSessionDetailView.as_view(), name='interview-session-detail'),
-    path('start/', StartInterviewView.as_view(), name='interview-start'),
-    path('submit/', SubmitAnswersView.as_view(), name='interview-submit'),
-    path('summary/<int:session_id>/', SessionSummaryView.as_view(), name='interview-summary'),
+    path('start/', start_interview, name='interview-start'),
+    path('submit/', submit_interview, name='interview-submit'),
+    path('answer/', SaveAnswerView.as_view(), name='interview-save-answer'),
+    path('summary/<int:session_id>/', session_summary, name='interview-summary'),
     path('admin/analytics/', AdminAnalyticsView.as_view(), name='admin-analytics'),
     path('admin/candidates/', AdminCandidatesView.as_view(), name='admin-candidates'),
+    path('admin/changes/', AdminChangesView.as_view(), name='admin-changes'),
+    path('admin/candidates/bulk/', AdminBulkCandidatesView.as_view(), name='admin-bulk-candidates'),
     path('admin/candidates/<int:candidate_id>/', AdminCandidateDetailView.as_view(), name='admin-candidate-detail'),
     path('admin/candidates/<int:candidate_id>/unblock/', AdminUnblockCandidateView.as_view(), name='admin-unblock-candidate'),
     path('admin/candidates/<int:candidate_id>/remove/', AdminRemoveCandidateView.as_view(), name='admin-remove-candidate'),
-]
\ No newline at end of file
+]
@@ -1,3 +1,4 @@
+from django.conf import settings
 from django.shortcuts import render
 from rest_framework import generics, permissions, status
 from rest_framework.views import APIView
@@ -6,31 +7,68 @@ from .models import InterviewSession, SessionQuestion
 from .serializers import InterviewSessionSerializer, SessionQuestionSerializer
 from questions.models import Question
 from questions.serializers import QuestionSerializer
+from .services import (
+    CANDIDATE_ACTIONS, InterviewNotAllowed, NoQuestionsAvailable, apply_candidate_action, save_answer, start_interview_session,
+    submit_answers,
+)
+from . import changes, rollups
+from .analytics import AnalyticsFilters, daily_series, windowed_analytics
+from .fast_serializers import session_payload
+from backend.caching import bump_version, cached_response, get_version
 from django.utils import timezone
-import random
 from rest_framework.decorators import api_view, permission_classes
 from users.models import User
-from django.db import models
+from django.db import models, transaction
+from django.db.models import Avg, Count, OuterRef, Prefetch, Q, Subquery, Value
+from django.db.models.functions import Coalesce
+from .pagination import CandidateCursorPagination, SessionCursorPagination
 from typing import List, Dict, Any
 
 # Create your views here.
 
-class InterviewSessionListCreateView(generics.ListCreateAPIView):
+class SessionFieldsMixin:
+    """
+    ?fields=id,score,... picks the serialized fields and ?expand=questions adds the
+    nested questions. Questions are only serialized (and prefetched) when asked for.
+    """
+    default_fields = ['id', 'user', 'start_time', 'end_time', 'score']
+
+    def requested_fields(self):
+        fields = self.request.query_params.get('fields')
+        fields = [f for f in fields.split(',') if f] if fields else list(self.default_fields)
+        if self.request.query_params.get('expand') == 'questions' and 'sessionquestion_set' not in fields:
+            fields.append('sessionquestion_set')
+        return fields
+
+    def get_queryset(self):
+        queryset = InterviewSession.objects.filter(user_id=self.request.user.id).select_related('user')  # type: ignore[attr-defined]
+        if 'sessionquestion_set' in self.requested_fields():
+            queryset = queryset.prefetch_related('sessionquestion_set__question')
+        return queryset
+
+    def get_serializer(self, *args, **kwargs):
+        if self.request.method == 'GET':
+            kwargs['fields'] = self.requested_fields()
+        return super().get_serializer(*args, **kwargs)
+
+class InterviewSessionListCreateView(SessionFieldsMixin, generics.ListCreateAPIView):
     queryset = InterviewSession.objects.all()  # type: ignore[attr-defined]
     serializer_class = InterviewSessionSerializer
     permission_classes = [permissions.IsAuthenticated]
+    pagination_class = SessionCursorPagination
 
-    def get_queryset(self):
-        # Only return sessions for the current user
-        return InterviewSession.objects.filter(user=self.request.user)  # type: ignore[attr-defined]
+    def perform_create(self, serializer):
+        with transaction.atomic():
+            session = serializer.save(user_id=self.request.user.id)
+            rollups.record_sessions(sessions=1)
+            rollups.record_score_change(None, session.score)
 
-class InterviewSessionDetailView(generics.RetrieveAPIView):
+class InterviewSessionDetailView(SessionFieldsMixin, generics.RetrieveAPIView):
     queryset = InterviewSession.objects.all()  # type: ignore[attr-defined]
     serializer_class = InterviewSessionSerializer
     permission_classes = [permissions.IsAuthenticated]
-
-    def get_queryset(self):
-        return InterviewSession.objects.filter(user=self.request.user)  # type: ignore[attr-defined]
+    # A single session includes its questions unless ?fields= says otherwise
+    default_fields = SessionFieldsMixin.default_fields + ['sessionquestion_set']
 
 class StartInterviewView(APIView):
     permission_classes = [permissions.IsAuthenticated]
@@ -40,65 +78,12 @@ class StartInterviewView(APIView):
         if user.role == 'candidate' and (user.has_completed_interview or user.is_blocked_from_interview):
             return Response({'error': 'You are not allowed to take another interview at this time.'}, status=403)
         
-        # Fast question selection algorithm
-        all_questions: List[Question] = list(Question.objects.all())  # type: ignore[attr-defined]
-        if not all_questions:
+        try:
+            session, selected_questions = start_interview_session(request.user)
+        except NoQuestionsAvailable:
             return Response({'error': 'No questions available.'}, status=400)
-
-        # Group questions by topic and difficulty
-        questions_by_topic_diff: Dict[tuple, List[Question]] = {}
-        for q in all_questions:
-            key = (q.topic, q.difficulty)
-            if key not in questions_by_topic_diff:
-                questions_by_topic_diff[key] = []
-            questions_by_topic_diff[key].append(q)
-
-        # Define target distribution for 10 questions
-        target_distribution = {
-            ('Personal', 'easy'): 2,
-            ('Technical', 'easy'): 2,
-            ('Technical', 'medium'): 2,
-            ('Problem Solving', 'medium'): 1,
-            ('Teamwork', 'medium'): 1,
-            ('Learning', 'medium'): 1,
-            ('Architecture', 'hard'): 1,
-        }
-
-        selected_questions: List[Question] = []
-        total_time = 0
-        max_time = 900  # 15 minutes
-
-        # Select questions based on target distribution
-        for (topic, difficulty), count in target_distribution.items():
-            available = questions_by_topic_diff.get((topic, difficulty), [])
-            if available:
-                # Randomly select from available questions
-                selected = random.sample(available, min(count, len(available)))
-                for q in selected:
-                    if total_time + q.time_required <= max_time:  # type: ignore[operator]
-                        selected_questions.append(q)
-                        total_time += q.time_required  # type: ignore[operator]
-            
-            # If we don't have enough questions, fill with any available questions
-            if len(selected_questions) < 10:
-                remaining_questions = [q for q in all_questions if q not in selected_questions]
-                random.shuffle(remaining_questions)
-                
-                for q in remaining_questions:
-                    if len(selected_questions) >= 10:
-                        break
-                    if total_time + q.time_required <= max_time:  # type: ignore[operator]
-                        selected_questions.append(q)
-                        total_time += q.time_required  # type: ignore[operator]
-
-        # If still not enough questions, just take what we have
-        if not selected_questions:
-            selected_questions = random.sample(all_questions, min(10, len(all_questions)))
-
-        # Create session and session questions
-        session = InterviewSession.objects.create(user=request.user)  # type: ignore[attr-defined]
-        for q in selected_questions:
-            SessionQuestion.objects.create(session=session, question=q)  # type: ignore[attr-defined]
+        except InterviewNotAllowed:
+            return Response({'error': 'You are not allowed to take another interview at this time.'}, status=403)
 
         return Response({
             'session_id': session.id,
@@ -112,46 +97,106 @@ class SubmitAnswersView(APIView):
         session_id = request.data.get('session_id')
         answers = request.data.get('answers', [])
         try:
-            session = InterviewSession.objects.get(id=session_id, user=request.user)  # type: ignore[attr-defined]
+            session = InterviewSession.objects.get(id=session_id, user_id=request.user.id)  # type: ignore[attr-defined]
         except InterviewSession.DoesNotExist:  # type: ignore[attr-defined]
             return Response({'error': 'Session not found.'}, status=404)
         
-        for ans in answers:
-            qid = ans.get('question_id')
-            response = ans.get('response')
-            sq = SessionQuestion.objects.filter(session=session, question_id=qid).first()  # type: ignore[attr-defined]
-            if sq:
-                sq.response = response
-                sq.response_time = ans.get('response_time', 0)
-                # For demo, mark all as correct if not empty
-                sq.is_correct = bool(response)
-                sq.save()
-        
-        session.end_time = timezone.now()
-        session.score = sum(1 for a in answers if a.get('response')) / max(len(answers), 1) * 100
-        session.save()
-        # Mark candidate as completed
-        user = request.user
-        if user.role == 'candidate':
-            user.has_completed_interview = True  # type: ignore[assignment]
-            user.save()
+        submit_answers(session, request.user, answers)
         return Response({'success': True, 'score': session.score})
 
+class SaveAnswerView(APIView):
+    """
+    Autosave one answer: {session_id, question_id, response, response_time, revision}.
+
+    `revision` must grow with every save of the same answer (a timestamp works); a
+    request whose revision is not newer than the stored one is acknowledged but not
+    applied, so clients can retry freely.
+    """
+    permission_classes = [permissions.IsAuthenticated]
+
+    def post(self, request):
+        data = request.data
+        try:
+            session_id, question_id, revision = int(data['session_id']), int(data['question_id']), int(data['revision'])
+            response_time = data.get('response_time')
+            response_time = int(response_time) if response_time is not None else None
+        except (KeyError, TypeError, ValueError):
+            return Response({'error': 'session_id, question_id and an integer revision are required.'}, status=400)
+        response = data.get('response')
+        if revision <= 0 or (response is not None and not isinstance(response, str)):
+            return Response({'error': 'Invalid answer.'}, status=400)
+
+        if save_answer(session_id, request.user.id, question_id, response, response_time, revision):
+            return Response({'saved': True, 'revision': revision})
+
+        # Nothing written: find out why (only on this path, so saves stay one query)
+        row = SessionQuestion.objects.filter(  # type: ignore[attr-defined]
+            session_id=session_id, session__user_id=request.user.id, question_id=question_id,
+        ).values('answer_revision', 'session__end_time').first()
+        if row is None:
+            return Response({'error': 'Question not found in this session.'}, status=404)
+        if row['session__end_time'] is not None:
+            return Response({'error': 'Session already submitted.'}, status=409)
+        return Response({'saved': False, 'revision': row['answer_revision']})
+
 class SessionSummaryView(APIView):
     permission_classes = [permissions.IsAuthenticated]
 
     def get(self, request, session_id):
-        try:
-            session = InterviewSession.objects.get(id=session_id)  # type: ignore[attr-defined]
-        except InterviewSession.DoesNotExist:  # type: ignore[attr-defined]
-            return Response({'error': 'Session not found.'}, status=404)
+        # Cached until the session is submitted or removed (see interview.services)
+        key = f"summary:{session_id}:{get_version(f'session:{session_id}')}"
+        
+        def build():
+            return session_payload(session_id)
         
         # Only allow owner or admin
-        if session.user != request.user and request.user.role != 'admin':
-            return Response({'error': 'Not authorized.'}, status=403)
+        def check(owner_id):
+            if owner_id != request.user.id and request.user.role != 'admin':
+                return Response({'error': 'Not authorized.'}, status=403)
         
-        serializer = InterviewSessionSerializer(session)
-        return Response(serializer.data)
+        try:
+            return cached_response(request, key, build, check)
+        except InterviewSession.DoesNotExist:  # type: ignore[attr-defined]
+            return Response({'error': 'Session not found.'}, status=404)
+
+def annotated_candidates():
+    """Candidates with their session aggregates and latest session, in one query."""
+    latest = InterviewSession.objects.filter(user=OuterRef('pk')).order_by('-start_time', '-pk')  # type: ignore[attr-defined]
+    return User.objects.filter(role='candidate').annotate(  # type: ignore[attr-defined]
+        total_sessions=Count('interviewsession'),
+        average_score=Coalesce(Avg('interviewsession__score'), Value(0.0)),
+        latest_session_id=Subquery(latest.values('pk')[:1]),
+        latest_session_score=Subquery(latest.values('score')[:1]),
+        latest_session_start_time=Subquery(latest.values('start_time')[:1]),
+        latest_session_end_time=Subquery(latest.values('end_time')[:1]),
+    )
+
+def filter_candidates(candidates, params):
+    """Apply the admin candidate filters (search and the interview flags) from query params or a JSON object."""
+    search = params.get('search')
+    if search:
+        candidates = candidates.filter(Q(username__icontains=search) | Q(email__icontains=search))
+    for flag in ('has_completed_interview', 'is_blocked_from_interview'):
+        value = params.get(flag)
+        if value is not None:
+            candidates = candidates.filter(**{flag: value if isinstance(value, bool) else str(value).lower() in ('1', 'true', 'yes')})
+    return candidates
+
+def candidate_data(candidate) -> Dict[str, Any]:
+    return {
+        'id': candidate.id,
+        'username': candidate.username,
+        'email': candidate.email,
+        'date_joined': candidate.date_joined,
+        'total_sessions': candidate.total_sessions,
+        'latest_session': {
+            'id': candidate.latest_session_id,
+            'score': candidate.latest_session_score,
+            'start_time': candidate.latest_session_start_time,
+            'end_time': candidate.latest_session_end_time,
+        } if candidate.latest_session_id else None,
+        'average_score': candidate.average_score,
+    }
 
 class AdminCandidatesView(APIView):
     permission_classes = [permissions.IsAuthenticated]
@@ -160,40 +205,52 @@ class AdminCandidatesView(APIView):
         if request.user.role != 'admin':
             return Response({'error': 'Not authorized.'}, status=403)
         
-        # Get all candidates (users with role 'candidate')
-        candidates = User.objects.filter(role='candidate').order_by('-date_joined')  # type: ignore[attr-defined]
-        
-        candidates_data = []
-        for candidate in candidates:
-            # Get candidate's interview sessions
-            sessions = InterviewSession.objects.filter(user=candidate).order_by('-start_time')  # type: ignore[attr-defined]
-            
-            candidate_data = {
-                'id': candidate.id,
-                'username': candidate.username,
-                'email': candidate.email,
-                'date_joined': candidate.date_joined,
-                'total_sessions': sessions.count(),
-                'latest_session': None,
-                'average_score': 0,
-            }
-            
-            if sessions.exists():
-                latest_session = sessions.first()
-                candidate_data['latest_session'] = {
-                    'id': latest_session.id,
-                    'score': latest_session.score,
-                    'start_time': latest_session.start_time,
-                    'end_time': latest_session.end_time,
-                }
-                
-                # Calculate average score
-                avg_score = sessions.aggregate(models.Avg('score'))['score__avg']
-                candidate_data['average_score'] = avg_score or 0
-            
-            candidates_data.append(candidate_data)
-        
-        return Response(candidates_data)
+        candidates = filter_candidates(annotated_candidates(), request.query_params)
+
+        paginator = CandidateCursorPagination()
+        page = paginator.paginate_queryset(candidates, request, view=self)
+        return paginator.get_paginated_response([candidate_data(candidate) for candidate in page])
+
+class AdminChangesView(APIView):
+    """
+    Questions and candidates created, updated or deleted since ?since=<cursor>.
+
+    Without a cursor, or with one older than the tombstone retention, the response
+    is {'reset': true, 'cursor': ...}: load the full lists, then poll with that cursor.
+    """
+    permission_classes = [permissions.IsAuthenticated]
+
+    def get(self, request):
+        if request.user.role != 'admin':
+            return Response({'error': 'Not authorized.'}, status=403)
+
+        # Taken before reading, so nothing written during this request is skipped next time
+        cursor = changes.encode_cursor(timezone.now())
+        since = request.query_params.get('since')
+        if not since:
+            return Response({'reset': True, 'cursor': cursor})
+        try:
+            since = changes.decode_cursor(since)
+        except (ValueError, OverflowError, OSError):
+            return Response({'error': 'Invalid cursor.'}, status=400)
+        if changes.is_expired(since):
+            return Response({'reset': True, 'cursor': cursor})
+
+        since = changes.read_from(since)
+        candidate_ids = changes.changed_candidate_ids(since)
+        candidates = annotated_candidates().filter(pk__in=candidate_ids).order_by('pk') if candidate_ids else []
+        return Response({
+            'reset': False,
+            'cursor': cursor,
+            'questions': {
+                'updated': QuestionSerializer(changes.changed_questions(since), many=True).data,
+                'deleted': changes.deleted_ids('question', since),
+            },
+            'candidates': {
+                'updated': [candidate_data(candidate) for candidate in candidates],
+                'deleted': changes.deleted_ids('candidate', since),
+            },
+        })
 
 class AdminCandidateDetailView(APIView):
     permission_classes = [permissions.IsAuthenticated]
@@ -207,44 +264,56 @@ class AdminCandidateDetailView(APIView):
         except User.DoesNotExist:  # type: ignore[attr-defined]
             return Response({'error': 'Candidate not found.'}, status=404)
         
-        # Get all sessions for this candidate
-        sessions = InterviewSession.objects.filter(user=candidate).order_by('-start_time')  # type: ignore[attr-defined]
+        # ?mode=timeline skips the (potentially long) response text of every question
+        timeline = request.query_params.get('mode') == 'timeline'
+        session_questions = SessionQuestion.objects.select_related('question')  # type: ignore[attr-defined]
+        if timeline:
+            session_questions = session_questions.defer('response')
+        sessions = list(
+            InterviewSession.objects.filter(user=candidate)  # type: ignore[attr-defined]
+            .order_by('-start_time')
+            .prefetch_related(Prefetch('sessionquestion_set', queryset=session_questions))
+        )
         
         sessions_data = []
         for session in sessions:
-            session_questions = SessionQuestion.objects.filter(session=session)  # type: ignore[attr-defined]
+            session_questions = session.sessionquestion_set.all()
+            response_times = [sq.response_time for sq in session_questions if sq.response_time is not None]
             
             session_data = {
                 'id': session.id,
                 'score': session.score,
                 'start_time': session.start_time,
                 'end_time': session.end_time,
-                'total_questions': session_questions.count(),
-                'correct_answers': session_questions.filter(is_correct=True).count(),
-                'average_time': session_questions.aggregate(models.Avg('response_time'))['response_time__avg'] or 0,
+                'total_questions': len(session_questions),
+                'correct_answers': sum(1 for sq in session_questions if sq.is_correct),
+                'average_time': sum(response_times) / len(response_times) if response_times else 0,
                 'questions': []
             }
             
             # Get detailed question data
             for sq in session_questions:
-                session_data['questions'].append({
+                question_data = {
                     'question_text': sq.question.text,
                     'question_topic': sq.question.topic,
                     'question_difficulty': sq.question.difficulty,
-                    'response': sq.response,
-                    'is_correct': sq.is_correct,
-                    'response_time': sq.response_time,
-                })
+                }
+                if not timeline:
+                    question_data['response'] = sq.response
+                question_data['is_correct'] = sq.is_correct
+                question_data['response_time'] = sq.response_time
+                session_data['questions'].append(question_data)
             
             sessions_data.append(session_data)
         
+        scores = [session.score for session in sessions if session.score is not None]
         candidate_data = {
             'id': candidate.id,
             'username': candidate.username,
             'email': candidate.email,
             'date_joined': candidate.date_joined,
-            'total_sessions': sessions.count(),
-            'average_score': sessions.aggregate(models.Avg('score'))['score__avg'] or 0,
+            'total_sessions': len(sessions),
+            'average_score': sum(scores) / len(scores) if scores else 0,
             'sessions': sessions_data
         }
         
@@ -257,31 +326,18 @@ class AdminAnalyticsView(APIView):
         if request.user.role != 'admin':
             return Response({'error': 'Not authorized.'}, status=403)
         
-        sessions = InterviewSession.objects.all()  # type: ignore[attr-defined]
-        total_sessions = sessions.count()
-        avg_score = sessions.aggregate(models.Avg('score'))['score__avg'] or 0
-        
-        topic_stats: Dict[str, Dict[str, int]] = {}
-        miss_count: Dict[int, int] = {}
-        
-        for sq in SessionQuestion.objects.all():  # type: ignore[attr-defined]
-            topic = sq.question.topic
-            topic_stats[topic] = topic_stats.get(topic, {'total': 0, 'missed': 0})
-            topic_stats[topic]['total'] += 1
-            if not sq.is_correct:
-                topic_stats[topic]['missed'] += 1
-            
-            qid = sq.question.id
-            if not sq.is_correct:
-                miss_count[qid] = miss_count.get(qid, 0) + 1
-        
-        most_missed = sorted(miss_count.items(), key=lambda x: x[1], reverse=True)[:5]
+        try:
+            filters = AnalyticsFilters.from_query_params(request.query_params)
+        except ValueError as e:
+            return Response({'error': str(e)}, status=400)
+        if not filters.is_empty:
+            return Response(windowed_analytics(filters))
         
         return Response({
-            'total_sessions': total_sessions,
-            'avg_score': avg_score,
-            'topic_stats': topic_stats,
-            'most_missed_questions': most_missed,
+            **rollups.session_stats(),
+            'topic_stats': rollups.topic_stats(),
+            'most_missed_questions': rollups.most_missed(),
+            'timeseries': daily_series(AnalyticsFilters.last_days(getattr(settings, 'ANALYTICS_DEFAULT_SERIES_DAYS', 30))),
         })
 
 class AdminUnblockCandidateView(APIView):
@@ -302,6 +358,39 @@ class AdminUnblockCandidateView(APIView):
         
         return Response({'success': True, 'message': 'Candidate unblocked and can take interview again.'})
 
+class AdminBulkCandidatesView(APIView):
+    """
+    Unblock, block or remove many candidates at once.
+
+    Body: {"action": "unblock" | "block" | "remove"} plus either "ids": [...] or
+    "filter": {...} with the same keys as the admin candidate list's query params.
+    """
+    permission_classes = [permissions.IsAuthenticated]
+
+    def post(self, request):
+        if request.user.role != 'admin':
+            return Response({'error': 'Not authorized.'}, status=403)
+
+        action = request.data.get('action')
+        if action not in CANDIDATE_ACTIONS:
+            return Response({'error': f"action must be one of: {', '.join(CANDIDATE_ACTIONS)}."}, status=400)
+        ids, filters = request.data.get('ids'), request.data.get('filter')
+        if (ids is None) == (filters is None):
+            return Response({'error': 'Provide either ids or filter.'}, status=400)
+
+        candidates = User.objects.filter(role='candidate')  # type: ignore[attr-defined]
+        if ids is not None:
+            if not isinstance(ids, list) or not all(isinstance(pk, int) and not isinstance(pk, bool) for pk in ids):
+                return Response({'error': 'ids must be a list of candidate ids.'}, status=400)
+            candidates = candidates.filter(pk__in=ids)
+        else:
+            if not isinstance(filters, dict):
+                return Response({'error': 'filter must be an object.'}, status=400)
+            candidates = filter_candidates(candidates, filters)
+
+        counts = apply_candidate_action(action, candidates)
+        return Response({'success': True, 'action': action, **counts})
+
 class AdminRemoveCandidateView(APIView):
     permission_classes = [permissions.IsAuthenticated]
 
@@ -314,8 +403,13 @@ class AdminRemoveCandidateView(APIView):
             return Response({'error': 'Candidate not found.'}, status=404)
         # Delete all interview sessions and related session questions for this candidate
         sessions = InterviewSession.objects.filter(user=candidate)  # type: ignore[attr-defined]
-        SessionQuestion.objects.filter(session__in=sessions).delete()  # type: ignore[attr-defined]
-        sessions.delete()
+        session_questions = SessionQuestion.objects.filter(session__in=sessions)  # type: ignore[attr-defined]
+        with transaction.atomic():
+            bump_version(*(f'session:{pk}' for pk in sessions.values_list('pk', flat=True)))
+            rollups.forget_session_questions(session_questions)
+            rollups.forget_sessions(sessions)
+            session_questions.delete()
+            sessions.delete()
         # After removal, block the candidate until admin unblocks
         candidate.has_completed_interview = False  # type: ignore[assignment]
         candidate.is_blocked_from_interview = True  # type: ignore[assignment]
@@ -0,0 +1,167 @@
+"""
+Streaming CSV importer for the question bank.
+
+The upload is decoded incrementally and flows through a generator pipeline
+(read -> validate -> batch), so memory stays flat however large the file is.
+Valid rows are written with bulk_create, one transaction per batch.
+"""
+import csv
+import io
+from itertools import islice
+from typing import Callable, Iterable, Iterator, List, Optional, Tuple
+
+from django.conf import settings
+from django.db import transaction
+
+from .models import Question
+from .signals import bank_changed
+
+REQUIRED_FIELDS = ['text', 'topic', 'difficulty', 'time_required']
+# Optional column: scoring keywords separated by ';'
+KEYWORD_SEPARATOR = ';'
+DIFFICULTIES = ['easy', 'medium', 'hard']
+# Errors echoed back to the client; the rest are only counted
+MAX_REPORTED_ERRORS = 10
+
+
+class ImportAborted(Exception):
+    """The file could not be read to the end; `result` covers the batches already committed."""
+
+    def __init__(self, message: str, result: 'ImportResult'):
+        super().__init__(message)
+        self.result = result
+
+
+class ImportResult:
+    def __init__(self):
+        self.created = 0
+        self.total_rows = 0
+        self.error_count = 0
+        self.errors: List[str] = []
+
+    def add_error(self, message: str):
+        self.error_count += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append(message)
+
+    def as_response(self) -> dict:
+        response_data = {
+            'success': True,
+            'created': self.created,
+            'total_rows_processed': self.total_rows,
+        }
+        if self.error_count:
+            response_data['errors'] = list(self.errors)
+            if self.error_count > MAX_REPORTED_ERRORS:
+                response_data['errors'].append(f"... and {self.error_count - MAX_REPORTED_ERRORS} more errors")
+        return response_data
+
+
+def read_rows(fileobj, encoding: str = 'utf-8') -> Iterator[Tuple[int, dict]]:
+    """Yield (row_num, row) from a binary CSV stream; row_num counts the header as row 1."""
+    text = io.TextIOWrapper(fileobj, encoding=encoding, newline='')
+    try:
+        for row_num, row in enumerate(csv.DictReader(text), start=2):
+            yield row_num, row
+    finally:
+        # Don't let the wrapper close the caller's file
+        text.detach()
+
+
+def validate_rows(rows: Iterable[Tuple[int, dict]]) -> Iterator[Tuple[int, Optional[Question], Optional[str]]]:
+    """Yield (row_num, question, None) for valid rows and (row_num, None, error) otherwise."""
+    for row_num, row in rows:
+        missing_fields = [field for field in REQUIRED_FIELDS if not row.get(field)]
+        if missing_fields:
+            yield row_num, None, f"Row {row_num}: Missing fields: {', '.join(missing_fields)}"
+            continue
+
+        topic_length = Question._meta.get_field('topic').max_length
+        if len(row['topic'].strip()) > topic_length:
+            yield row_num, None, f"Row {row_num}: topic must be at most {topic_length} characters"
+            continue
+
+        if row['difficulty'] not in DIFFICULTIES:
+            yield row_num, None, f"Row {row_num}: Invalid difficulty '{row['difficulty']}'. Must be easy, medium, or hard"
+            continue
+
+        try:
+            time_required = int(row['time_required'])
+        except ValueError:
+            yield row_num, None, f"Row {row_num}: time_required must be a number"
+            continue
+        if time_required <= 0:
+            yield row_num, None, f"Row {row_num}: time_required must be positive"
+            continue
+
+        yield row_num, Question(
+            text=row['text'].strip(),
+            topic=row['topic'].strip(),
+            difficulty=row['difficulty'].lower(),
+            time_required=time_required,
+            keywords=[k.strip() for k in (row.get('keywords') or '').split(KEYWORD_SEPARATOR) if k.strip()],
+        ), None
+
+
+def import_questions(fileobj, batch_size: Optional[int] = None,
+                     progress: Optional[Callable[[ImportResult], None]] = None,
+                     skip: int = 0, result: Optional[ImportResult] = None) -> ImportResult:
+    """
+    Import questions from a binary CSV stream.
+
+    `progress` is called with the running result after every batch, in the same
+    transaction as the batch's insert, so whatever it records matches what was
+    committed. To resume an interrupted import, pass the rows already processed as
+    `skip` and the result so far as `result`.
+
+    Batches commit as the file streams in, so a decoding or CSV error partway
+    through raises ImportAborted carrying the result of the batches already written.
+    """
+    batch_size = batch_size or getattr(settings, 'QUESTION_IMPORT_BATCH_SIZE', 1000)
+    result = result or ImportResult()
+    validated = validate_rows(islice(read_rows(fileobj), skip, None))
+    try:
+        while True:
+            try:
+                chunk = list(islice(validated, batch_size))
+            except (UnicodeDecodeError, csv.Error) as e:
+                raise ImportAborted(str(e), result) from e
+            if not chunk:
+                break
+            result.total_rows += len(chunk)
+            batch: List[Tuple[int, Question]] = []
+            for row_num, question, error in chunk:
+                if error:
+                    result.add_error(error)
+                else:
+                    batch.append((row_num, question))  # type: ignore[arg-type]
+            with transaction.atomic():
+                _write_batch(batch, result)
+                if progress:
+                    progress(result)
+    finally:
+        if result.created:
+            # bulk_create doesn't send post_save
+            bank_changed()
+    return result
+
+
+def _write_batch(batch: List[Tuple[int, Question]], result: ImportResult):
+    if not batch:
+        return
+    try:
+        with transaction.atomic():
+            Question.objects.bulk_create([question for _, question in batch])  # type: ignore[attr-defined]
+    except Exception:
+        # Some row was rejected by the database: insert the batch row by row so only
+        # the offending rows are reported
+        for row_num, question in batch:
+            try:
+                with transaction.atomic():
+                    Question.objects.bulk_create([question])  # type: ignore[attr-defined]
+            except Exception as e:
+                result.add_error(f"Row {row_num}: {str(e)}")
+            else:
+                result.created += 1
+        return
+    result.created += len(batch)
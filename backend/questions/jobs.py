@@ -0,0 +1,145 @@
+"""
+Background CSV imports.
+
+ImportJob rows are the queue: a worker claims the oldest queued job with a
+conditional UPDATE, so any number of worker threads (inside the web process) or
+`manage.py run_import_worker` processes can drain it without a broker.
+
+Workers heartbeat after every batch, recording progress in the batch's own
+transaction. A running job whose heartbeat is older than
+QUESTION_IMPORT_STALE_SECONDS lost its worker. requeue_stale_jobs() puts it back
+on the queue, and the next run resumes after the last committed batch. Should
+the old worker still be alive, its next heartbeat finds the job claimed again and
+it stops (see run_job).
+"""
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from typing import Optional
+
+from django.conf import settings
+from django.db import close_old_connections, transaction
+from django.db.models import F, Q, Value
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from .importer import ImportResult, import_questions
+from .models import ImportJob
+
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+
+def enqueue_import(file, user, batch_size: Optional[int] = None) -> ImportJob:
+    """Store the upload, queue a job for it and wake the in-process workers once committed."""
+    job = ImportJob(created_by_id=user.id, batch_size=batch_size)
+    job.file.save(file.name, file, save=False)
+    job.save()
+    if getattr(settings, 'QUESTION_IMPORT_RUN_IN_PROCESS', True):
+        transaction.on_commit(_dispatch)
+    return job
+
+
+def requeue_stale_jobs() -> int:
+    """Requeue running jobs whose worker stopped heartbeating, or fail them after too many attempts."""
+    cutoff = timezone.now() - timedelta(seconds=getattr(settings, 'QUESTION_IMPORT_STALE_SECONDS', 300))
+    stale = ImportJob.objects.filter(  # type: ignore[attr-defined]
+        Q(heartbeat_at__lt=cutoff) | Q(heartbeat_at__isnull=True, started_at__lt=cutoff), status='running',
+    )
+    max_attempts = getattr(settings, 'QUESTION_IMPORT_MAX_ATTEMPTS', 3)
+    stale.filter(attempts__gte=max_attempts).update(
+        status='failed', error='Import worker stopped responding.', finished_at=timezone.now(),
+    )
+    return stale.filter(attempts__lt=max_attempts).update(status='queued')
+
+
+def recover_stale_jobs():
+    """requeue_stale_jobs(), then wake the in-process workers if anything was requeued."""
+    if requeue_stale_jobs() and getattr(settings, 'QUESTION_IMPORT_RUN_IN_PROCESS', True):
+        _dispatch()
+
+
+def claim_next_job() -> Optional[ImportJob]:
+    requeue_stale_jobs()
+    while True:
+        job_id = (
+            ImportJob.objects.filter(status='queued')  # type: ignore[attr-defined]
+            .order_by('created_at', 'pk').values_list('pk', flat=True).first()
+        )
+        if job_id is None:
+            return None
+        now = timezone.now()
+        claimed = ImportJob.objects.filter(pk=job_id, status='queued').update(  # type: ignore[attr-defined]
+            status='running', started_at=Coalesce('started_at', Value(now)), heartbeat_at=now, attempts=F('attempts') + 1,
+        )
+        if claimed:
+            return ImportJob.objects.get(pk=job_id)  # type: ignore[attr-defined]
+        # Another worker got there first; try the next one
+
+
+class JobLost(Exception):
+    """The job was requeued and claimed again while this worker was still running it."""
+
+
+def run_job(job: ImportJob):
+    """
+    Run a claimed job. Every update is fenced on the claim (status='running' and the
+    attempts value it set): once the job has been requeued, this worker's next
+    progress update matches nothing, so it rolls back that batch and stops.
+    """
+    claim = ImportJob.objects.filter(pk=job.pk, status='running', attempts=job.attempts)  # type: ignore[attr-defined]
+
+    def progress(result: ImportResult):
+        updated = claim.update(
+            rows_done=result.total_rows, rows_failed=result.error_count, created=result.created,
+            errors=result.errors, heartbeat_at=timezone.now(),
+        )
+        if not updated:
+            raise JobLost
+
+    # A requeued job carries on from its last committed batch
+    resumed = ImportResult()
+    resumed.total_rows, resumed.error_count, resumed.created = job.rows_done, job.rows_failed, job.created
+    resumed.errors = list(job.errors)
+    try:
+        with job.file.open('rb') as f:
+            result = import_questions(f, batch_size=job.batch_size, progress=progress,
+                                      skip=job.rows_done, result=resumed)
+    except JobLost:
+        return
+    except Exception as e:
+        claim.update(status='failed', error=f'Error processing file: {str(e)}', finished_at=timezone.now())
+        return
+    claim.update(
+        status='done', rows_done=result.total_rows, rows_failed=result.error_count,
+        created=result.created, errors=result.as_response().get('errors', []), finished_at=timezone.now(),
+    )
+
+
+def process_queue() -> int:
+    """Run queued jobs until the queue is empty; returns how many were processed."""
+    processed = 0
+    while True:
+        job = claim_next_job()
+        if job is None:
+            return processed
+        run_job(job)
+        processed += 1
+
+
+def _drain():
+    try:
+        process_queue()
+    finally:
+        close_old_connections()
+
+
+def _dispatch():
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=getattr(settings, 'QUESTION_IMPORT_WORKERS', 2),
+                thread_name_prefix='question-import',
+            )
+    _executor.submit(_drain)
@@ -0,0 +1,22 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from questions.jobs import process_queue
+
+
+class Command(BaseCommand):
+    help = 'Process queued CSV question imports outside the web process.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--once', action='store_true', help='Exit once the queue is empty.')
+        parser.add_argument('--interval', type=float, default=2.0, help='Seconds between polls of an empty queue.')
+
+    def handle(self, *args, **options):
+        while True:
+            processed = process_queue()
+            if processed:
+                self.stdout.write(f'Processed {processed} import job(s).')
+            if options['once']:
+                break
+            time.sleep(options['interval'])
@@ -0,0 +1,17 @@
+# Generated by Django 4.2.7 on 2026-10-18 15:53
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('questions', '0002_importjob'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='question',
+            index=models.Index(fields=['topic', 'difficulty'], name='question_topic_difficulty_idx'),
+        ),
+    ]
@@ -0,0 +1,22 @@
+# Generated by Django 4.2.7 on 2026-10-18 16:07
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('questions', '0003_query_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='question',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True),
+        ),
+        migrations.AddIndex(
+            model_name='question',
+            index=models.Index(fields=['updated_at'], name='question_updated_at_idx'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 4.2.7 on 2026-10-18 16:14
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('questions', '0004_question_updated_at'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='question',
+            name='keywords',
+            field=models.JSONField(blank=True, default=list),
+        ),
+    ]
@@ -1,4 +1,6 @@
+from django.conf import settings
 from django.db import models
+from django.utils import timezone
 
 # Create your models here.
 
@@ -12,6 +14,55 @@ class Question(models.Model):
     topic = models.CharField(max_length=100)
     difficulty = models.CharField(max_length=20, choices=DIFFICULTY_CHOICES)
     time_required = models.IntegerField(default=60)  # seconds
+    # Terms a good answer should mention; used by interview.scoring.KeywordScorer
+    keywords = models.JSONField(default=list, blank=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['topic', 'difficulty'], name='question_topic_difficulty_idx'),
+            models.Index(fields=['updated_at'], name='question_updated_at_idx'),
+        ]
 
     def __str__(self):
         return f"{self.topic} - {self.difficulty}: {str(self.text)[:40]}"
+
+class ImportJob(models.Model):
+    """A queued CSV import; the table doubles as the work queue for questions.jobs."""
+    STATUS_CHOICES = (
+        ('queued', 'Queued'),
+        ('running', 'Running'),
+        ('done', 'Done'),
+        ('failed', 'Failed'),
+    )
+    file = models.FileField(upload_to='imports/')
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='queued')
+    created_by = models.ForeignKey(settings.AUTH_USER_MODEL, null=True, blank=True, on_delete=models.SET_NULL)
+    batch_size = models.IntegerField(null=True, blank=True)
+    rows_done = models.IntegerField(default=0)
+    rows_failed = models.IntegerField(default=0)
+    created = models.IntegerField(default=0)
+    errors = models.JSONField(default=list, blank=True)
+    error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+    # Touched on claim and after every batch; see questions.jobs.requeue_stale_jobs
+    heartbeat_at = models.DateTimeField(null=True, blank=True)
+    attempts = models.IntegerField(default=0)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['status', 'created_at'], name='importjob_queue_idx'),
+        ]
+
+    def __str__(self):
+        return f"Import {self.pk} ({self.status})"
+
+    @property
+    def throughput(self) -> float:
+        """Rows processed per second since the job started."""
+        if not self.started_at:
+            return 0.0
+        elapsed = ((self.finished_at or timezone.now()) - self.started_at).total_seconds()
+        return round(self.rows_done / elapsed, 1) if elapsed > 0 else 0.0
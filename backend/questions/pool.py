@@ -0,0 +1,87 @@
+import threading
+import time
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from django.conf import settings
+from django.db.models import Count, Max
+
+from backend.caching import get_version
+from .models import Question
+
+BucketKey = Tuple[str, str]
+
+
+class QuestionPool:
+    """Read-only snapshot of the question bank grouped by (topic, difficulty)."""
+
+    def __init__(self, questions: Iterable[Question], version: Optional[str] = None):
+        # The 'questions' cache version and bank_fingerprint() the snapshot was loaded
+        # under, and when that was last confirmed (see get_question_pool)
+        self.version = version
+        self.fingerprint: Optional[Tuple[int, Optional[datetime]]] = None
+        self.checked_at = time.monotonic()
+        self.questions: List[Question] = list(questions)
+        self.buckets: Dict[BucketKey, List[Question]] = {}
+        self.bucket_time: Dict[BucketKey, int] = {}
+        self.bucket_min_time: Dict[BucketKey, int] = {}
+        for q in self.questions:
+            key = (q.topic, q.difficulty)
+            self.buckets.setdefault(key, []).append(q)
+            self.bucket_time[key] = self.bucket_time.get(key, 0) + q.time_required  # type: ignore[operator]
+            if key not in self.bucket_min_time or q.time_required < self.bucket_min_time[key]:  # type: ignore[operator]
+                self.bucket_min_time[key] = q.time_required  # type: ignore[assignment]
+        self.min_time = min(self.bucket_min_time.values(), default=0)
+
+    def __len__(self):
+        return len(self.questions)
+
+    def bucket(self, topic: str, difficulty: str) -> List[Question]:
+        return self.buckets.get((topic, difficulty), [])
+
+
+_pool: Optional[QuestionPool] = None
+_lock = threading.Lock()
+
+
+def bank_fingerprint() -> Tuple[int, Optional[datetime]]:
+    """(count, latest updated_at) of the question bank: one aggregate over indexed columns."""
+    row = Question.objects.aggregate(count=Count('pk'), latest=Max('updated_at'))  # type: ignore[attr-defined]
+    return row['count'], row['latest']
+
+
+def get_question_pool() -> QuestionPool:
+    """
+    Return the process-local pool, reloading it when the bank has changed.
+
+    bank_changed() bumps the shared 'questions' cache version, which a shared cache
+    (CACHE_URL) carries to every process. Changes the version doesn't reach this
+    process with (a per-process cache, other workers, the import worker, admin
+    commands) are caught by comparing bank_fingerprint(), at most every
+    QUESTION_POOL_CHECK_SECONDS.
+    """
+    global _pool
+    version = get_version('questions')
+    interval = getattr(settings, 'QUESTION_POOL_CHECK_SECONDS', 10)
+    pool = _pool
+    if pool is not None and pool.version == version and time.monotonic() - pool.checked_at < interval:
+        return pool
+    with _lock:
+        pool = _pool
+        if pool is not None and pool.version == version and time.monotonic() - pool.checked_at < interval:
+            return pool
+        # Read before the query: a change during the load forces another reload
+        fingerprint = bank_fingerprint()
+        if pool is None or pool.version != version or pool.fingerprint != fingerprint:
+            pool = QuestionPool(Question.objects.all(), version)  # type: ignore[attr-defined]
+            pool.fingerprint = fingerprint
+            _pool = pool
+        pool.checked_at = time.monotonic()
+        return pool
+
+
+def invalidate_question_pool():
+    """Drop the cached pool; the next call to get_question_pool() reloads it."""
+    global _pool
+    with _lock:
+        _pool = None
@@ -4,4 +4,13 @@ from .models import Question
 class QuestionSerializer(serializers.ModelSerializer):
     class Meta:
         model = Question
-        fields = '__all__' 
\ No newline at end of file
+        fields = ['id', 'text', 'topic', 'difficulty', 'time_required', 'keywords']
+        extra_kwargs = {'keywords': {'required': False}}
+
+    def to_representation(self, instance):
+        data = super().to_representation(instance)
+        # Keywords are the answer key: only admins see them (payloads built without a request never do)
+        request = self.context.get('request')
+        if request is None or getattr(request.user, 'role', None) != 'admin':
+            data.pop('keywords')
+        return data
@@ -0,0 +1,25 @@
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import Signal, receiver
+
+from backend.caching import bump_version
+from .models import Question
+from .pool import invalidate_question_pool
+
+# Sent by bank_changed() for caches of the bank kept outside this app
+question_bank_changed = Signal()
+
+
+def bank_changed():
+    """Invalidate everything derived from the question bank."""
+    invalidate_question_pool()
+    # Readers in other threads may have reloaded before the write committed
+    transaction.on_commit(invalidate_question_pool)
+    bump_version('questions')
+    question_bank_changed.send(sender=Question)
+
+
+@receiver(post_save, sender=Question)
+@receiver(post_delete, sender=Question)
+def question_changed(sender, **kwargs):
+    bank_changed()
@@ -1,3 +1,205 @@
-from django.test import TestCase
+import io
+import tempfile
+from datetime import timedelta
+from unittest import mock
 
-# Create your tests here.
+from django.core.cache import cache
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import IntegrityError
+from django.db.models import F
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from backend.caching import bump_version
+from users.models import User
+from .importer import import_questions
+from .jobs import claim_next_job, process_queue, requeue_stale_jobs, run_job
+from .models import ImportJob, Question
+from .pool import get_question_pool
+
+
+class QuestionPoolTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        Question.objects.create(text='Q1', topic='Personal', difficulty='easy', time_required=60)
+
+    def test_reloads_when_shared_version_changes(self):
+        pool = get_question_pool()
+        self.assertIs(get_question_pool(), pool)
+
+        # Written as another process would: no signals reach this process's pool
+        Question.objects.bulk_create([Question(text='Q2', topic='Personal', difficulty='easy', time_required=60)])
+        self.assertIs(get_question_pool(), pool)
+
+        bump_version('questions')
+        reloaded = get_question_pool()
+        self.assertIsNot(reloaded, pool)
+        self.assertEqual(len(reloaded), 2)
+
+    def test_reloads_when_the_database_changes_without_a_version_bump(self):
+        with override_settings(QUESTION_POOL_CHECK_SECONDS=0):
+            pool = get_question_pool()
+            self.assertIs(get_question_pool(), pool)  # unchanged bank: the same snapshot
+            Question.objects.bulk_create([Question(text='Q2', topic='Personal', difficulty='easy', time_required=60)])
+            self.assertEqual(len(get_question_pool()), 2)
+            Question.objects.filter(text='Q1')._raw_delete('default')
+            self.assertEqual([q.text for q in get_question_pool().questions], ['Q2'])
+
+
+class ImporterTests(TestCase):
+    def csv(self, *rows):
+        return io.BytesIO(('text,topic,difficulty,time_required\n' + ''.join(f'{row}\n' for row in rows)).encode())
+
+    def test_row_errors_match_the_original_view(self):
+        f = self.csv('Q1,Personal,easy,60', ',Personal,easy,60', 'Q3,Personal,trivial,60',
+                     'Q4,Personal,easy,soon', 'Q5,Personal,easy,0', *['bad,row'] * 8)
+        response = import_questions(f).as_response()
+        self.assertEqual(response['created'], 1)
+        self.assertEqual(response['total_rows_processed'], 13)
+        self.assertEqual(response['errors'][:4], [
+            'Row 3: Missing fields: text',
+            "Row 4: Invalid difficulty 'trivial'. Must be easy, medium, or hard",
+            'Row 5: time_required must be a number',
+            'Row 6: time_required must be positive',
+        ])
+        self.assertEqual(response['errors'][4], 'Row 7: Missing fields: difficulty, time_required')
+        self.assertEqual(len(response['errors']), 11)
+        self.assertEqual(response['errors'][-1], '... and 2 more errors')
+        self.assertFalse(f.closed)
+
+    @override_settings(QUESTION_IMPORT_BATCH_SIZE=2)
+    def test_batches_and_partial_failure(self):
+        totals = []
+        real_bulk_create = Question.objects.bulk_create
+
+        def bulk_create(objs, *args, **kwargs):
+            if any(q.text == 'Q3' for q in objs):
+                raise IntegrityError('row rejected')
+            return real_bulk_create(objs, *args, **kwargs)
+
+        with mock.patch.object(Question.objects, 'bulk_create', side_effect=bulk_create) as insert:
+            result = import_questions(self.csv(*[f'Q{i},Personal,easy,60' for i in range(1, 6)]),
+                                      progress=lambda r: totals.append((r.total_rows, r.created)))
+        # Three batches, the failed one retried row by row
+        self.assertEqual(insert.call_count, 5)
+        self.assertEqual(totals, [(2, 2), (4, 3), (5, 4)])
+        self.assertEqual(result.errors, ['Row 4: row rejected'])
+        self.assertEqual(sorted(Question.objects.values_list('text', flat=True)), ['Q1', 'Q2', 'Q4', 'Q5'])
+
+    def test_overlong_topic_is_a_row_error(self):
+        result = import_questions(self.csv(f"Q1,{'t' * 101},easy,60", 'Q2,Personal,easy,60'))
+        self.assertEqual(result.errors, ['Row 2: topic must be at most 100 characters'])
+        self.assertEqual(result.created, 1)
+
+    def test_error_partway_through_reports_committed_rows(self):
+        admin = User.objects.create_user('admin', 'admin@example.com', 'pw', role='admin')
+        client = APIClient()
+        client.force_authenticate(admin)
+        # Invalid UTF-8 well past the first decoded chunk, so some batches are already saved
+        rows = ''.join(f'Question number {i},Personal,easy,60\n' for i in range(400))
+        data = ('text,topic,difficulty,time_required\n' + rows).encode() + b'\xff,Personal,easy,60\n'
+        upload = SimpleUploadedFile('questions.csv', data, content_type='text/csv')
+        response = client.post('/api/questions/bulk_import/?batch_size=50', {'file': upload})
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(response.data['success'])
+        self.assertTrue(response.data['error'].startswith('Error processing file: '))
+        self.assertGreater(response.data['created'], 0)
+        self.assertEqual(response.data['created'], Question.objects.count())
+        self.assertEqual(response.data['total_rows_processed'], response.data['created'])
+
+
+@override_settings(QUESTION_IMPORT_RUN_IN_PROCESS=False, QUESTION_IMPORT_BATCH_SIZE=2)
+class ImportJobTests(TestCase):
+    CSV = (
+        'text,topic,difficulty,time_required\n'
+        'Q1,Personal,easy,60\n'
+        'Q2,Personal,easy,60\n'
+        'Q3,Technical,medium,90\n'
+        'Q4,Technical,hard,soon\n'
+    )
+
+    def setUp(self):
+        media = tempfile.TemporaryDirectory()
+        self.addCleanup(media.cleanup)
+        self.enterContext(override_settings(MEDIA_ROOT=media.name))
+        self.admin = User.objects.create_user('admin', 'admin@example.com', 'pw', role='admin')
+        self.client = APIClient()
+        self.client.force_authenticate(self.admin)
+
+    def enqueue(self):
+        upload = SimpleUploadedFile('questions.csv', self.CSV.encode(), content_type='text/csv')
+        response = self.client.post('/api/questions/bulk_import/?async=1', {'file': upload})
+        self.assertEqual(response.status_code, 202)
+        return response.data['job_id']
+
+    def status(self, job_id):
+        return self.client.get(f'/api/questions/import_jobs/{job_id}/').data
+
+    def test_enqueue_run_done(self):
+        job_id = self.enqueue()
+        self.assertEqual(self.status(job_id)['status'], 'queued')
+
+        seen = []
+
+        def observed(f, progress, **kwargs):
+            def report(result):
+                progress(result)
+                seen.append(ImportJob.objects.values_list('status', 'rows_done').get(pk=job_id))
+            return import_questions(f, progress=report, **kwargs)
+
+        with mock.patch('questions.jobs.import_questions', observed):
+            self.assertEqual(process_queue(), 1)
+        self.assertEqual(seen, [('running', 2), ('running', 4)])
+
+        status = self.status(job_id)
+        self.assertEqual((status['status'], status['rows_done'], status['created'], status['rows_failed']), ('done', 4, 3, 1))
+        self.assertEqual(status['errors'], ['Row 5: time_required must be a number'])
+
+    def test_unreadable_file_fails(self):
+        job_id = self.enqueue()
+        job = ImportJob.objects.get(pk=job_id)
+        job.file.delete(save=False)
+        process_queue()
+        status = self.status(job_id)
+        self.assertEqual(status['status'], 'failed')
+        self.assertTrue(status['error'].startswith('Error processing file:'))
+
+    def test_stale_job_is_resumed_after_last_batch(self):
+        job_id = self.enqueue()
+        claim_next_job()
+        # The worker committed its first batch, then died
+        Question.objects.create(text='Q1', topic='Personal', difficulty='easy', time_required=60)
+        Question.objects.create(text='Q2', topic='Personal', difficulty='easy', time_required=60)
+        ImportJob.objects.filter(pk=job_id).update(rows_done=2, created=2, heartbeat_at=timezone.now() - timedelta(hours=1))
+
+        self.assertEqual(self.status(job_id)['status'], 'queued')
+        process_queue()
+        job = ImportJob.objects.get(pk=job_id)
+        self.assertEqual((job.status, job.attempts, job.rows_done, job.created), ('done', 2, 4, 3))
+        self.assertEqual(sorted(Question.objects.values_list('text', flat=True)), ['Q1', 'Q2', 'Q3'])
+
+    def test_requeued_job_stops_its_old_worker(self):
+        job_id = self.enqueue()
+        job = claim_next_job()
+        # The job was requeued and claimed by another worker while this one was slow
+        ImportJob.objects.filter(pk=job_id).update(attempts=F('attempts') + 1)
+        run_job(job)
+        self.assertFalse(Question.objects.exists())  # the first batch was rolled back
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.rows_done), ('running', 0))
+
+    def test_batch_size_is_capped(self):
+        upload = SimpleUploadedFile('questions.csv', self.CSV.encode(), content_type='text/csv')
+        with override_settings(QUESTION_IMPORT_MAX_BATCH_SIZE=100):
+            response = self.client.post('/api/questions/bulk_import/?async=1&batch_size=101', {'file': upload})
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(ImportJob.objects.exists())
+
+    @override_settings(QUESTION_IMPORT_MAX_ATTEMPTS=1)
+    def test_stale_job_fails_after_max_attempts(self):
+        job_id = self.enqueue()
+        claim_next_job()
+        ImportJob.objects.filter(pk=job_id).update(heartbeat_at=timezone.now() - timedelta(hours=1))
+        self.assertEqual(requeue_stale_jobs(), 0)
+        self.assertEqual(self.status(job_id)['status'], 'failed')
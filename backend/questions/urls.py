@@ -1,9 +1,10 @@
 from django.urls import path
 from rest_framework.routers import DefaultRouter
-from .views import QuestionViewSet, BulkImportQuestionsView
+from .views import QuestionViewSet, BulkImportQuestionsView, ImportJobStatusView
 
 urlpatterns = [
     path('bulk_import/', BulkImportQuestionsView.as_view(), name='bulk-import-questions'),
+    path('import_jobs/<int:job_id>/', ImportJobStatusView.as_view(), name='import-job-status'),
 ]
 
 router = DefaultRouter()
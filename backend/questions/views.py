@@ -1,14 +1,16 @@
+from django.conf import settings
 from django.shortcuts import render
 from rest_framework import viewsets, permissions
-from .models import Question
+from .models import ImportJob, Question
 from .serializers import QuestionSerializer
+from .importer import ImportAborted, import_questions
+from .jobs import enqueue_import, recover_stale_jobs
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.response import Response
 from rest_framework import status
 from users.models import User
 from rest_framework.views import APIView
-import csv
-import io
+from backend.caching import cached_response, get_version
 
 # Create your views here.
 
@@ -23,6 +25,19 @@ class QuestionViewSet(viewsets.ModelViewSet):
     serializer_class = QuestionSerializer
     permission_classes = [IsAdminOrReadOnly]
 
+    # Reads are cached per URL and audience (admins also see keywords); Question writes bump the 'questions' version
+    def cache_key(self, request):
+        audience = 'admin' if getattr(request.user, 'role', None) == 'admin' else 'public'
+        return f"questions:{get_version('questions')}:{audience}:{request.get_full_path()}"
+
+    def list(self, request, *args, **kwargs):
+        key = self.cache_key(request)
+        return cached_response(request, key, lambda: (super(QuestionViewSet, self).list(request, *args, **kwargs).data, None))
+
+    def retrieve(self, request, *args, **kwargs):
+        key = self.cache_key(request)
+        return cached_response(request, key, lambda: (super(QuestionViewSet, self).retrieve(request, *args, **kwargs).data, None))
+
 class BulkImportQuestionsView(APIView):
     permission_classes = [permissions.IsAuthenticated]
 
@@ -41,63 +56,56 @@ class BulkImportQuestionsView(APIView):
         if not file.name.endswith('.csv'):
             return Response({'error': 'Please upload a CSV file.'}, status=status.HTTP_400_BAD_REQUEST)
         
+        batch_size = request.query_params.get('batch_size')
         try:
-            # Read CSV file
-            decoded_file = file.read().decode('utf-8')
-            csv_data = csv.DictReader(io.StringIO(decoded_file))
-            
-            created = 0
-            errors = []
-            
-            for row_num, row in enumerate(csv_data, start=2):  # Start from 2 because row 1 is header
-                try:
-                    # Validate required fields
-                    required_fields = ['text', 'topic', 'difficulty', 'time_required']
-                    missing_fields = [field for field in required_fields if not row.get(field)]
-                    
-                    if missing_fields:
-                        errors.append(f"Row {row_num}: Missing fields: {', '.join(missing_fields)}")
-                        continue
-                    
-                    # Validate difficulty
-                    if row['difficulty'] not in ['easy', 'medium', 'hard']:
-                        errors.append(f"Row {row_num}: Invalid difficulty '{row['difficulty']}'. Must be easy, medium, or hard")
-                        continue
-                    
-                    # Validate time_required
-                    try:
-                        time_required = int(row['time_required'])
-                        if time_required <= 0:
-                            errors.append(f"Row {row_num}: time_required must be positive")
-                            continue
-                    except ValueError:
-                        errors.append(f"Row {row_num}: time_required must be a number")
-                        continue
-                    
-                    # Create question
-                    Question.objects.create(
-                        text=row['text'].strip(),
-                        topic=row['topic'].strip(),
-                        difficulty=row['difficulty'].lower(),
-                        time_required=time_required,
-                    )
-                    created += 1
-                    
-                except Exception as e:
-                    errors.append(f"Row {row_num}: {str(e)}")
-            
-            response_data = {
-                'success': True,
-                'created': created,
-                'total_rows_processed': row_num - 1
-            }
-            
-            if errors:
-                response_data['errors'] = errors[:10]  # Limit to first 10 errors
-                if len(errors) > 10:
-                    response_data['errors'].append(f"... and {len(errors) - 10} more errors")
-            
-            return Response(response_data, status=status.HTTP_200_OK)
+            batch_size = int(batch_size) if batch_size else None
+        except ValueError:
+            batch_size = 0
+        if batch_size is not None and batch_size <= 0:
+            return Response({'error': 'batch_size must be a positive number.'}, status=status.HTTP_400_BAD_REQUEST)
+        max_batch_size = getattr(settings, 'QUESTION_IMPORT_MAX_BATCH_SIZE', 5000)
+        if batch_size is not None and batch_size > max_batch_size:
+            return Response({'error': f'batch_size must be at most {max_batch_size}.'}, status=status.HTTP_400_BAD_REQUEST)
+        
+        # ?async=1 queues the file for a background worker and returns a job id right away
+        if request.query_params.get('async', '').lower() in ('1', 'true', 'yes'):
+            job = enqueue_import(file, request.user, batch_size=batch_size)
+            return Response({'success': True, 'job_id': job.pk, 'status': job.status}, status=status.HTTP_202_ACCEPTED)
+        
+        try:
+            result = import_questions(file, batch_size=batch_size)
+            return Response(result.as_response(), status=status.HTTP_200_OK)
             
+        except ImportAborted as e:
+            # Earlier batches are already saved: report them so a retry can skip those rows
+            return Response({**e.result.as_response(), 'success': False, 'error': f'Error processing file: {str(e)}'},
+                            status=status.HTTP_400_BAD_REQUEST)
         except Exception as e:
             return Response({'error': f'Error processing file: {str(e)}'}, status=status.HTTP_400_BAD_REQUEST)
+
+class ImportJobStatusView(APIView):
+    permission_classes = [permissions.IsAuthenticated]
+
+    def get(self, request, job_id):
+        if request.user.role != 'admin':
+            return Response({'error': 'Admin access required.'}, status=status.HTTP_403_FORBIDDEN)
+        
+        recover_stale_jobs()
+        try:
+            job = ImportJob.objects.get(pk=job_id)  # type: ignore[attr-defined]
+        except ImportJob.DoesNotExist:  # type: ignore[attr-defined]
+            return Response({'error': 'Import job not found.'}, status=status.HTTP_404_NOT_FOUND)
+        
+        return Response({
+            'job_id': job.pk,
+            'status': job.status,
+            'rows_done': job.rows_done,
+            'rows_failed': job.rows_failed,
+            'created': job.created,
+            'throughput': job.throughput,
+            'errors': job.errors,
+            'error': job.error,
+            'created_at': job.created_at,
+            'started_at': job.started_at,
+            'finished_at': job.finished_at,
+        })
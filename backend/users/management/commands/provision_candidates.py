@@ -0,0 +1,23 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from users.provisioning import provision_from_file
+
+
+class Command(BaseCommand):
+    help = 'Create candidate accounts from a CSV or JSON file of username, email and password.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help='A .csv file with a header row, or a .json list of objects.')
+        parser.add_argument('--batch-size', type=int, default=None, help='Accounts per insert (default: USER_PROVISION_BATCH_SIZE).')
+        parser.add_argument('--workers', type=int, default=None,
+                            help='Password-hashing processes (default: USER_PROVISION_WORKERS; 0 hashes in this process).')
+
+    def handle(self, *args, **options):
+        try:
+            with open(options['path'], 'rb') as f:
+                result = provision_from_file(f, options['path'], batch_size=options['batch_size'], workers=options['workers'])
+        except (OSError, ValueError) as e:
+            raise CommandError(str(e))
+        for error in result.as_response().get('errors', []):
+            self.stderr.write(error)
+        self.stdout.write(self.style.SUCCESS(f'Created {result.created} of {result.total_rows} candidates.'))
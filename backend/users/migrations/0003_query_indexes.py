@@ -0,0 +1,17 @@
+# Generated by Django 4.2.7 on 2026-10-18 15:53
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0002_user_has_completed_interview_and_more'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='user',
+            index=models.Index(fields=['role', 'date_joined'], name='user_role_joined_idx'),
+        ),
+    ]
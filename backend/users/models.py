@@ -1,6 +1,9 @@
 from django.contrib.auth.models import AbstractUser
 from django.db import models
 
+# Carried as JWT claims (see users.tokens); changing one revokes outstanding claims
+CLAIM_FIELDS = frozenset({'role', 'has_completed_interview', 'is_blocked_from_interview', 'is_active'})
+
 class User(AbstractUser):
     ROLE_CHOICES = (
         ('candidate', 'Candidate'),
@@ -9,6 +12,22 @@ class User(AbstractUser):
     role = models.CharField(max_length=20, choices=ROLE_CHOICES, default='candidate')
     is_blocked_from_interview = models.BooleanField(default=False)  # type: ignore
     has_completed_interview = models.BooleanField(default=False)  # type: ignore
+    token_version = models.PositiveIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta(AbstractUser.Meta):
+        indexes = [
+            models.Index(fields=['role', 'date_joined'], name='user_role_joined_idx'),
+            models.Index(fields=['role', 'updated_at'], name='user_role_updated_idx'),
+        ]
 
     def __str__(self):
         return self.username
+
+    def save(self, *args, **kwargs):
+        update_fields = kwargs.get('update_fields')
+        if not self._state.adding and (update_fields is None or CLAIM_FIELDS.intersection(update_fields)):
+            self.token_version += 1
+            if update_fields is not None:
+                kwargs['update_fields'] = {*update_fields, 'token_version'}
+        super().save(*args, **kwargs)
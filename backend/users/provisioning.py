@@ -0,0 +1,193 @@
+"""
+Bulk candidate provisioning from CSV or JSON.
+
+Rows have username, email and password. They are validated and checked against
+existing accounts, one query per batch. Passwords are then hashed across a
+process pool, since a PBKDF2 hash costs tens of milliseconds of CPU per user: the
+HTTP view uses one long-lived pool shared by all requests (shared_password_pool),
+`manage.py provision_candidates` starts its own. Users are inserted with
+bulk_create, one transaction per batch, falling back to row-by-row inserts when a
+batch fails. Errors are
+reported per row with questions.importer.ImportResult, like the question importer.
+"""
+import atexit
+import json
+import os
+import threading
+from concurrent.futures import Executor, ProcessPoolExecutor
+from itertools import islice
+from typing import Iterable, Iterator, List, Optional, Tuple
+
+import django
+from django.conf import settings
+from django.contrib.auth.hashers import make_password
+from django.core.exceptions import ValidationError
+from django.core.validators import validate_email
+from django.db import transaction
+
+from questions.importer import ImportResult, read_rows
+from .models import User
+
+REQUIRED_FIELDS = ['username', 'email', 'password']
+
+
+def read_json_rows(fileobj) -> Iterator[Tuple[int, dict]]:
+    """Yield (row_num, row) from a JSON list of objects (or {"candidates": [...]}); row_num is 1-based."""
+    data = json.load(fileobj)
+    if isinstance(data, dict):
+        data = data.get('candidates')
+    if not isinstance(data, list):
+        raise ValueError('Expected a JSON list of candidates.')
+    for row_num, row in enumerate(data, start=1):
+        yield row_num, row if isinstance(row, dict) else {}
+
+
+def _validate(row_num: int, row: dict) -> Tuple[Optional[User], Optional[str]]:
+    missing_fields = [field for field in REQUIRED_FIELDS if not row.get(field)]
+    if missing_fields:
+        return None, f"Row {row_num}: Missing fields: {', '.join(missing_fields)}"
+    user = User(username=str(row['username']).strip(), email=str(row['email']).strip(), role='candidate')
+    for field in ('username', 'email'):
+        max_length = User._meta.get_field(field).max_length
+        if len(getattr(user, field)) > max_length:
+            return None, f"Row {row_num}: {field} must be at most {max_length} characters"
+    try:
+        User.username_validator(user.username)
+        validate_email(user.email)
+    except ValidationError as e:
+        return None, f"Row {row_num}: {e.messages[0]}"
+    user.email = User.objects.normalize_email(user.email)  # type: ignore[attr-defined]
+    user.password = str(row['password'])  # hashed before insert
+    return user, None
+
+
+def _init_worker(settings_module: str):
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', settings_module)
+    django.setup()
+
+
+def password_pool(workers: int) -> Optional[Executor]:
+    """A process pool for make_password, or None to hash in this process (workers=0)."""
+    if workers == 0:
+        return None
+    # Workers may be spawned rather than forked, so they set Django up themselves
+    return ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                               initargs=(os.environ.get('DJANGO_SETTINGS_MODULE', 'backend.settings'),))
+
+
+_shared_pool: Optional[Executor] = None
+_shared_pool_lock = threading.Lock()
+
+
+def shared_password_pool() -> Optional[Executor]:
+    """
+    A USER_PROVISION_WORKERS process pool kept for the life of this process, so
+    requests share its workers instead of starting their own; None when that is 0.
+    """
+    global _shared_pool
+    workers = getattr(settings, 'USER_PROVISION_WORKERS', os.cpu_count() or 1)
+    with _shared_pool_lock:
+        if _shared_pool is None and workers:
+            _shared_pool = password_pool(workers)
+            atexit.register(_shared_pool.shutdown)
+        return _shared_pool
+
+
+def shutdown_shared_pool():
+    global _shared_pool
+    with _shared_pool_lock:
+        if _shared_pool is not None:
+            _shared_pool.shutdown()
+            _shared_pool = None
+
+
+def provision_candidates(rows: Iterable[Tuple[int, dict]], batch_size: Optional[int] = None,
+                         workers: Optional[int] = None, pool: Optional[Executor] = None) -> ImportResult:
+    """
+    Create candidate accounts from (row_num, row) pairs. `workers` defaults to
+    USER_PROVISION_WORKERS; 0 hashes in this process. Pass a `pool` (such as
+    shared_password_pool()) to hash with it rather than a pool started for this call.
+    """
+    batch_size = batch_size or getattr(settings, 'USER_PROVISION_BATCH_SIZE', 1000)
+    if workers is None:
+        workers = getattr(settings, 'USER_PROVISION_WORKERS', os.cpu_count() or 1)
+    result = ImportResult()
+    seen = set()
+    rows = iter(rows)
+    own_pool = pool is None
+    if own_pool:
+        pool = password_pool(workers)
+    try:
+        while True:
+            chunk = list(islice(rows, batch_size))
+            if not chunk:
+                break
+            result.total_rows += len(chunk)
+            batch: List[Tuple[int, User]] = []
+            errors: List[Tuple[int, str]] = []
+            for row_num, row in chunk:
+                user, error = _validate(row_num, row)
+                if error:
+                    errors.append((row_num, error))
+                elif user.username in seen:  # type: ignore[union-attr]
+                    errors.append((row_num, f"Row {row_num}: Duplicate username '{user.username}' in file"))  # type: ignore[union-attr]
+                else:
+                    seen.add(user.username)  # type: ignore[union-attr]
+                    batch.append((row_num, user))  # type: ignore[arg-type]
+            batch = _drop_existing(batch, errors)
+            for _, error in sorted(errors):
+                result.add_error(error)
+            _hash_passwords([user for _, user in batch], pool, workers)
+            _write_batch(batch, result)
+    finally:
+        if own_pool and pool is not None:
+            pool.shutdown()
+    return result
+
+
+def _drop_existing(batch: List[Tuple[int, User]], errors: List[Tuple[int, str]]) -> List[Tuple[int, User]]:
+    existing = set(User.objects.filter(  # type: ignore[attr-defined]
+        username__in=[user.username for _, user in batch],
+    ).values_list('username', flat=True)) if batch else set()
+    for row_num, user in batch:
+        if user.username in existing:
+            errors.append((row_num, f"Row {row_num}: Username '{user.username}' already exists"))
+    return [(row_num, user) for row_num, user in batch if user.username not in existing]
+
+
+def _hash_passwords(users: List[User], pool: Optional[Executor], workers: int):
+    passwords = [user.password for user in users]
+    if pool is None:
+        hashed: Iterable[str] = map(make_password, passwords)
+    else:
+        hashed = pool.map(make_password, passwords, chunksize=max(1, len(passwords) // (max(workers, 1) * 4)))
+    for user, password in zip(users, hashed):
+        user.password = password
+
+
+def _write_batch(batch: List[Tuple[int, User]], result: ImportResult):
+    if not batch:
+        return
+    try:
+        with transaction.atomic():
+            User.objects.bulk_create([user for _, user in batch])  # type: ignore[attr-defined]
+    except Exception:
+        # Some row was rejected (say a username taken since _drop_existing ran): insert
+        # the batch row by row so only the offending rows are reported
+        for row_num, user in batch:
+            try:
+                with transaction.atomic():
+                    User.objects.bulk_create([user])  # type: ignore[attr-defined]
+            except Exception as e:
+                result.add_error(f"Row {row_num}: {str(e)}")
+            else:
+                result.created += 1
+        return
+    result.created += len(batch)
+
+
+def provision_from_file(fileobj, name: str, **kwargs) -> ImportResult:
+    """Provision from an uploaded or opened binary file; the format follows the .csv/.json extension."""
+    if name.lower().endswith('.json'):
+        return provision_candidates(read_json_rows(fileobj), **kwargs)
+    return provision_candidates(read_rows(fileobj), **kwargs)
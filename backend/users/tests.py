@@ -1,3 +1,166 @@
-from django.test import TestCase
+import json
+import os
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from unittest import mock
 
-# Create your tests here.
+from django.core.cache import cache
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.db import connection
+from django.db.models import F
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+from interview.models import InterviewSession
+from questions.models import Question
+from .models import User
+from .provisioning import provision_candidates, shared_password_pool, shutdown_shared_pool
+
+
+@override_settings(JWT_CLAIMS_CACHE_VERSIONS=True)
+class ClaimsAuthenticationTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.candidate = User.objects.create_user('candidate', 'candidate@example.com', 'pw')
+        self.admin = User.objects.create_user('admin', 'admin@example.com', 'pw', role='admin')
+        Question.objects.create(text='Q', topic='Personal', difficulty='easy', time_required=60)
+
+    def login(self, username):
+        client = APIClient()
+        response = client.post('/api/token/', {'username': username, 'password': 'pw'})
+        client.credentials(HTTP_AUTHORIZATION=f"Bearer {response.data['access']}")
+        return client, response.data
+
+    def test_authorizes_from_claims_without_user_query(self):
+        client, _ = self.login('candidate')
+        client.get('/api/interview/admin/analytics/')  # caches the token version
+        with CaptureQueriesContext(connection) as ctx:
+            response = client.get('/api/interview/admin/analytics/')
+        self.assertEqual(response.status_code, 403)
+        self.assertEqual(len(ctx.captured_queries), 0)
+
+    def test_admin_changes_revoke_claims(self):
+        client, _ = self.login('candidate')
+        admin, _ = self.login('admin')
+        response = admin.delete(f'/api/interview/admin/candidates/{self.candidate.pk}/remove/')
+        self.assertEqual(response.status_code, 200)
+        # The token still claims the candidate isn't blocked
+        self.assertEqual(client.post('/api/interview/start/').status_code, 403)
+
+        admin.post(f'/api/interview/admin/candidates/{self.candidate.pk}/unblock/')
+        self.assertEqual(client.post('/api/interview/start/').status_code, 200)
+
+    def test_submit_revokes_claims_and_refresh_reissues_them(self):
+        client, tokens = self.login('candidate')
+        session_id = client.post('/api/interview/start/').data['session_id']
+        client.post('/api/interview/submit/', {'session_id': session_id, 'answers': []}, format='json')
+        self.assertEqual(client.post('/api/interview/start/').status_code, 403)
+
+        refreshed = APIClient().post('/api/token/refresh/', {'refresh': tokens['refresh']}).data['access']
+        client.credentials(HTTP_AUTHORIZATION=f'Bearer {refreshed}')
+        with CaptureQueriesContext(connection) as ctx:
+            self.assertEqual(client.post('/api/interview/start/').status_code, 403)
+        self.assertFalse(any('users_user' in q['sql'] for q in ctx.captured_queries))
+
+
+    def revoke_elsewhere(self, **changes):
+        # As another process would: the row changes but this process' cache doesn't hear of it
+        User.objects.filter(pk=self.candidate.pk).update(token_version=F('token_version') + 1, **changes)
+
+    @override_settings(JWT_CLAIMS_CACHE_VERSIONS=False)
+    def test_versions_read_from_the_database_without_a_shared_cache(self):
+        client, _ = self.login('candidate')
+        client.get('/api/interview/sessions/')
+        self.revoke_elsewhere(has_completed_interview=True)
+        self.assertEqual(client.post('/api/interview/start/').status_code, 403)
+        self.assertFalse(InterviewSession.objects.exists())
+
+    def test_stale_claims_cannot_create_a_session(self):
+        client, _ = self.login('candidate')
+        client.get('/api/interview/sessions/')  # caches the token version
+        User.objects.filter(pk=self.candidate.pk).update(is_blocked_from_interview=True)
+        self.assertEqual(client.post('/api/interview/start/').status_code, 403)
+        self.assertFalse(InterviewSession.objects.exists())
+
+
+@override_settings(USER_PROVISION_WORKERS=0)
+class BulkProvisionTests(TestCase):
+    def setUp(self):
+        self.admin = User.objects.create_user('admin', 'admin@example.com', 'pw', role='admin')
+        self.client = APIClient()
+        self.client.force_authenticate(self.admin)
+
+    def test_csv_upload_reports_row_errors(self):
+        csv = (
+            'username,email,password\n'
+            'alice,alice@example.com,secret1\n'
+            'bob,not-an-email,secret2\n'
+            'admin,admin2@example.com,secret3\n'
+            'alice,alice2@example.com,secret4\n'
+            'carol,carol@example.com,\n'
+        )
+        upload = SimpleUploadedFile('cohort.csv', csv.encode(), content_type='text/csv')
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.post('/api/users/bulk_provision/', {'file': upload})
+        self.assertEqual(response.data['created'], 1)
+        self.assertEqual(response.data['total_rows_processed'], 5)
+        self.assertEqual([e.split(':')[0] for e in response.data['errors']], ['Row 3', 'Row 4', 'Row 5', 'Row 6'])
+        alice = User.objects.get(username='alice')
+        self.assertTrue(alice.check_password('secret1'))
+        self.assertEqual(alice.role, 'candidate')
+        self.assertEqual(sum('INSERT' in q['sql'] for q in ctx.captured_queries), 1)
+
+    def test_json_body_and_permissions(self):
+        rows = [{'username': f'user{i}', 'email': f'user{i}@example.com', 'password': 'pw'} for i in range(3)]
+        response = self.client.post('/api/users/bulk_provision/', {'candidates': rows}, format='json')
+        self.assertEqual(response.data['created'], 3)
+
+        client = APIClient()
+        client.force_authenticate(User.objects.get(username='user0'))
+        self.assertEqual(client.post('/api/users/bulk_provision/', rows, format='json').status_code, 403)
+
+    def test_overlong_fields_are_row_errors(self):
+        rows = [
+            {'username': 'u' * 151, 'email': 'long@example.com', 'password': 'pw'},
+            {'username': 'longmail', 'email': 'e' * 250 + '@example.com', 'password': 'pw'},
+            {'username': 'fits', 'email': 'fits@example.com', 'password': 'pw'},
+        ]
+        response = self.client.post('/api/users/bulk_provision/', rows, format='json')
+        self.assertEqual(response.data['created'], 1)
+        self.assertEqual(response.data['errors'], [
+            'Row 1: username must be at most 150 characters',
+            'Row 2: email must be at most 254 characters',
+        ])
+
+    def test_failed_batch_is_retried_row_by_row(self):
+        rows = [{'username': name, 'email': f'{name}@example.com', 'password': 'pw'} for name in ('dora', 'admin', 'eve')]
+        # As if 'admin' was created after the existence check ran
+        with mock.patch('users.provisioning._drop_existing', side_effect=lambda batch, errors: batch):
+            result = provision_candidates(enumerate(rows, start=1))
+        self.assertEqual(result.created, 2)
+        self.assertEqual(len(result.errors), 1)
+        self.assertTrue(result.errors[0].startswith('Row 2: '))
+        self.assertEqual(User.objects.filter(username__in=['dora', 'eve']).count(), 2)
+
+    @override_settings(USER_PROVISION_WORKERS=2)
+    def test_http_uploads_share_one_pool(self):
+        self.addCleanup(shutdown_shared_pool)
+        rows = [{'username': 'frank', 'email': 'frank@example.com', 'password': 'pw'}]
+        with mock.patch('users.provisioning.ProcessPoolExecutor', wraps=ProcessPoolExecutor) as pool:
+            response = self.client.post('/api/users/bulk_provision/', rows, format='json')
+            upload = SimpleUploadedFile('cohort.csv', b'username,email,password\ngrace,grace@example.com,pw\n')
+            self.client.post('/api/users/bulk_provision/', {'file': upload})
+        self.assertEqual(pool.call_count, 1)
+        self.assertIsNotNone(shared_password_pool())
+        self.assertEqual(response.data['created'], 1)
+        self.assertTrue(User.objects.get(username='grace').check_password('pw'))
+
+    def test_command_hashes_in_a_process_pool(self):
+        rows = [{'username': f'pooled{i}', 'email': f'pooled{i}@example.com', 'password': f'pw{i}'} for i in range(4)]
+        with tempfile.NamedTemporaryFile('w', suffix='.json', delete=False) as f:
+            json.dump(rows, f)
+        self.addCleanup(os.unlink, f.name)
+        call_command('provision_candidates', f.name, workers=2, stdout=open(os.devnull, 'w'))
+        self.assertTrue(User.objects.get(username='pooled3').check_password('pw3'))
@@ -0,0 +1,146 @@
+"""
+Stateless JWT authentication from token claims.
+
+Tokens issued by api/token/ carry the fields views authorize on (CLAIM_FIELDS)
+plus the user's token_version. ClaimsJWTAuthentication trusts those claims as
+long as the version still matches, so authenticated requests don't load the User
+row; request.user is then a simplejwt TokenUser, which exposes the claims as
+attributes but is not a model instance (use request.user.id in ORM filters).
+
+Changing any claim field increments token_version: User.save() does so for
+instance saves, update_claims() for queryset writes. Outstanding tokens then fall
+back to a per-request User query until the client obtains a new token.
+
+The current version is read from the database (one indexed single-column query)
+unless JWT_CLAIMS_CACHE_VERSIONS is set, which it is by default only for a cache
+shared between processes (file or Redis CACHE_URL). Versions are then cached for
+JWT_CLAIMS_VERSION_TIMEOUT seconds and dropped on every change; with a per-process
+cache, other workers would keep trusting revoked claims until the timeout.
+"""
+from typing import Iterable, Optional, Union
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import F, QuerySet
+from django.utils import timezone
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.models import TokenUser
+from rest_framework_simplejwt.serializers import TokenObtainPairSerializer, TokenRefreshSerializer
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import AccessToken
+
+from .models import CLAIM_FIELDS, User
+
+VERSION_CLAIM = 'ver'
+
+
+def _version_key(user_id) -> str:
+    return f'token_version:{user_id}'
+
+
+def add_claims(token, user: User):
+    token['username'] = user.username
+    for field in sorted(CLAIM_FIELDS - {'is_active'}):
+        token[field] = getattr(user, field)
+    token[VERSION_CLAIM] = user.token_version
+    return token
+
+
+def _versions_cached() -> bool:
+    return getattr(settings, 'JWT_CLAIMS_CACHE_VERSIONS', False)
+
+
+def current_token_version(user_id) -> Optional[int]:
+    """The user's token_version, or None if the user no longer exists."""
+    key = _version_key(user_id)
+    version = cache.get(key) if _versions_cached() else None
+    if version is None:
+        version = User.objects.filter(pk=user_id).values_list('token_version', flat=True).first()  # type: ignore[attr-defined]
+        if version is not None and _versions_cached():
+            cache.set(key, version, getattr(settings, 'JWT_CLAIMS_VERSION_TIMEOUT', 300))
+    return version
+
+
+async def acurrent_token_version(user_id) -> Optional[int]:
+    key = _version_key(user_id)
+    version = await cache.aget(key) if _versions_cached() else None
+    if version is None:
+        version = await User.objects.filter(pk=user_id).values_list('token_version', flat=True).afirst()  # type: ignore[attr-defined]
+        if version is not None and _versions_cached():
+            await cache.aset(key, version, getattr(settings, 'JWT_CLAIMS_VERSION_TIMEOUT', 300))
+    return version
+
+
+def forget_token_versions(user_ids: Iterable):
+    """Drop cached versions now and again once the current transaction commits."""
+    keys = [_version_key(pk) for pk in user_ids]
+    if not keys:
+        return
+
+    def forget():
+        cache.delete_many(keys)
+    forget()
+    transaction.on_commit(forget)
+
+
+def update_claims(users: Union[Iterable, QuerySet], **changes) -> int:
+    """
+    Update claim fields with one query and revoke the claims in outstanding tokens.
+
+    `users` is either user ids or a User queryset, which is updated in place
+    (so large selections aren't turned into an IN list); call it inside a transaction then.
+    """
+    if isinstance(users, QuerySet):
+        queryset = users
+        user_ids = list(users.values_list('pk', flat=True))
+    else:
+        user_ids = list(users)
+        queryset = User.objects.filter(pk__in=user_ids)  # type: ignore[attr-defined]
+    updated = queryset.update(token_version=F('token_version') + 1, updated_at=timezone.now(), **changes)
+    forget_token_versions(user_ids)
+    return updated
+
+
+class ClaimsTokenObtainPairSerializer(TokenObtainPairSerializer):
+    @classmethod
+    def get_token(cls, user):
+        return add_claims(super().get_token(user), user)
+
+
+class ClaimsTokenRefreshSerializer(TokenRefreshSerializer):
+    """Re-reads the user on refresh, so a new access token carries current claims."""
+
+    def validate(self, attrs):
+        data = super().validate(attrs)
+        access = AccessToken(data['access'])
+        user = User.objects.filter(pk=access[api_settings.USER_ID_CLAIM], is_active=True).first()  # type: ignore[attr-defined]
+        if user is None:
+            raise AuthenticationFailed('User not found', code='user_not_found')
+        data['access'] = str(add_claims(access, user))
+        return data
+
+
+class ClaimsJWTAuthentication(JWTAuthentication):
+    def get_user(self, validated_token):
+        version = validated_token.get(VERSION_CLAIM)
+        user_id = validated_token.get(api_settings.USER_ID_CLAIM)
+        if version is not None and user_id is not None and current_token_version(user_id) == version:
+            return TokenUser(validated_token)
+        # Token issued before claims existed, or its claims are stale
+        return super().get_user(validated_token)
+
+    async def aauthenticate(self, request):
+        """authenticate() for async views; returns (user, token) or None."""
+        header = self.get_header(request)
+        raw_token = self.get_raw_token(header) if header is not None else None
+        if raw_token is None:
+            return None
+        validated_token = self.get_validated_token(raw_token)
+        version = validated_token.get(VERSION_CLAIM)
+        user_id = validated_token.get(api_settings.USER_ID_CLAIM)
+        if version is not None and user_id is not None and await acurrent_token_version(user_id) == version:
+            return TokenUser(validated_token), validated_token
+        return await sync_to_async(super().get_user)(validated_token), validated_token
@@ -1,7 +1,8 @@
 from django.urls import path
-from .views import RegisterView, UserInfoView
+from .views import BulkProvisionCandidatesView, RegisterView, UserInfoView
 
 urlpatterns = [
     path('register/', RegisterView.as_view(), name='register'),
     path('me/', UserInfoView.as_view(), name='user-info'),
+    path('bulk_provision/', BulkProvisionCandidatesView.as_view(), name='bulk-provision-candidates'),
 ]
\ No newline at end of file
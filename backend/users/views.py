@@ -1,6 +1,9 @@
 from django.shortcuts import render
-from rest_framework import generics, permissions
+from rest_framework import generics, permissions, status
+from rest_framework.response import Response
+from rest_framework.views import APIView
 from .models import User
+from .provisioning import provision_candidates, provision_from_file, shared_password_pool
 from .serializers import UserSerializer
 from typing import Any
 
@@ -17,4 +20,38 @@ class UserInfoView(generics.RetrieveAPIView):
     permission_classes = [permissions.IsAuthenticated]
 
     def get_object(self) -> User:
-        return self.request.user
+        # request.user may be a token-claims user without email etc.
+        return User.objects.get(pk=self.request.user.id)  # type: ignore[attr-defined]
+
+
+class BulkProvisionCandidatesView(APIView):
+    """
+    Create many candidate accounts from an uploaded .csv/.json file (`file`) or a JSON
+    body: a list of {username, email, password} objects, or {"candidates": [...]}.
+
+    Passwords are hashed by the process-wide pool of USER_PROVISION_WORKERS workers
+    (users.provisioning.shared_password_pool), started on the first upload.
+    """
+    permission_classes = [permissions.IsAuthenticated]
+
+    def post(self, request):
+        if request.user.role != 'admin':
+            return Response({'error': 'Admin access required.'}, status=status.HTTP_403_FORBIDDEN)
+
+        file = request.FILES.get('file')
+        try:
+            if file is not None:
+                if not file.name.lower().endswith(('.csv', '.json')):
+                    return Response({'error': 'Please upload a CSV or JSON file.'}, status=status.HTTP_400_BAD_REQUEST)
+                result = provision_from_file(file, file.name, pool=shared_password_pool())
+            else:
+                rows = request.data.get('candidates') if isinstance(request.data, dict) else request.data
+                if not isinstance(rows, list):
+                    return Response({'error': 'Upload a file or send a list of candidates.'}, status=status.HTTP_400_BAD_REQUEST)
+                result = provision_candidates(
+                    ((row_num, row if isinstance(row, dict) else {}) for row_num, row in enumerate(rows, start=1)),
+                    pool=shared_password_pool(),
+                )
+        except (ValueError, UnicodeDecodeError) as e:
+            return Response({'error': f'Error processing file: {str(e)}'}, status=status.HTTP_400_BAD_REQUEST)
+        return Response(result.as_response(), status=status.HTTP_200_OK)
@@ -47,18 +47,44 @@ export const bulkImportQuestions = async (file) => {
   return response.data;
 };
 
-export const getSessions = async () => {
-  const response = await api.get('/interview/sessions/');
+// Create candidate accounts from a .csv or .json file of username, email and password.
+export const bulkProvisionCandidates = async (file) => {
+  const formData = new FormData();
+  formData.append('file', file);
+
+  const response = await api.post('/users/bulk_provision/', formData, {
+    headers: {
+      'Content-Type': 'multipart/form-data',
+    },
+  });
   return response.data;
 };
 
+export const getSessions = async (params = {}) => {
+  const response = await api.get('/interview/sessions/', { params });
+  return response.data.results;
+};
+
 export const getAdminAnalytics = async () => {
   const response = await api.get('/interview/admin/analytics/');
   return response.data;
 };
 
-export const getAdminCandidates = async () => {
-  const response = await api.get('/interview/admin/candidates/');
+export const getAdminCandidates = async (params = {}) => {
+  // The endpoint is cursor-paginated; follow `next` until every page is loaded
+  let response = await api.get('/interview/admin/candidates/', { params });
+  const candidates = [...response.data.results];
+  while (response.data.next) {
+    response = await api.get(response.data.next);
+    candidates.push(...response.data.results);
+  }
+  return candidates;
+};
+
+// Questions and candidates changed since `since` (a cursor from a previous call).
+// Without one, or when it has expired, the response is { reset: true, cursor }.
+export const getAdminChanges = async (since) => {
+  const response = await api.get('/interview/admin/changes/', { params: since ? { since } : {} });
   return response.data;
 };
 
@@ -75,4 +101,9 @@ export const unblockCandidate = async (candidateId) => {
 export const removeCandidateRecords = async (candidateId) => {
   const response = await api.delete(`/interview/admin/candidates/${candidateId}/remove/`);
   return response.data;
-}; 
\ No newline at end of file
+}; 
+// Apply 'unblock', 'block' or 'remove' to many candidates: pass { ids: [...] } or { filter: {...} }.
+export const bulkCandidateAction = async (action, selection) => {
+  const response = await api.post('/interview/admin/candidates/bulk/', { action, ...selection });
+  return response.data;
+};
@@ -10,19 +10,39 @@ export const submitAnswers = async (data) => {
   return response.data;
 };
 
+// Autosave one answer while the interview is in progress. `revision` must increase with
+// each save of the same answer; replays and out-of-order saves are ignored server-side.
+export const saveAnswer = async ({ sessionId, questionId, response, responseTime, revision = Date.now() }) => {
+  const res = await api.post('/interview/answer/', {
+    session_id: sessionId,
+    question_id: questionId,
+    response,
+    response_time: responseTime,
+    revision,
+  });
+  return res.data;
+};
+
 export const getSummary = async (sessionId) => {
   const response = await api.get(`/interview/summary/${sessionId}/`);
   return response.data;
 };
 
-export const getUserSessions = async () => {
-  const response = await api.get('/interview/sessions/');
-  return response.data;
+// Newest first, one page at a time; pass { cursor } from a previous page's `next` to continue
+export const getUserSessions = async (params = {}) => {
+  const response = await api.get('/interview/sessions/', { params });
+  return response.data.results;
 };
 
-export const getAdminCandidates = async () => {
-  const response = await api.get('/interview/admin/candidates/');
-  return response.data;
+export const getAdminCandidates = async (params = {}) => {
+  // The endpoint is cursor-paginated; follow `next` until every page is loaded
+  let response = await api.get('/interview/admin/candidates/', { params });
+  const candidates = [...response.data.results];
+  while (response.data.next) {
+    response = await api.get(response.data.next);
+    candidates.push(...response.data.results);
+  }
+  return candidates;
 };
 
 export const getAdminCandidateDetail = async (candidateId) => {
@@ -1,7 +1,7 @@
 import React, { useState, useEffect, useRef } from 'react';
 import { Card, Tabs, Tab, Table, Button, Modal, Form, Spinner, Toast, ToastContainer, Row, Col, Alert, Badge } from 'react-bootstrap';
 import './css/AdminDashboard.css';
-import { getAllQuestions, createQuestion, updateQuestion, deleteQuestion, bulkImportQuestions, getAdminAnalytics, getAdminCandidates, getAdminCandidateDetail, unblockCandidate, removeCandidateRecords } from '../api/admin';
+import { getAllQuestions, createQuestion, updateQuestion, deleteQuestion, bulkImportQuestions, getAdminAnalytics, getAdminCandidates, getAdminChanges, getAdminCandidateDetail, unblockCandidate, removeCandidateRecords, bulkCandidateAction } from '../api/admin';
 
 function AdminDashboard() {
   const [key, setKey] = useState('questions');
@@ -24,11 +24,14 @@ function AdminDashboard() {
   const [showRemoveModal, setShowRemoveModal] = useState(false);
   const [removeCandidateId, setRemoveCandidateId] = useState(null);
   const fileInputRef = useRef();
+  const changesCursor = useRef(null);
 
   const fetchAll = async () => {
     setLoading(true);
     setError('');
     try {
+      // Take the cursor first so changes made while the lists load are picked up later
+      changesCursor.current = (await getAdminChanges()).cursor;
       const [questionsData, candidatesData] = await Promise.all([
         getAllQuestions(),
         getAdminCandidates()
@@ -43,6 +46,31 @@ function AdminDashboard() {
     }
   };
 
+  // Apply only what changed since the last load; the server asks for a full reload when needed
+  const applyChanges = (items, { updated, deleted }) => {
+    const removed = new Set(deleted);
+    const byId = new Map(updated.map(item => [item.id, item]));
+    const merged = items
+      .filter(item => !removed.has(item.id))
+      .map(item => byId.get(item.id) || item);
+    const existing = new Set(items.map(item => item.id));
+    return [...merged, ...updated.filter(item => !existing.has(item.id))];
+  };
+
+  const refreshChanges = async () => {
+    if (!changesCursor.current) return fetchAll();
+    try {
+      const data = await getAdminChanges(changesCursor.current);
+      if (data.reset) return fetchAll();
+      changesCursor.current = data.cursor;
+      setQuestions(prev => applyChanges(prev, data.questions));
+      setCandidates(prev => applyChanges(prev, data.candidates));
+    } catch (err) {
+      console.error('Refresh error:', err);
+      fetchAll();
+    }
+  };
+
   const fetchAnalytics = async () => {
     setAnalyticsLoading(true);
     setAnalyticsError('');
@@ -101,7 +129,7 @@ function AdminDashboard() {
       }
       setShowToast(true);
       setShowModal(false);
-      fetchAll();
+      refreshChanges();
     } catch (err) {
       setToastMsg(err.response?.data?.error || 'Failed to save question.');
       setShowToast(true);
@@ -117,7 +145,7 @@ function AdminDashboard() {
       setToastMsg('Question deleted successfully!');
       setShowToast(true);
       setShowDelete(false);
-      fetchAll();
+      refreshChanges();
     } catch (err) {
       setToastMsg(err.response?.data?.error || 'Failed to delete question.');
       setShowToast(true);
@@ -167,7 +195,7 @@ function AdminDashboard() {
         console.log('Import errors:', result.errors);
       }
       setShowToast(true);
-      fetchAll();
+      refreshChanges();
     } catch (err) {
       console.error('Import error:', err);
       setToastMsg(err.response?.data?.error || 'Failed to import questions.');
@@ -243,13 +271,25 @@ function AdminDashboard() {
       await unblockCandidate(candidateId);
       setToastMsg('Candidate unblocked successfully!');
       setShowToast(true);
-      fetchAll(); // Refresh the candidates list
+      refreshChanges(); // Refresh the candidates list
     } catch (err) {
       setToastMsg('Failed to unblock candidate.');
       setShowToast(true);
     }
   };
 
+  const handleUnblockAll = async () => {
+    try {
+      const { candidates: count } = await bulkCandidateAction('unblock', { filter: {} });
+      setToastMsg(`${count} candidates unblocked.`);
+      setShowToast(true);
+      refreshChanges();
+    } catch (err) {
+      setToastMsg('Failed to unblock candidates.');
+      setShowToast(true);
+    }
+  };
+
   const handleRemoveCandidate = async () => {
     if (!removeCandidateId) return;
     setLoading(true);
@@ -259,7 +299,7 @@ function AdminDashboard() {
       setShowToast(true);
       setShowRemoveModal(false);
       setRemoveCandidateId(null);
-      fetchAll();
+      refreshChanges();
     } catch (err) {
       setToastMsg('Failed to remove candidate records.');
       setShowToast(true);
@@ -313,6 +353,11 @@ function AdminDashboard() {
                 </Table>
               </Tab>
               <Tab eventKey="candidates" title="Candidates">
+                <div className="d-flex justify-content-end mb-2">
+                  <Button variant="outline-success" size="sm" onClick={handleUnblockAll}>
+                    Unblock All
+                  </Button>
+                </div>
                 <Table hover responsive className="admin-table">
                   <thead>
                     <tr>
@@ -1,6 +1,6 @@
 import React, { useState, useEffect, useRef, useCallback } from 'react';
 import { Button, Spinner, Alert, ProgressBar, Toast, ToastContainer } from 'react-bootstrap';
-import { fetchQuestions, submitAnswers } from '../api/interview';
+import { fetchQuestions, saveAnswer, submitAnswers } from '../api/interview';
 import { listen } from '../utils/voice';
 import './css/InterviewPage.css';
 
@@ -64,12 +64,20 @@ function InterviewPage({ user }) {
     }
   };
 
+  // Best effort: the final submit still carries every answer, so a failed autosave loses nothing
+  const autosave = useCallback((idx, { answer: response, time }) => {
+    if (!sessionId || !questions[idx]) return;
+    saveAnswer({ sessionId, questionId: questions[idx].id, response, responseTime: time })
+      .catch(err => console.warn('Autosave failed:', err));
+  }, [sessionId, questions]);
+
   const handleAnswer = useCallback(async (val, auto = false) => {
     if (!val.trim() && !auto) return;
     
     const newAnswers = [...answers];
     newAnswers[current] = { answer: val, time: QUESTION_TIME_LIMIT - timer };
     setAnswers(newAnswers);
+    autosave(current, newAnswers[current]);
     setMessages(prev => [...prev, { type: 'answer', text: val }]);
     setAnswer('');
     
@@ -83,7 +91,7 @@ function InterviewPage({ user }) {
       setReviewMode(true);
       if (timerRef.current) clearInterval(timerRef.current);
     }
-  }, [answers, current, questions, timer]);
+  }, [answers, current, questions, timer, autosave]);
 
   // Total interview timer effect
   useEffect(() => {
@@ -365,6 +373,7 @@ function InterviewPage({ user }) {
                 className="form-control"
                 value={answers[idx].answer}
                 onChange={e => handleReviewChange(idx, e.target.value)}
+                onBlur={() => autosave(idx, answers[idx])}
                 disabled={submitting}
               />
               <div className="text-muted small mt-1">Time: {answers[idx].time}s</div>
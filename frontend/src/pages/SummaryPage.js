@@ -28,14 +28,14 @@ function SummaryPage({ user }) {
       setLoading(true);
       setError('');
       try {
-        // Get all sessions for the current user
-        const sessionsData = await getUserSessions();
+        // Sessions come back newest first; only the latest one is needed
+        const sessionsData = await getUserSessions({ page_size: 1, fields: 'id' });
         if (!sessionsData || sessionsData.length === 0) {
           throw new Error('No interview sessions found.');
         }
         
         // Get the latest session
-        const latestSession = sessionsData[sessionsData.length - 1];
+        const latestSession = sessionsData[0];
         console.log('Latest session:', latestSession);
         
         // Get detailed summary for the latest session